@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import AliasChoices, Field, HttpUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -23,6 +24,34 @@ class Settings(BaseSettings):
     )
     bedrock_temperature: float = Field(0.2, ge=0.0, le=1.0)
     bedrock_max_tokens: int = Field(4096, ge=512, le=8192)
+    bedrock_fast_model_id: str | None = Field(
+        None,
+        validation_alias=AliasChoices("BEDROCK_FAST_MODEL_ID"),
+        description="Small model for greetings, yes/no and slot-filling turns (unset: no routing).",
+    )
+    bedrock_fast_max_tokens: int = Field(
+        512,
+        ge=128,
+        le=4096,
+        validation_alias=AliasChoices("BEDROCK_FAST_MAX_TOKENS"),
+        description="Output token limit for turns routed to the fast model.",
+    )
+    bedrock_prompt_cache: bool = Field(
+        False,
+        validation_alias=AliasChoices("BEDROCK_PROMPT_CACHE"),
+        description="Mark Bedrock cache points after the supervisor system prompt and tool specs.",
+    )
+    conversation_mode: Literal["digest", "sliding"] = Field(
+        "digest",
+        validation_alias=AliasChoices("CONVERSATION_MODE"),
+        description="digest: compact old tool results, keep session_summary; sliding: trim only.",
+    )
+    conversation_window_messages: int = Field(
+        20,
+        ge=4,
+        validation_alias=AliasChoices("CONVERSATION_WINDOW_MESSAGES"),
+        description="Most messages the supervisor sends to the model per turn.",
+    )
 
     searchapi_endpoint: HttpUrl = Field(
         "https://www.searchapi.io/api/v1/search",
@@ -31,13 +60,83 @@ class Settings(BaseSettings):
     searchapi_key: str = Field(
         ...,
         validation_alias=AliasChoices("SEARCHAPI_KEY"),
-        description="SearchAPI bearer token used by http_request calls.",
+        description="SearchAPI bearer token used by the SearchAPI clients.",
+    )
+    searchapi_hedging: bool = Field(
+        False,
+        validation_alias=AliasChoices("SEARCHAPI_HEDGING"),
+        description="Send a duplicate SearchAPI flights request once one outlives the rolling p95.",
+    )
+    supervisor_http_request: bool = Field(
+        False,
+        validation_alias=AliasChoices("SUPERVISOR_HTTP_REQUEST"),
+        description="Also give the supervisor the raw http_request tool (no caches or digests).",
     )
     open_meteo_endpoint: HttpUrl = Field(
         "https://api.open-meteo.com/v1/forecast",
         validation_alias=AliasChoices("OPEN_METEO_ENDPOINT"),
         description="Open-Meteo forecast endpoint for weather snapshots.",
     )
+    negative_route_cache_path: str | None = Field(
+        None,
+        validation_alias=AliasChoices("NEGATIVE_ROUTE_CACHE_PATH"),
+        description="Bloom-filter snapshot of routes without LH Group itineraries.",
+    )
+    price_history_path: str | None = Field(
+        None,
+        validation_alias=AliasChoices("PRICE_HISTORY_PATH"),
+        description="SQLite file for stored calendar/offer prices (in-memory when unset).",
+    )
+    tool_deadline_seconds: float = Field(
+        25.0,
+        gt=0,
+        validation_alias=AliasChoices("TOOL_DEADLINE_SECONDS"),
+        description="Overall time budget for one delegate tool call, shared by its upstream calls.",
+    )
+    tool_result_token_budget: int = Field(
+        2000,
+        ge=200,
+        validation_alias=AliasChoices("TOOL_RESULT_TOKEN_BUDGET"),
+        description="Estimated token ceiling for one compacted delegate tool result.",
+    )
+    tool_result_top_n: int = Field(
+        10,
+        ge=1,
+        le=50,
+        validation_alias=AliasChoices("TOOL_RESULT_TOP_N"),
+        description="Itineraries/cards kept in a compacted tool result before budget trimming.",
+    )
+    tool_memo_ttl_seconds: float = Field(
+        120.0,
+        ge=0,
+        validation_alias=AliasChoices("TOOL_MEMO_TTL_SECONDS"),
+        description="Seconds an identical tool call in one session reuses its result (0 disables).",
+    )
+    flight_prefetch_top_k: int = Field(
+        0,
+        ge=0,
+        le=5,
+        validation_alias=AliasChoices("FLIGHT_PREFETCH_TOP_K"),
+        description="Top destination cards whose flights are prefetched (0 disables).",
+    )
+    flight_prefetch_session_cap: int = Field(
+        4,
+        ge=1,
+        validation_alias=AliasChoices("FLIGHT_PREFETCH_SESSION_CAP"),
+        description="Most speculative flight searches one conversation may trigger.",
+    )
+    lambda_prewarm: bool = Field(
+        False,
+        validation_alias=AliasChoices("LAMBDA_PREWARM"),
+        description="Build services and open upstream connections during Lambda init.",
+    )
+    lambda_prewarm_timeout_seconds: float = Field(
+        2.0,
+        gt=0,
+        le=9,
+        validation_alias=AliasChoices("LAMBDA_PREWARM_TIMEOUT_SECONDS"),
+        description="Longest Lambda init waits for pre-warming before handing over.",
+    )
     default_timezone: str = Field(
         "UTC",
         validation_alias=AliasChoices("DEFAULT_TIMEZONE"),
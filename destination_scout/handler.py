@@ -8,23 +8,20 @@ from typing import Any
 from pydantic import ValidationError
 
 from config.settings import get_settings
-from destination_scout.service import (
-    DestinationScoutRequest,
-    DestinationScoutService,
-    OpenMeteoClient,
-    SearchAPIClient,
-)
+from destination_scout.service import DestinationScoutRequest
+from shared.deadline import deadline_scope, lambda_budget
+from shared.prewarm import prewarm
+from shared.registry import get_registry
 
 logger = logging.getLogger(__name__)
 
-settings = get_settings()
-
-_search_client = SearchAPIClient(
-    base_url=str(settings.searchapi_endpoint),
-    api_key=settings.searchapi_key,
-)
-_weather_client = OpenMeteoClient(base_url=str(settings.open_meteo_endpoint))
-_service = DestinationScoutService(_search_client, _weather_client)
+if get_settings().lambda_prewarm:
+    # Lambda init: load caches and open connections so the first invocation skips DNS/TLS.
+    prewarm(
+        ["destination_service"],
+        ["explore_client", "open_meteo_client"],
+        timeout=get_settings().lambda_prewarm_timeout_seconds,
+    )
 
 
 def lambda_handler(event: dict[str, Any], _context: Any | None = None) -> dict[str, Any]:
@@ -36,5 +33,6 @@ def lambda_handler(event: dict[str, Any], _context: Any | None = None) -> dict[s
         logger.error("Invalid Destination Scout payload: %s", exc)
         raise
 
-    response = _service.generate_cards(request)
+    with deadline_scope(lambda_budget(_context, get_settings().tool_deadline_seconds)):
+        response = get_registry().destination_service().generate_cards(request)
     return response.model_dump()
@@ -9,10 +9,18 @@ from datetime import date, timedelta
 from typing import Any, Mapping
 
 import httpx
-from pydantic import BaseModel, Field, PositiveInt, conint, model_validator
+from pydantic import BaseModel, Field, PositiveInt, ValidationError, conint, model_validator
+
+from shared import deadline
+from shared.http import PooledHTTP
+from shared.resilience import Upstream, UpstreamUnavailableError, get_upstream
+from shared.routes import RouteGraph
 
 logger = logging.getLogger(__name__)
 
+# Minimum remaining deadline budget before a card's weather lookup is attempted.
+WEATHER_MIN_SECONDS = 2.0
+
 ALLOWED_INTERESTS: tuple[str, ...] = ("popular", "outdoors", "beaches", "museums", "history", "skiing")
 INTEREST_SYNONYMS: dict[str, str] = {
     "snow": "skiing",
@@ -75,6 +83,21 @@ class WeatherSummary(BaseModel):
     wind_speed_max_kmh: float | None = None
 
 
+class Coordinates(BaseModel):
+    latitude: float
+    longitude: float
+
+
+class DailyForecast(BaseModel):
+    """Raw Open-Meteo daily arrays, aligned by index with `time`."""
+
+    time: list[str] = Field(default_factory=list)
+    temperature_2m_max: list[float | None] = Field(default_factory=list)
+    temperature_2m_min: list[float | None] = Field(default_factory=list)
+    precipitation_probability_max: list[int | None] = Field(default_factory=list)
+    wind_speed_10m_max: list[float | None] = Field(default_factory=list)
+
+
 class DestinationCard(BaseModel):
     """Structured destination output returned to the Supervisor."""
 
@@ -83,7 +106,9 @@ class DestinationCard(BaseModel):
     country: str | None = None
     why_now: str
     events: list[str] = Field(default_factory=list)
+    coordinates: Coordinates | None = None
     weather: WeatherSummary | None = None
+    forecast: DailyForecast | None = None
     sources: list[str] = Field(default_factory=list)
     metadata: dict[str, Any] = Field(default_factory=dict)
 
@@ -106,11 +131,13 @@ class SearchAPIClient:
         *,
         timeout: float = 15.0,
         transport: httpx.BaseTransport | None = None,
+        upstream: Upstream | None = None,
     ) -> None:
         self._base_url = base_url
         self._api_key = api_key
         self._timeout = timeout
-        self._transport = transport
+        self._http = PooledHTTP(transport=transport)
+        self._upstream = upstream or get_upstream("searchapi")
 
     def explore(self, request: DestinationScoutRequest) -> dict[str, Any]:
         params: dict[str, Any] = {
@@ -135,10 +162,18 @@ class SearchAPIClient:
         headers = {"Authorization": f"Bearer {self._api_key}"}
         params["api_key"] = self._api_key
         try:
-            with httpx.Client(timeout=self._timeout, transport=self._transport) as client:
-                response = client.get(self._base_url, params=params, headers=headers)
-                response.raise_for_status()
-                return response.json()
+            response = self._upstream.send(
+                lambda: self._http.client.get(
+                    self._base_url,
+                    params=params,
+                    headers=headers,
+                    timeout=deadline.clamp_timeout(self._timeout),
+                )
+            )
+            response.raise_for_status()
+            return response.json()
+        except UpstreamUnavailableError as exc:
+            raise DestinationScoutError(f"SearchAPI explore skipped: {exc}") from exc
         except httpx.HTTPStatusError as exc:
             raise DestinationScoutError(
                 f"SearchAPI explore failed with status {exc.response.status_code}"
@@ -146,6 +181,14 @@ class SearchAPIClient:
         except httpx.HTTPError as exc:
             raise DestinationScoutError("SearchAPI explore failed") from exc
 
+    def warm(self, *, timeout: float) -> bool:
+        """Open a pooled connection to SearchAPI without running a search."""
+
+        return self._http.probe(self._base_url, timeout=timeout)
+
+    def close(self) -> None:
+        self._http.close()
+
 
 class OpenMeteoClient:
     """Thin HTTP client for Open-Meteo daily forecasts."""
@@ -156,10 +199,14 @@ class OpenMeteoClient:
         *,
         timeout: float = 15.0,
         transport: httpx.BaseTransport | None = None,
+        upstream: Upstream | None = None,
+        timezone: str = "UTC",
     ) -> None:
         self._base_url = base_url
         self._timeout = timeout
-        self._transport = transport
+        self._http = PooledHTTP(transport=transport)
+        self._upstream = upstream or get_upstream("open-meteo")
+        self._timezone = timezone
 
     def fetch_daily(
         self,
@@ -182,14 +229,21 @@ class OpenMeteoClient:
                     "wind_speed_10m_max",
                 ]
             ),
-            "timezone": "UTC",
+            "timezone": self._timezone,
             "windspeed_unit": "kmh",
         }
         try:
-            with httpx.Client(timeout=self._timeout, transport=self._transport) as client:
-                response = client.get(self._base_url, params=params)
-                response.raise_for_status()
-                return response.json()
+            response = self._upstream.send(
+                lambda: self._http.client.get(
+                    self._base_url,
+                    params=params,
+                    timeout=deadline.clamp_timeout(self._timeout),
+                )
+            )
+            response.raise_for_status()
+            return response.json()
+        except UpstreamUnavailableError as exc:
+            raise DestinationScoutError(f"Open-Meteo forecast skipped: {exc}") from exc
         except httpx.HTTPStatusError as exc:
             raise DestinationScoutError(
                 f"Open-Meteo forecast failed with status {exc.response.status_code}"
@@ -197,6 +251,14 @@ class OpenMeteoClient:
         except httpx.HTTPError as exc:
             raise DestinationScoutError("Open-Meteo forecast failed") from exc
 
+    def warm(self, *, timeout: float) -> bool:
+        """Open a pooled connection to Open-Meteo without running a forecast."""
+
+        return self._http.probe(self._base_url, timeout=timeout)
+
+    def close(self) -> None:
+        self._http.close()
+
 
 class DestinationScoutService:
     """Coordinates SearchAPI and Open-Meteo to produce destination cards."""
@@ -208,12 +270,14 @@ class DestinationScoutService:
         *,
         pacing_delay: float = 0.5,
         cache_size: int = 16,
+        route_graph: RouteGraph | None = None,
     ) -> None:
         self._search_client = search_client
         self._weather_client = weather_client
         self._pacing_delay = pacing_delay
         self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
         self._cache_size = max(1, cache_size)
+        self._route_graph = route_graph
 
     def generate_cards(self, request: DestinationScoutRequest) -> DestinationScoutResponse:
         cache_key = self._cache_key(request)
@@ -222,26 +286,33 @@ class DestinationScoutService:
             payload = self._search_client.explore(request)
             self._remember(cache_key, payload)
             if self._pacing_delay:
-                time.sleep(self._pacing_delay)
+                time.sleep(deadline.clamp_timeout(self._pacing_delay))
         else:
             logger.debug("Destination Scout cache hit for %s", cache_key)
 
         candidates = self._extract_candidates(payload)
+        ranked, unlisted = self._rank_by_network(candidates, request.departure_id)
         cards: list[DestinationCard] = []
+        skipped: list[str] = []
 
-        for candidate in candidates:
+        for candidate in ranked:
             if len(cards) >= request.max_cards:
                 break
-            card = self._candidate_to_card(candidate, request, payload)
+            with_weather = request.include_weather and deadline.has_time_for(WEATHER_MIN_SECONDS)
+            if request.include_weather and not with_weather and not skipped:
+                skipped.append("weather")
+            card = self._candidate_to_card(candidate, request, payload, with_weather=with_weather)
             if card:
                 cards.append(card)
 
         metadata = {
             "time_period_token": request.time_window.token,
             "result_count": len(candidates),
+            "off_network_ranked_last": unlisted,
+            "skipped": skipped,
             "search_url": payload.get("search_metadata", {}).get("json_url"),
         }
-        remaining = max(len(candidates) - len(cards), 0)
+        remaining = max(len(ranked) - len(cards), 0)
         return DestinationScoutResponse(
             cards=cards,
             remaining_candidates=remaining,
@@ -266,11 +337,33 @@ class DestinationScoutService:
                 return [item for item in bucket if isinstance(item, dict)]
         return []
 
+    def _rank_by_network(
+        self, candidates: list[dict[str, Any]], departure_id: str
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Order candidates the route graph shows within one stop first; nothing is dropped.
+
+        The bundled route dataset is incomplete, so an unlisted route only moves a candidate
+        behind the listed ones (and past the weather budget), keeping the explore order otherwise.
+        Returns the ranked list and how many candidates were unlisted.
+        """
+
+        if self._route_graph is None:
+            return candidates, 0
+        ranks = []
+        for candidate in candidates:
+            arrival_id = _candidate_arrival_id(candidate)
+            served = self._route_graph.reachable(departure_id, arrival_id) if arrival_id else None
+            ranks.append({True: 0, None: 1, False: 2}[served])
+        order = sorted(range(len(candidates)), key=ranks.__getitem__)
+        return [candidates[index] for index in order], ranks.count(2)
+
     def _candidate_to_card(
         self,
         candidate: dict[str, Any],
         request: DestinationScoutRequest,
         payload: dict[str, Any],
+        *,
+        with_weather: bool = True,
     ) -> DestinationCard | None:
         destination = (
             candidate.get("destination")
@@ -282,12 +375,7 @@ class DestinationScoutService:
             logger.debug("Skipping candidate without destination name: %s", candidate)
             return None
 
-        arrival_id = (
-            candidate.get("iata_code")
-            or candidate.get("iata")
-            or candidate.get("arrival_id")
-            or candidate.get("airport_code")
-        )
+        arrival_id = _candidate_arrival_id(candidate)
         country = candidate.get("country") or candidate.get("region")
         why_now = (
             candidate.get("snippet")
@@ -301,9 +389,14 @@ class DestinationScoutService:
         latitude = _coerce_float(coords.get("latitude") if isinstance(coords, Mapping) else (coords[0] if isinstance(coords, list) and coords else None))
         longitude = _coerce_float(coords.get("longitude") if isinstance(coords, Mapping) else (coords[1] if isinstance(coords, list) and len(coords) > 1 else None))
 
+        coordinates = None
+        if latitude is not None and longitude is not None:
+            coordinates = Coordinates(latitude=latitude, longitude=longitude)
+
         weather: WeatherSummary | None = None
-        if request.include_weather and latitude is not None and longitude is not None:
-            weather = self._build_weather_summary(latitude, longitude, request)
+        forecast: DailyForecast | None = None
+        if with_weather and coordinates is not None:
+            weather, forecast = self._build_weather_summary(latitude, longitude, request)
 
         sources = [
             candidate.get("link"),
@@ -323,7 +416,9 @@ class DestinationScoutService:
             country=country,
             why_now=why_now.strip(),
             events=events,
+            coordinates=coordinates,
             weather=weather,
+            forecast=forecast,
             sources=[src for src in sources if src],
             metadata=metadata,
         )
@@ -333,11 +428,11 @@ class DestinationScoutService:
         latitude: float,
         longitude: float,
         request: DestinationScoutRequest,
-    ) -> WeatherSummary | None:
+    ) -> tuple[WeatherSummary | None, DailyForecast | None]:
         start_date, end_date = self._derive_weather_window(request)
         if start_date - date.today() > timedelta(days=16):
             logger.debug("Skipping weather lookup beyond Open-Meteo forecast horizon")
-            return None
+            return None, None
         try:
             forecast = self._weather_client.fetch_daily(
                 latitude,
@@ -347,8 +442,8 @@ class DestinationScoutService:
             )
         except DestinationScoutError as exc:
             logger.warning("Open-Meteo lookup failed for %s,%s: %s", latitude, longitude, exc)
-            return None
-        return _format_weather(forecast)
+            return None, None
+        return _format_weather(forecast), _daily_forecast(forecast)
 
     def _derive_weather_window(self, request: DestinationScoutRequest) -> tuple[date, date]:
         start_date = request.time_window.start_date or date.today()
@@ -429,6 +524,15 @@ def _allowed_month_tokens(today: date) -> set[str]:
     return tokens
 
 
+def _candidate_arrival_id(candidate: dict[str, Any]) -> str | None:
+    return (
+        candidate.get("iata_code")
+        or candidate.get("iata")
+        or candidate.get("arrival_id")
+        or candidate.get("airport_code")
+    )
+
+
 def _filter_interests(raw: list[str]) -> list[str]:
     filtered: list[str] = []
     for interest in raw:
@@ -481,6 +585,19 @@ def _first_int(values: Any) -> int | None:
     return None
 
 
+def _daily_forecast(payload: dict[str, Any]) -> DailyForecast | None:
+    daily = payload.get("daily")
+    if not isinstance(daily, dict):
+        return None
+    if "wind_speed_10m_max" not in daily and "windspeed_10m_max" in daily:
+        daily = {**daily, "wind_speed_10m_max": daily["windspeed_10m_max"]}
+    try:
+        return DailyForecast.model_validate(daily)
+    except ValidationError as exc:
+        logger.warning("Ignoring malformed Open-Meteo daily arrays: %s", exc)
+        return None
+
+
 def _format_weather(payload: dict[str, Any]) -> WeatherSummary | None:
     daily = payload.get("daily")
     if not isinstance(daily, dict):
@@ -518,6 +635,8 @@ def _format_weather(payload: dict[str, Any]) -> WeatherSummary | None:
 
 
 __all__ = [
+    "Coordinates",
+    "DailyForecast",
     "DestinationCard",
     "DestinationScoutError",
     "DestinationScoutRequest",
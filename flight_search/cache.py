@@ -0,0 +1,260 @@
+"""Flight results cache that answers narrower follow-up queries from broader cached results."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from shared.flight_utils import (
+    extract_best_price,
+    itinerary_carriers,
+    itinerary_price,
+    itinerary_stops,
+    lhg_airlines_list,
+    star_alliance_list,
+)
+
+if TYPE_CHECKING:
+    from flight_search.service import FlightSearchRequest, FlightSearchResponse
+
+logger = logging.getLogger(__name__)
+
+
+class _CacheEntry:
+    __slots__ = ("request", "response", "airlines", "stored_at")
+
+    def __init__(
+        self,
+        request: FlightSearchRequest,
+        response: FlightSearchResponse,
+        stored_at: float,
+    ) -> None:
+        self.request = request
+        self.response = response
+        self.airlines = effective_airlines(request, response.metadata.get("search_scope"))
+        self.stored_at = stored_at
+
+
+class FlightResultsCache:
+    """TTL cache of google_flights results that also serves requests subsumed by a cached one.
+
+    A cached result covers a new request for the same route, dates, cabin and travellers when the
+    new request is at most as broad: `nonstop` after `any`, a subset of the effective carriers, or a
+    lower `max_price`. Covered requests are answered by filtering the cached itineraries locally.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 600.0,
+        max_entries: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max(1, max_entries)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[Any, ...], list[_CacheEntry]] = OrderedDict()
+
+    def lookup(self, request: FlightSearchRequest) -> FlightSearchResponse | None:
+        """Return a cached or locally derived response, or None when an upstream call is needed."""
+
+        key = _base_key(request)
+        with self._lock:
+            entries = self._live_entries(key)
+        for entry in entries:
+            if not _subsumes(entry.request, entry.airlines, request):
+                continue
+            if _same_filters(entry.request, request):
+                return entry.response.model_copy(deep=True)
+            derived = _derive(entry, request)
+            if derived is not None:
+                logger.debug("Flight cache derived %s from a broader cached query", key)
+                return derived
+        return None
+
+    def store(self, request: FlightSearchRequest, response: FlightSearchResponse) -> None:
+        key = _base_key(request)
+        entry = _CacheEntry(request, response, self._clock())
+        with self._lock:
+            entries = [
+                existing
+                for existing in self._live_entries(key)
+                if not _same_filters(existing.request, request)
+            ]
+            entries.insert(0, entry)
+            self._put(key, entries)
+
+    def lookup_calendar(self, request: FlightSearchRequest) -> FlightSearchResponse | None:
+        """Return a cached calendar-only grid for exactly this window, stops and carriers."""
+
+        with self._lock:
+            entries = self._live_entries(_calendar_key(request))
+        return entries[0].response.model_copy(deep=True) if entries else None
+
+    def store_calendar(self, request: FlightSearchRequest, response: FlightSearchResponse) -> None:
+        entry = _CacheEntry(request, response, self._clock())
+        with self._lock:
+            self._put(_calendar_key(request), [entry])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _put(self, key: tuple[Any, ...], entries: list[_CacheEntry]) -> None:
+        self._entries[key] = entries
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _live_entries(self, key: tuple[Any, ...]) -> list[_CacheEntry]:
+        now = self._clock()
+        entries = [
+            entry for entry in self._entries.get(key, []) if now - entry.stored_at < self._ttl
+        ]
+        if entries:
+            self._entries[key] = entries
+        else:
+            self._entries.pop(key, None)
+        return entries
+
+
+def effective_airlines(request: FlightSearchRequest, search_scope: str | None) -> frozenset[str]:
+    """Carriers SearchAPI was actually asked for (LH Group is always part of the query)."""
+
+    if search_scope == "star_alliance":
+        return frozenset(star_alliance_list())
+    return frozenset(lhg_airlines_list(request.included_airlines))
+
+
+def _base_key(request: FlightSearchRequest) -> tuple[Any, ...]:
+    return (
+        request.departure_id.upper(),
+        request.arrival_id.upper(),
+        request.outbound_date,
+        request.return_date,
+        request.travel_class,
+        request.adults,
+        request.currency,
+        request.locale,
+        request.region,
+        (
+            (request.calendar_window.start_date, request.calendar_window.end_date)
+            if request.calendar_window
+            else None
+        ),
+        request.calendar_limit,
+    )
+
+
+def _calendar_key(request: FlightSearchRequest) -> tuple[Any, ...]:
+    # Calendar-only grids carry no itineraries to filter, so they never serve narrower requests and
+    # live apart from full searches that share the base key.
+    return (
+        "calendar",
+        *_base_key(request),
+        request.stops,
+        tuple(sorted(code.upper() for code in request.included_airlines)),
+    )
+
+
+def _same_filters(cached: FlightSearchRequest, request: FlightSearchRequest) -> bool:
+    return (
+        cached.stops == request.stops
+        and cached.max_price == request.max_price
+        and set(lhg_airlines_list(cached.included_airlines))
+        == set(lhg_airlines_list(request.included_airlines))
+    )
+
+
+def _subsumes(
+    cached: FlightSearchRequest,
+    cached_airlines: frozenset[str],
+    request: FlightSearchRequest,
+) -> bool:
+    if cached.stops == "nonstop" and request.stops != "nonstop":
+        return False
+    if cached.max_price is not None and (
+        request.max_price is None or request.max_price > cached.max_price
+    ):
+        return False
+    return set(lhg_airlines_list(request.included_airlines)) <= cached_airlines
+
+
+def _derive(entry: _CacheEntry, request: FlightSearchRequest) -> FlightSearchResponse | None:
+    if request.calendar_window:
+        # Calendar grids carry no per-itinerary detail, so they cannot be narrowed locally.
+        return None
+    airlines = set(lhg_airlines_list(request.included_airlines))
+    check_airlines = not entry.airlines <= airlines
+    flights = dict(entry.response.flights)
+    kept = 0
+    for bucket_name in ("best_flights", "other_flights"):
+        bucket = flights.get(bucket_name)
+        if not isinstance(bucket, list):
+            continue
+        filtered = []
+        for itinerary in bucket:
+            if not isinstance(itinerary, dict):
+                continue
+            verdict = _matches(itinerary, request, airlines if check_airlines else None)
+            if verdict is None:
+                return None
+            if verdict:
+                filtered.append(itinerary)
+        flights[bucket_name] = filtered
+        kept += len(filtered)
+    if not kept:
+        # Upstream would widen an empty LH Group result to Star Alliance; let it.
+        return None
+
+    metadata = dict(entry.response.metadata)
+    metadata["price_hint"] = extract_best_price(flights, currency=request.currency)
+    metadata["derived_from_cache"] = True
+    metadata["derived_from"] = {
+        "stops": entry.request.stops,
+        "included_airlines": sorted(entry.airlines),
+        "max_price": entry.request.max_price,
+    }
+    return entry.response.model_copy(
+        update={
+            "flights": flights,
+            "metadata": {k: v for k, v in metadata.items() if v is not None},
+        },
+        deep=True,
+    )
+
+
+def _matches(
+    itinerary: dict[str, Any],
+    request: FlightSearchRequest,
+    airlines: set[str] | None,
+) -> bool | None:
+    """True/False when the itinerary passes the request's filters, None when undecidable."""
+
+    if request.stops == "nonstop":
+        stops = itinerary_stops(itinerary)
+        if stops is None:
+            return None
+        if stops:
+            return False
+    if airlines is not None:
+        carriers = itinerary_carriers(itinerary)
+        if not carriers:
+            return None
+        if not set(carriers) <= airlines:
+            return False
+    if request.max_price is not None:
+        price = itinerary_price(itinerary, currency=request.currency)
+        if price is None:
+            return None
+        if price > request.max_price:
+            return False
+    return True
+
+
+__all__ = ["FlightResultsCache", "effective_airlines"]
@@ -0,0 +1,303 @@
+"""Cheapest trip-window search over google_flights_calendar price grids."""
+
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Literal
+
+from pydantic import Field, PositiveInt, conint, model_validator
+
+from shared.flight_utils import normalise_price
+from shared.models import DeferredModel
+
+MAX_CALENDAR_DAYS = 60
+_ENTRY_BUCKETS = ("calendar", "price_matrix", "prices", "dates", "calendar_results")
+
+
+@dataclass(slots=True)
+class CalendarPrices:
+    """Dense, date-indexed view of one calendar payload.
+
+    `prices[i]` is the cheapest fare departing on `start + i days` (None when unpriced).
+    `round_trips[nights][i]` holds round-trip fares when the payload priced return dates.
+    """
+
+    start: date
+    prices: list[float | None]
+    currency: str = "EUR"
+    round_trips: dict[int, list[float | None]] = field(default_factory=dict)
+
+    @property
+    def end(self) -> date:
+        return self.start + timedelta(days=max(len(self.prices) - 1, 0))
+
+    def price_on(self, day: date) -> float | None:
+        offset = (day - self.start).days
+        if 0 <= offset < len(self.prices):
+            return self.prices[offset]
+        return None
+
+
+class TripWindow(DeferredModel):
+    """One priced outbound/return pair."""
+
+    outbound_date: date
+    return_date: date | None = None
+    nights: int | None = None
+    price: float
+    currency: str = "EUR"
+    outbound_price: float | None = None
+    return_price: float | None = None
+
+
+class TripWindowRequest(DeferredModel):
+    """Input contract for the cheapest-trip-window finder."""
+
+    departure_id: str = Field(..., min_length=3)
+    arrival_id: str = Field(..., min_length=3)
+    start_date: date
+    end_date: date
+    nights: conint(ge=0, le=30) | None = 7
+    flex_nights: conint(ge=0, le=7) = 0
+    outbound_weekdays: list[conint(ge=0, le=6)] = Field(default_factory=list)
+    return_weekdays: list[conint(ge=0, le=6)] = Field(default_factory=list)
+    top_n: PositiveInt = Field(3, le=10)
+    adults: PositiveInt = 1
+    travel_class: Literal["economy", "premium_economy", "business", "first"] = "economy"
+    currency: str = "EUR"
+    fetch_offers: bool = False
+
+    @model_validator(mode="after")
+    def validate_window(self) -> TripWindowRequest:
+        if self.start_date > self.end_date:
+            raise ValueError("start_date cannot be after end_date")
+        if (self.end_date - self.start_date).days >= MAX_CALENDAR_DAYS:
+            raise ValueError(f"calendar window cannot exceed {MAX_CALENDAR_DAYS} days")
+        return self
+
+
+class TripWindowResponse(DeferredModel):
+    """Best trip windows plus optional full offers for the winner."""
+
+    windows: list[TripWindow]
+    offers: dict[str, Any] | None = None
+    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
+def parse_calendar(payload: Mapping[str, Any], *, currency: str = "EUR") -> CalendarPrices | None:
+    """Convert a google_flights_calendar payload into a dense price array."""
+
+    one_way: dict[date, float] = {}
+    round_trip: dict[tuple[date, int], float] = {}
+    for entry in _iter_entries(payload):
+        if entry.get("has_no_flights"):
+            continue
+        departure = _parse_date(
+            entry.get("departure")
+            or entry.get("departure_date")
+            or entry.get("outbound_date")
+            or entry.get("date")
+        )
+        normalized = normalise_price(entry.get("price"), currency=currency)
+        if departure is None or not normalized:
+            continue
+        amount = float(normalized["amount"])
+        returning = _parse_date(entry.get("return") or entry.get("return_date"))
+        if returning is not None and returning >= departure:
+            key = (departure, (returning - departure).days)
+            round_trip[key] = min(amount, round_trip.get(key, amount))
+        else:
+            one_way[departure] = min(amount, one_way.get(departure, amount))
+
+    days = set(one_way) | {departure for departure, _ in round_trip}
+    if not days:
+        return None
+    start, end = min(days), max(days)
+    span = (end - start).days + 1
+    prices: list[float | None] = [None] * span
+    for day, amount in one_way.items():
+        prices[(day - start).days] = amount
+    round_trips: dict[int, list[float | None]] = {}
+    for (day, nights), amount in round_trip.items():
+        row = round_trips.setdefault(nights, [None] * span)
+        row[(day - start).days] = amount
+        offset = (day - start).days
+        if prices[offset] is None or amount < prices[offset]:
+            prices[offset] = amount
+    return CalendarPrices(start=start, prices=prices, currency=currency, round_trips=round_trips)
+
+
+def find_cheapest_trips(
+    outbound: CalendarPrices,
+    *,
+    nights: int | None,
+    flex_nights: int = 0,
+    inbound: CalendarPrices | None = None,
+    outbound_weekdays: Iterable[int] = (),
+    return_weekdays: Iterable[int] = (),
+    top_n: int = 3,
+) -> list[TripWindow]:
+    """Return the `top_n` cheapest trips for the requested stay length.
+
+    Round-trip grids are read directly. One-way grids pair each outbound day with the cheapest
+    inbound day inside `[nights - flex, nights + flex]` via a sliding-window minimum, so the whole
+    search stays O(days).
+    """
+
+    out_days = set(outbound_weekdays)
+    ret_days = set(return_weekdays)
+    if nights is None:
+        candidates = [
+            TripWindow(
+                outbound_date=outbound.start + timedelta(days=offset),
+                price=price,
+                currency=outbound.currency,
+                outbound_price=price,
+            )
+            for offset, price in enumerate(outbound.prices)
+            if price is not None and _weekday_allowed(outbound.start, offset, out_days)
+        ]
+    elif outbound.round_trips:
+        candidates = _round_trip_candidates(
+            outbound, max(nights - flex_nights, 0), nights + flex_nights, out_days, ret_days
+        )
+    elif inbound is not None:
+        candidates = _paired_candidates(
+            outbound,
+            inbound,
+            max(nights - flex_nights, 0),
+            nights + flex_nights,
+            out_days,
+            ret_days,
+        )
+    else:
+        candidates = []
+    return heapq.nsmallest(top_n, candidates, key=_sort_key)
+
+
+def _round_trip_candidates(
+    outbound: CalendarPrices,
+    low: int,
+    high: int,
+    out_days: set[int],
+    ret_days: set[int],
+) -> list[TripWindow]:
+    candidates: list[TripWindow] = []
+    for offset in range(len(outbound.prices)):
+        if not _weekday_allowed(outbound.start, offset, out_days):
+            continue
+        best: tuple[float, int] | None = None
+        for stay in range(low, high + 1):
+            row = outbound.round_trips.get(stay)
+            price = row[offset] if row else None
+            if price is None or not _weekday_allowed(outbound.start, offset + stay, ret_days):
+                continue
+            if best is None or price < best[0]:
+                best = (price, stay)
+        if best:
+            departure = outbound.start + timedelta(days=offset)
+            candidates.append(
+                TripWindow(
+                    outbound_date=departure,
+                    return_date=departure + timedelta(days=best[1]),
+                    nights=best[1],
+                    price=best[0],
+                    currency=outbound.currency,
+                )
+            )
+    return candidates
+
+
+def _paired_candidates(
+    outbound: CalendarPrices,
+    inbound: CalendarPrices,
+    low: int,
+    high: int,
+    out_days: set[int],
+    ret_days: set[int],
+) -> list[TripWindow]:
+    # Inbound prices are read on the outbound day axis; the deque keeps the monotonic minimum of
+    # return days within [offset + low, offset + high].
+    shift = (inbound.start - outbound.start).days
+
+    def inbound_price(day_index: int) -> float | None:
+        offset = day_index - shift
+        if not 0 <= offset < len(inbound.prices):
+            return None
+        if not _weekday_allowed(outbound.start, day_index, ret_days):
+            return None
+        return inbound.prices[offset]
+
+    candidates: list[TripWindow] = []
+    window: deque[tuple[int, float]] = deque()
+    next_index = 0
+    for offset, out_price in enumerate(outbound.prices):
+        while next_index <= offset + high:
+            price = inbound_price(next_index)
+            if price is not None:
+                while window and window[-1][1] >= price:
+                    window.pop()
+                window.append((next_index, price))
+            next_index += 1
+        while window and window[0][0] < offset + low:
+            window.popleft()
+        if (
+            out_price is None
+            or not window
+            or not _weekday_allowed(outbound.start, offset, out_days)
+        ):
+            continue
+        return_index, return_price = window[0]
+        candidates.append(
+            TripWindow(
+                outbound_date=outbound.start + timedelta(days=offset),
+                return_date=outbound.start + timedelta(days=return_index),
+                nights=return_index - offset,
+                price=out_price + return_price,
+                currency=outbound.currency,
+                outbound_price=out_price,
+                return_price=return_price,
+            )
+        )
+    return candidates
+
+
+def _weekday_allowed(start: date, offset: int, weekdays: set[int]) -> bool:
+    return not weekdays or (start + timedelta(days=offset)).weekday() in weekdays
+
+
+def _sort_key(window: TripWindow) -> tuple[float, date]:
+    return window.price, window.outbound_date
+
+
+def _iter_entries(payload: Mapping[str, Any]) -> list[Mapping[str, Any]]:
+    for key in _ENTRY_BUCKETS:
+        bucket = payload.get(key)
+        if isinstance(bucket, list):
+            return [entry for entry in bucket if isinstance(entry, Mapping)]
+    return []
+
+
+def _parse_date(raw: Any) -> date | None:
+    if isinstance(raw, date):
+        return raw
+    if not isinstance(raw, str):
+        return None
+    try:
+        return date.fromisoformat(raw[:10])
+    except ValueError:
+        return None
+
+
+__all__ = [
+    "CalendarPrices",
+    "TripWindow",
+    "TripWindowRequest",
+    "TripWindowResponse",
+    "find_cheapest_trips",
+    "parse_calendar",
+]
@@ -8,20 +8,20 @@ from typing import Any
 from pydantic import ValidationError
 
 from config.settings import get_settings
-from flight_search.service import (
-    FlightSearchRequest,
-    FlightSearchService,
-    SearchAPIClient,
-)
+from flight_search.service import FlightSearchRequest
+from shared.deadline import deadline_scope, lambda_budget
+from shared.prewarm import prewarm
+from shared.registry import get_registry
 
 logger = logging.getLogger(__name__)
 
-settings = get_settings()
-_client = SearchAPIClient(
-    base_url=str(settings.searchapi_endpoint),
-    api_key=settings.searchapi_key,
-)
-_service = FlightSearchService(_client)
+if get_settings().lambda_prewarm:
+    # Lambda init: load caches and open connections so the first invocation skips DNS/TLS.
+    prewarm(
+        ["flight_service"],
+        ["flights_client"],
+        timeout=get_settings().lambda_prewarm_timeout_seconds,
+    )
 
 
 def lambda_handler(event: dict[str, Any], _context: Any | None = None) -> dict[str, Any]:
@@ -33,5 +33,6 @@ def lambda_handler(event: dict[str, Any], _context: Any | None = None) -> dict[s
         logger.error("Invalid Flight Search payload: %s", exc)
         raise
 
-    response = _service.search(request)
+    with deadline_scope(lambda_budget(_context, get_settings().tool_deadline_seconds)):
+        response = get_registry().flight_service().search(request)
     return response.model_dump()
@@ -0,0 +1,159 @@
+"""Learned negative cache for routes where the Lufthansa Group scope returns no itineraries."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import math
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on a blake2b digest)."""
+
+    def __init__(self, size_bits: int, num_hashes: int, bits: bytes | None = None) -> None:
+        self.size_bits = max(8, size_bits)
+        self.num_hashes = max(1, num_hashes)
+        length = (self.size_bits + 7) // 8
+        if bits is not None and len(bits) != length:
+            raise ValueError("bit array does not match size_bits")
+        self._bits = bytearray(bits) if bits is not None else bytearray(length)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, fp_rate: float = 0.01) -> BloomFilter:
+        capacity = max(1, capacity)
+        size_bits = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+        num_hashes = max(1, round(size_bits / capacity * math.log(2)))
+        return cls(size_bits, num_hashes)
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item)
+        )
+
+    def union(self, other: BloomFilter) -> None:
+        if (other.size_bits, other.num_hashes) != (self.size_bits, self.num_hashes):
+            raise ValueError("cannot merge Bloom filters with different parameters")
+        for index, byte in enumerate(other._bits):
+            self._bits[index] |= byte
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits)
+
+    def _positions(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size_bits for i in range(self.num_hashes)]
+
+
+class NegativeRouteCache:
+    """Origin/destination pairs where the LH Group google_flights query came back empty.
+
+    Locally learned routes expire exactly after `ttl_seconds`; the expired entry shadows the Bloom
+    filter until it is rebuilt. Routes imported from another instance's snapshot only live in the
+    Bloom filter, which is rebuilt from the local routes once its oldest contributor is
+    `ttl_seconds` old, so imported knowledge also ages out.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 6 * 3600.0,
+        capacity: int = 4096,
+        fp_rate: float = 0.01,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._capacity = capacity
+        self._fp_rate = fp_rate
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._local: dict[str, float] = {}
+        self._bloom = BloomFilter.for_capacity(capacity, fp_rate)
+        self._bloom_created_at = clock()
+
+    def is_known_empty(self, departure_id: str, arrival_id: str) -> bool:
+        key = _route_key(departure_id, arrival_id)
+        now = self._clock()
+        with self._lock:
+            self._rotate(now)
+            expires_at = self._local.get(key)
+            if expires_at is not None:
+                # An expired entry stays as a tombstone until the next rotation, because the
+                # Bloom filter still holds the key and would otherwise revive it.
+                return expires_at > now
+            return key in self._bloom
+
+    def record_empty(self, departure_id: str, arrival_id: str) -> None:
+        key = _route_key(departure_id, arrival_id)
+        now = self._clock()
+        with self._lock:
+            self._rotate(now)
+            self._local[key] = now + self._ttl
+            self._bloom.add(key)
+
+    def snapshot(self) -> bytes:
+        """Serialise the Bloom filter (no raw routes) for shipping to other instances."""
+
+        with self._lock:
+            self._rotate(self._clock())
+            return json.dumps(
+                {
+                    "size_bits": self._bloom.size_bits,
+                    "num_hashes": self._bloom.num_hashes,
+                    "created_at": self._bloom_created_at,
+                    "bits": base64.b64encode(self._bloom.to_bytes()).decode("ascii"),
+                }
+            ).encode("utf-8")
+
+    def merge_snapshot(self, raw: bytes) -> None:
+        data = json.loads(raw.decode("utf-8"))
+        created_at = float(data["created_at"])
+        now = self._clock()
+        if now - created_at >= self._ttl:
+            return
+        imported = BloomFilter(
+            int(data["size_bits"]),
+            int(data["num_hashes"]),
+            base64.b64decode(data["bits"]),
+        )
+        with self._lock:
+            self._bloom.union(imported)
+            self._bloom_created_at = min(self._bloom_created_at, created_at)
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_bytes(self.snapshot())
+
+    def load(self, path: str | Path) -> bool:
+        """Merge a snapshot from disk; returns False when the file is missing."""
+
+        target = Path(path)
+        if not target.exists():
+            return False
+        self.merge_snapshot(target.read_bytes())
+        return True
+
+    def _rotate(self, now: float) -> None:
+        if now - self._bloom_created_at < self._ttl:
+            return
+        self._local = {key: expires for key, expires in self._local.items() if expires > now}
+        self._bloom = BloomFilter.for_capacity(self._capacity, self._fp_rate)
+        for key in self._local:
+            self._bloom.add(key)
+        self._bloom_created_at = now
+
+
+def _route_key(departure_id: str, arrival_id: str) -> str:
+    return f"{departure_id.upper()}>{arrival_id.upper()}"
+
+
+__all__ = ["BloomFilter", "NegativeRouteCache"]
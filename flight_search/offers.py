@@ -0,0 +1,285 @@
+"""Session-local offer store answering follow-up filter/sort queries without SearchAPI."""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+from datetime import date, time
+from typing import Any, Literal
+
+from pydantic import Field, PositiveInt, model_validator
+
+from flight_search.service import FlightSearchRequest, FlightSearchResponse
+from shared.flight_utils import (
+    iter_itineraries,
+    itinerary_carriers,
+    itinerary_departure,
+    itinerary_duration_minutes,
+    itinerary_price,
+    itinerary_stops,
+)
+from shared.models import DeferredModel
+
+SortKey = Literal["price", "departure", "duration", "stops"]
+
+
+@dataclass(frozen=True, slots=True)
+class FlightOffer:
+    """Flattened itinerary with the attributes the indexes are built on."""
+
+    offer_id: int
+    price: float | None
+    currency: str
+    departure_minute: int | None
+    duration_minutes: int | None
+    stops: int | None
+    carriers: tuple[str, ...]
+    itinerary: dict[str, Any]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "offer_id": self.offer_id,
+            "price": self.price,
+            "currency": self.currency,
+            "departure_time": _minute_to_text(self.departure_minute),
+            "duration_minutes": self.duration_minutes,
+            "stops": self.stops,
+            "carriers": list(self.carriers),
+            "itinerary": self.itinerary,
+        }
+
+
+class OfferQuery(DeferredModel):
+    """Filter/sort/top-k query against offers already fetched in this session."""
+
+    departure_id: str | None = None
+    arrival_id: str | None = None
+    outbound_date: date | None = None
+    return_date: date | None = None
+    min_price: float | None = Field(default=None, ge=0)
+    max_price: float | None = Field(default=None, ge=0)
+    departure_after: time | None = None
+    departure_before: time | None = None
+    max_duration_minutes: PositiveInt | None = None
+    max_stops: int | None = Field(default=None, ge=0)
+    carriers: list[str] = Field(default_factory=list)
+    sort_by: SortKey = "price"
+    descending: bool = False
+    limit: int = Field(5, ge=1, le=50)
+
+    @model_validator(mode="after")
+    def normalise_codes(self) -> OfferQuery:
+        self.carriers = [code.upper() for code in self.carriers]
+        if self.departure_id:
+            self.departure_id = self.departure_id.upper()
+        if self.arrival_id:
+            self.arrival_id = self.arrival_id.upper()
+        return self
+
+    @property
+    def has_route(self) -> bool:
+        return bool(self.departure_id and self.arrival_id and self.outbound_date)
+
+
+class OfferIndex:
+    """Offers from one search, indexed on price, departure, duration, stops and carrier."""
+
+    def __init__(self, request: FlightSearchRequest, response: FlightSearchResponse) -> None:
+        self.request = request
+        self.search_scope = response.metadata.get("search_scope", "lh_group")
+        currency = request.currency
+        self._offers: list[FlightOffer] = []
+        for offer_id, itinerary in enumerate(iter_itineraries(response.flights)):
+            departure = itinerary_departure(itinerary)
+            self._offers.append(
+                FlightOffer(
+                    offer_id=offer_id,
+                    price=itinerary_price(itinerary, currency=currency),
+                    currency=currency,
+                    departure_minute=departure.hour * 60 + departure.minute if departure else None,
+                    duration_minutes=itinerary_duration_minutes(itinerary),
+                    stops=itinerary_stops(itinerary),
+                    carriers=itinerary_carriers(itinerary),
+                    itinerary=itinerary,
+                )
+            )
+        self._sorted: dict[str, tuple[list[float], list[int]]] = {
+            "price": self._build_sorted(lambda offer: offer.price),
+            "departure": self._build_sorted(lambda offer: offer.departure_minute),
+            "duration": self._build_sorted(lambda offer: offer.duration_minutes),
+            "stops": self._build_sorted(lambda offer: offer.stops),
+        }
+        self._by_carrier: dict[str, set[int]] = {}
+        for offer in self._offers:
+            for carrier in offer.carriers:
+                self._by_carrier.setdefault(carrier, set()).add(offer.offer_id)
+
+    def __len__(self) -> int:
+        return len(self._offers)
+
+    @property
+    def airlines(self) -> set[str]:
+        return {code.upper() for code in self.request.included_airlines}
+
+    def covers(self, query: OfferQuery) -> bool:
+        """Return True when the query is answerable from this search without going upstream."""
+
+        request = self.request
+        route = (
+            (query.departure_id, request.departure_id.upper()),
+            (query.arrival_id, request.arrival_id.upper()),
+            (query.outbound_date, request.outbound_date),
+            (query.return_date, request.return_date),
+        )
+        if any(wanted is not None and wanted != searched for wanted, searched in route):
+            return False
+        if request.stops == "nonstop" and query.max_stops != 0:
+            return False
+        if query.carriers and self.search_scope == "lh_group":
+            return set(query.carriers) <= self.airlines
+        return True
+
+    def query(self, query: OfferQuery) -> list[FlightOffer]:
+        candidates = self._range_candidates("price", query.min_price, query.max_price)
+        candidates = _intersect(
+            candidates,
+            self._range_candidates(
+                "departure",
+                _time_to_minute(query.departure_after),
+                _time_to_minute(query.departure_before),
+            ),
+        )
+        candidates = _intersect(
+            candidates, self._range_candidates("duration", None, query.max_duration_minutes)
+        )
+        candidates = _intersect(candidates, self._range_candidates("stops", None, query.max_stops))
+        if query.carriers:
+            allowed: set[int] = set()
+            for carrier in query.carriers:
+                allowed |= self._by_carrier.get(carrier, set())
+            candidates = _intersect(candidates, allowed)
+
+        keys, order = self._sorted[query.sort_by]
+        if query.descending:
+            known = len(keys)
+            ordered = order[:known][::-1] + order[known:]
+        else:
+            ordered = order
+        wanted = set(query.carriers)
+        results: list[FlightOffer] = []
+        for offer_id in ordered:
+            if candidates is not None and offer_id not in candidates:
+                continue
+            offer = self._offers[offer_id]
+            if wanted and not set(offer.carriers) <= wanted:
+                continue
+            results.append(offer)
+            if len(results) >= query.limit:
+                break
+        return results
+
+    def _build_sorted(self, key) -> tuple[list[float], list[int]]:
+        # Offers missing the attribute sort last and are excluded from range filters.
+        known = sorted(
+            (value, offer.offer_id) for offer in self._offers if (value := key(offer)) is not None
+        )
+        unknown = [offer.offer_id for offer in self._offers if key(offer) is None]
+        return [value for value, _ in known], [offer_id for _, offer_id in known] + unknown
+
+    def _range_candidates(
+        self,
+        field: str,
+        lower: float | None,
+        upper: float | None,
+    ) -> set[int] | None:
+        if lower is None and upper is None:
+            return None
+        keys, order = self._sorted[field]
+        start = bisect.bisect_left(keys, lower) if lower is not None else 0
+        end = bisect.bisect_right(keys, upper) if upper is not None else len(keys)
+        return set(order[start:end])
+
+
+class SessionOfferStore:
+    """All offers fetched within one conversation, newest search first."""
+
+    def __init__(self, max_searches: int = 8) -> None:
+        self._indexes: list[OfferIndex] = []
+        self._max_searches = max(1, max_searches)
+
+    def ingest(self, request: FlightSearchRequest, response: FlightSearchResponse) -> OfferIndex:
+        index = OfferIndex(request, response)
+        self._indexes = [
+            existing
+            for existing in self._indexes
+            if _route_key(existing.request) != _route_key(request)
+        ]
+        self._indexes.insert(0, index)
+        del self._indexes[self._max_searches :]
+        return index
+
+    def find(self, query: OfferQuery) -> OfferIndex | None:
+        """Return the newest search that covers the query, if any."""
+
+        for index in self._indexes:
+            if index.covers(query):
+                return index
+        return None
+
+    def complete_route(self, query: OfferQuery) -> OfferQuery | None:
+        """Fill route fields the query leaves out from the newest search, if there is one.
+
+        The return date is only inherited together with the outbound date, so moving the outbound
+        day never pairs it with a stale return.
+        """
+
+        if query.has_route:
+            return query
+        if not self._indexes:
+            return None
+        request = self._indexes[0].request
+        keep_dates = query.outbound_date is None
+        return query.model_copy(
+            update={
+                "departure_id": query.departure_id or request.departure_id.upper(),
+                "arrival_id": query.arrival_id or request.arrival_id.upper(),
+                "outbound_date": query.outbound_date or request.outbound_date,
+                "return_date": query.return_date or (request.return_date if keep_dates else None),
+            }
+        )
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+
+def _route_key(request: FlightSearchRequest) -> tuple[Any, ...]:
+    return (
+        request.departure_id.upper(),
+        request.arrival_id.upper(),
+        request.outbound_date,
+        request.return_date,
+        request.travel_class,
+        request.adults,
+        request.currency,
+    )
+
+
+def _intersect(current: set[int] | None, other: set[int] | None) -> set[int] | None:
+    if current is None:
+        return other
+    if other is None:
+        return current
+    return current & other
+
+
+def _time_to_minute(value: time | None) -> int | None:
+    return value.hour * 60 + value.minute if value is not None else None
+
+
+def _minute_to_text(minute: int | None) -> str | None:
+    if minute is None:
+        return None
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+__all__ = ["FlightOffer", "OfferIndex", "OfferQuery", "SessionOfferStore"]
@@ -0,0 +1,322 @@
+"""Append-only SQLite store of calendar and offer prices for broad price questions."""
+
+from __future__ import annotations
+
+import sqlite3
+import statistics
+import threading
+import time
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from pydantic import Field, conint
+
+from flight_search.calendar import CalendarPrices
+from shared.flight_utils import iter_itineraries, itinerary_price
+from shared.models import DeferredModel
+
+if TYPE_CHECKING:
+    from flight_search.service import FlightSearchRequest, FlightSearchResponse
+
+TravelClass = Literal["economy", "premium_economy", "business", "first"]
+
+# nights = -1 marks one-way fares so the column stays NOT NULL and indexable.
+_ONE_WAY = -1
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS price_quotes (
+    route TEXT NOT NULL,
+    travel_date TEXT NOT NULL,
+    nights INTEGER NOT NULL,
+    travel_class TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    price REAL NOT NULL,
+    source TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS price_quotes_route_date
+    ON price_quotes (route, travel_date, fetched_at);
+"""
+_FLAT_TREND_PCT = 3.0
+
+
+class PriceInsightRequest(DeferredModel):
+    """Broad price question answered from stored quotes only."""
+
+    departure_id: str = Field(..., min_length=3)
+    arrival_id: str = Field(..., min_length=3)
+    question: Literal["cheapest_month", "typical_price", "price_trend"]
+    month: str | None = Field(default=None, pattern=r"^\d{4}-\d{2}$")
+    nights: conint(ge=0, le=30) | None = None
+    travel_class: TravelClass = "economy"
+    currency: str = "EUR"
+    max_age_days: conint(ge=1, le=365) = 30
+
+
+class MonthlyLow(DeferredModel):
+    month: str
+    price: float
+    travel_date: date
+    samples: int
+
+
+class PriceStats(DeferredModel):
+    samples: int
+    median: float
+    low: float
+    high: float
+    p25: float
+    p75: float
+    month: str | None = None
+
+
+class TrendPoint(DeferredModel):
+    fetched_on: date
+    median: float
+    samples: int
+
+
+class PriceTrend(DeferredModel):
+    direction: Literal["rising", "falling", "flat", "unknown"]
+    change_pct: float | None = None
+    points: list[TrendPoint] = Field(default_factory=list)
+
+
+class PriceHistoryStore:
+    """Records every normalised per-adult price we pay SearchAPI for; never updates rows.
+
+    Queries read the most recent quote per travel date within `max_age_days`, so newer fetches
+    supersede older ones without deleting them.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = ":memory:",
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def record_calendar(
+        self,
+        departure_id: str,
+        arrival_id: str,
+        calendar: CalendarPrices,
+        *,
+        travel_class: str = "economy",
+        adults: int = 1,
+    ) -> int:
+        """Store a parsed calendar grid; round-trip grids are stored per stay length."""
+
+        rows: list[tuple[date, int, float]] = []
+        if calendar.round_trips:
+            for nights, prices in calendar.round_trips.items():
+                rows.extend(_dated(calendar.start, prices, nights))
+        else:
+            rows.extend(_dated(calendar.start, calendar.prices, _ONE_WAY))
+        return self._insert(
+            _route(departure_id, arrival_id),
+            rows,
+            travel_class=travel_class,
+            currency=calendar.currency,
+            adults=adults,
+            source="calendar",
+        )
+
+    def record_offer(self, request: FlightSearchRequest, response: FlightSearchResponse) -> int:
+        """Store the cheapest itinerary of a google_flights response."""
+
+        prices = [
+            price
+            for itinerary in iter_itineraries(response.flights)
+            if (price := itinerary_price(itinerary, currency=request.currency)) is not None
+        ]
+        if not prices:
+            return 0
+        nights = (
+            (request.return_date - request.outbound_date).days if request.return_date else _ONE_WAY
+        )
+        return self._insert(
+            _route(request.departure_id, request.arrival_id),
+            [(request.outbound_date, nights, min(prices))],
+            travel_class=request.travel_class,
+            currency=request.currency,
+            adults=request.adults,
+            source="offer",
+        )
+
+    def cheapest_months(self, request: PriceInsightRequest) -> list[MonthlyLow]:
+        """Upcoming months ordered by their lowest stored fare."""
+
+        today = _utc_date(self._clock()).isoformat()
+        by_month: dict[str, list[tuple[float, date]]] = {}
+        for travel_date, price in self._latest_per_date(request).items():
+            if travel_date >= today:
+                by_month.setdefault(travel_date[:7], []).append(
+                    (price, date.fromisoformat(travel_date))
+                )
+        lows = [
+            MonthlyLow(
+                month=month,
+                price=min(entries)[0],
+                travel_date=min(entries)[1],
+                samples=len(entries),
+            )
+            for month, entries in by_month.items()
+        ]
+        return sorted(lows, key=lambda low: (low.price, low.month))
+
+    def typical_price(self, request: PriceInsightRequest) -> PriceStats | None:
+        prices = sorted(
+            price
+            for travel_date, price in self._latest_per_date(request).items()
+            if request.month is None or travel_date.startswith(request.month)
+        )
+        if not prices:
+            return None
+        quartiles = statistics.quantiles(prices, n=4) if len(prices) > 1 else [prices[0]] * 3
+        return PriceStats(
+            samples=len(prices),
+            median=statistics.median(prices),
+            low=prices[0],
+            high=prices[-1],
+            p25=quartiles[0],
+            p75=quartiles[2],
+            month=request.month,
+        )
+
+    def price_trend(self, request: PriceInsightRequest) -> PriceTrend:
+        """How fares for the same travel dates moved across fetch days, oldest day first.
+
+        Each travel date is only compared with itself, so a mix of near and far dates fetched on
+        different days cannot fake a trend. `change_pct` is the median change per travel date
+        between its first and last fetch day; points are daily medians over those dates.
+        """
+
+        by_date: dict[str, dict[date, float]] = {}
+        for travel_date, price, fetched_at in self._rows(request):
+            if request.month is None or travel_date.startswith(request.month):
+                # Rows are ordered by fetched_at within a date, so a day's last quote wins.
+                by_date.setdefault(travel_date, {})[_utc_date(fetched_at)] = price
+        repeated = {key: days for key, days in by_date.items() if len(days) > 1}
+        by_day: dict[date, list[float]] = {}
+        for days in (repeated or by_date).values():
+            for day, price in days.items():
+                by_day.setdefault(day, []).append(price)
+        points = [
+            TrendPoint(fetched_on=day, median=statistics.median(prices), samples=len(prices))
+            for day, prices in sorted(by_day.items())
+        ]
+        changes = [
+            (days[max(days)] - days[min(days)]) / days[min(days)] * 100
+            for days in repeated.values()
+            if days[min(days)] > 0
+        ]
+        if not changes:
+            return PriceTrend(direction="unknown", points=points)
+        change = statistics.median(changes)
+        if abs(change) < _FLAT_TREND_PCT:
+            direction = "flat"
+        else:
+            direction = "rising" if change > 0 else "falling"
+        return PriceTrend(direction=direction, change_pct=round(change, 1), points=points)
+
+    def answer(self, request: PriceInsightRequest) -> dict[str, Any] | None:
+        """Dispatch a PriceInsightRequest; None when nothing relevant is stored."""
+
+        if request.question == "cheapest_month":
+            months = self.cheapest_months(request)
+            return {"months": [low.model_dump() for low in months]} if months else None
+        if request.question == "typical_price":
+            stats = self.typical_price(request)
+            return stats.model_dump() if stats else None
+        trend = self.price_trend(request)
+        return trend.model_dump() if trend.points else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _insert(
+        self,
+        route: str,
+        rows: Iterable[tuple[date, int, float]],
+        *,
+        travel_class: str,
+        currency: str,
+        adults: int,
+        source: str,
+    ) -> int:
+        fetched_at = self._clock()
+        values = [
+            (
+                route,
+                travel_date.isoformat(),
+                nights,
+                travel_class,
+                currency,
+                price / max(adults, 1),
+                source,
+                fetched_at,
+            )
+            for travel_date, nights, price in rows
+        ]
+        if not values:
+            return 0
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO price_quotes VALUES (?, ?, ?, ?, ?, ?, ?, ?)", values
+            )
+        return len(values)
+
+    def _rows(self, request: PriceInsightRequest) -> list[tuple[str, float, float]]:
+        since = self._clock() - timedelta(days=request.max_age_days).total_seconds()
+        with self._lock:
+            cursor = self._connection.execute(
+                "SELECT travel_date, price, fetched_at FROM price_quotes "
+                "WHERE route = ? AND nights = ? AND travel_class = ? AND currency = ? "
+                "AND fetched_at >= ? ORDER BY travel_date, fetched_at",
+                (
+                    _route(request.departure_id, request.arrival_id),
+                    request.nights if request.nights is not None else _ONE_WAY,
+                    request.travel_class,
+                    request.currency,
+                    since,
+                ),
+            )
+            return cursor.fetchall()
+
+    def _latest_per_date(self, request: PriceInsightRequest) -> dict[str, float]:
+        # Rows are ordered by fetched_at within each date, so the last write wins.
+        return {travel_date: price for travel_date, price, _ in self._rows(request)}
+
+
+def _route(departure_id: str, arrival_id: str) -> str:
+    return f"{departure_id.upper()}-{arrival_id.upper()}"
+
+
+def _utc_date(timestamp: float) -> date:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).date()
+
+
+def _dated(start: date, prices: list[float | None], nights: int) -> list[tuple[date, int, float]]:
+    return [
+        (start + timedelta(days=offset), nights, price)
+        for offset, price in enumerate(prices)
+        if price is not None
+    ]
+
+
+__all__ = [
+    "MonthlyLow",
+    "PriceHistoryStore",
+    "PriceInsightRequest",
+    "PriceStats",
+    "PriceTrend",
+    "TrendPoint",
+]
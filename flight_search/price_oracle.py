@@ -0,0 +1,161 @@
+"""Answers route/date price questions from recently fetched calendar grids."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Literal
+
+from pydantic import Field, PositiveInt, model_validator
+
+from flight_search.calendar import CalendarPrices
+from shared.models import DeferredModel
+
+
+class PriceLookupRequest(DeferredModel):
+    """Price-only question for one route and date."""
+
+    departure_id: str = Field(..., min_length=3)
+    arrival_id: str = Field(..., min_length=3)
+    outbound_date: date
+    return_date: date | None = None
+    adults: PositiveInt = 1
+    travel_class: Literal["economy", "premium_economy", "business", "first"] = "economy"
+    currency: str = "EUR"
+    max_age_minutes: PositiveInt = Field(60, le=24 * 60)
+    need_itineraries: bool = False
+
+    @model_validator(mode="after")
+    def validate_dates(self) -> PriceLookupRequest:
+        if self.return_date and self.return_date < self.outbound_date:
+            raise ValueError("return_date cannot be before outbound_date")
+        return self
+
+    @property
+    def nights(self) -> int | None:
+        return (self.return_date - self.outbound_date).days if self.return_date else None
+
+
+class PriceQuote(DeferredModel):
+    """Price for a route/date, with where it came from and how old it is."""
+
+    price: float | None
+    currency: str
+    outbound_date: date
+    return_date: date | None = None
+    source: Literal["calendar", "flights"]
+    age_seconds: float = 0.0
+    fallback_reason: Literal["itineraries_requested", "no_recent_calendar"] | None = None
+    offers: dict[str, Any] | None = None
+
+
+@dataclass(slots=True)
+class _Grid:
+    calendar: CalendarPrices
+    fetched_at: float
+
+
+class CalendarPriceOracle:
+    """Keeps the last few parsed calendar grids per route and cabin in memory."""
+
+    def __init__(
+        self,
+        *,
+        grids_per_route: int = 4,
+        max_routes: int = 128,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._grids_per_route = max(1, grids_per_route)
+        self._max_routes = max(1, max_routes)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._grids: OrderedDict[tuple[Any, ...], list[_Grid]] = OrderedDict()
+
+    def remember(
+        self,
+        departure_id: str,
+        arrival_id: str,
+        calendar: CalendarPrices,
+        *,
+        travel_class: str = "economy",
+        adults: int = 1,
+    ) -> None:
+        key = _key(
+            departure_id,
+            arrival_id,
+            travel_class,
+            adults,
+            calendar.currency,
+            round_trip=bool(calendar.round_trips),
+        )
+        with self._lock:
+            grids = self._grids.get(key, [])
+            grids.insert(0, _Grid(calendar, self._clock()))
+            self._grids[key] = grids[: self._grids_per_route]
+            self._grids.move_to_end(key)
+            while len(self._grids) > self._max_routes:
+                self._grids.popitem(last=False)
+
+    def lookup(self, request: PriceLookupRequest) -> PriceQuote | None:
+        """Return the newest calendar price for the request, or None when none is fresh enough."""
+
+        key = _key(
+            request.departure_id,
+            request.arrival_id,
+            request.travel_class,
+            request.adults,
+            request.currency,
+            round_trip=request.nights is not None,
+        )
+        now = self._clock()
+        max_age = request.max_age_minutes * 60
+        with self._lock:
+            grids = list(self._grids.get(key, []))
+        for grid in grids:
+            age = now - grid.fetched_at
+            if age > max_age:
+                break
+            price = _price_on(grid.calendar, request.outbound_date, request.nights)
+            if price is not None:
+                return PriceQuote(
+                    price=price,
+                    currency=grid.calendar.currency,
+                    outbound_date=request.outbound_date,
+                    return_date=request.return_date,
+                    source="calendar",
+                    age_seconds=round(age, 1),
+                )
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._grids.clear()
+
+
+def _key(
+    departure_id: str,
+    arrival_id: str,
+    travel_class: str,
+    adults: int,
+    currency: str,
+    *,
+    round_trip: bool,
+) -> tuple[Any, ...]:
+    return (departure_id.upper(), arrival_id.upper(), travel_class, adults, currency, round_trip)
+
+
+def _price_on(calendar: CalendarPrices, day: date, nights: int | None) -> float | None:
+    if nights is None:
+        return calendar.price_on(day)
+    row = calendar.round_trips.get(nights)
+    offset = (day - calendar.start).days
+    if row is None or not 0 <= offset < len(row):
+        return None
+    return row[offset]
+
+
+__all__ = ["CalendarPriceOracle", "PriceLookupRequest", "PriceQuote"]
@@ -3,16 +3,44 @@
 from __future__ import annotations
 
 import logging
-from datetime import date
+import sqlite3
+import time
+from datetime import date, timedelta
 from typing import Any, Literal
 
 import httpx
 from pydantic import BaseModel, Field, PositiveInt, conint, model_validator
 
-from shared.flight_utils import LH_GROUP_AIRLINES, airlines_csv, extract_best_price, star_alliance_list
+from flight_search.cache import FlightResultsCache
+from flight_search.calendar import (
+    MAX_CALENDAR_DAYS,
+    CalendarPrices,
+    TripWindowRequest,
+    TripWindowResponse,
+    find_cheapest_trips,
+    parse_calendar,
+)
+from flight_search.negative_cache import NegativeRouteCache
+from flight_search.price_history import PriceHistoryStore
+from flight_search.price_oracle import CalendarPriceOracle, PriceLookupRequest, PriceQuote
+from shared import deadline
+from shared.flight_utils import (
+    LH_GROUP_AIRLINES,
+    airlines_csv,
+    extract_best_price,
+    lhg_airlines_list,
+    star_alliance_list,
+)
+from shared.http import PooledHTTP
+from shared.latency import HedgePolicy, LatencyTracker, get_latency_tracker
+from shared.resilience import Upstream, UpstreamUnavailableError, get_upstream
 
 logger = logging.getLogger(__name__)
 
+# Minimum remaining deadline budget before optional calls are attempted.
+CALENDAR_MIN_SECONDS = 3.0
+OFFERS_MIN_SECONDS = 5.0
+
 
 class FlightSearchError(RuntimeError):
     """Raised when SearchAPI requests fail."""
@@ -41,6 +69,7 @@ class FlightSearchRequest(BaseModel):
     adults: PositiveInt = 1
     travel_class: Literal["economy", "premium_economy", "business", "first"] = "economy"
     stops: Literal["any", "nonstop"] = "any"
+    max_price: PositiveInt | None = None
     included_airlines: list[str] = Field(default_factory=lambda: list(LH_GROUP_AIRLINES))
     currency: str = "EUR"
     locale: str = "en"
@@ -62,7 +91,11 @@ class FlightSearchResponse(BaseModel):
 
 
 class SearchAPIClient:
-    """Simple HTTP client for google_flights + calendar endpoints."""
+    """Simple HTTP client for google_flights + calendar endpoints.
+
+    Per-attempt timeouts adapt to the observed per-engine latency (`timeout` is the ceiling).
+    With a `hedge` policy, an attempt that outlives the engine's rolling p95 gets a duplicate.
+    """
 
     def __init__(
         self,
@@ -71,11 +104,17 @@ class SearchAPIClient:
         *,
         timeout: float = 20.0,
         transport: httpx.BaseTransport | None = None,
+        upstream: Upstream | None = None,
+        latency: LatencyTracker | None = None,
+        hedge: HedgePolicy | None = None,
     ) -> None:
         self._base_url = base_url
         self._api_key = api_key
         self._timeout = timeout
-        self._transport = transport
+        self._http = PooledHTTP(transport=transport)
+        self._upstream = upstream or get_upstream("searchapi")
+        self._latency = latency or get_latency_tracker("searchapi")
+        self._hedge = hedge
 
     def flights(self, request: FlightSearchRequest) -> dict[str, Any]:
         params = {
@@ -93,6 +132,8 @@ class SearchAPIClient:
         }
         if request.return_date:
             params["return_date"] = request.return_date.isoformat()
+        if request.max_price:
+            params["max_price"] = request.max_price
 
         return self._perform_request(params, "google_flights")
 
@@ -116,14 +157,48 @@ class SearchAPIClient:
         }
         return self._perform_request(params, "google_flights_calendar")
 
+    def warm(self, *, timeout: float) -> bool:
+        """Open a pooled connection to SearchAPI without running (or paying for) a search."""
+
+        return self._http.probe(self._base_url, timeout=timeout)
+
+    def close(self) -> None:
+        self._http.close()
+
     def _perform_request(self, params: dict[str, Any], engine: str) -> dict[str, Any]:
         headers = {"Authorization": f"Bearer {self._api_key}"}
         params = {**params, "api_key": self._api_key}
+
+        def attempt() -> httpx.Response:
+            # Re-derived per attempt so retries and hedges only get what is left of the deadline.
+            adaptive = self._latency.timeout_for(engine, ceiling=self._timeout)
+            timeout = deadline.clamp_timeout(adaptive)
+            started = time.perf_counter()
+            try:
+                response = self._http.client.get(
+                    self._base_url, params=params, headers=headers, timeout=timeout
+                )
+            except httpx.TimeoutException:
+                # A cut-off attempt still says the engine is at least this slow; cuts made by
+                # the caller's deadline say nothing about the engine.
+                if timeout >= adaptive:
+                    self._latency.record_timeout(engine, timeout)
+                raise
+            self._latency.record(engine, time.perf_counter() - started)
+            return response
+
+        def hedged_attempt() -> httpx.Response:
+            if self._hedge is None:
+                return attempt()
+            delay = self._latency.percentile(engine, self._hedge.quantile)
+            return self._hedge.run(attempt, delay=delay)
+
         try:
-            with httpx.Client(timeout=self._timeout, transport=self._transport) as client:
-                response = client.get(self._base_url, params=params, headers=headers)
-                response.raise_for_status()
-                return response.json()
+            response = self._upstream.send(hedged_attempt)
+            response.raise_for_status()
+            return response.json()
+        except UpstreamUnavailableError as exc:
+            raise FlightSearchError(f"SearchAPI {engine} skipped: {exc}") from exc
         except httpx.HTTPStatusError as exc:
             raise FlightSearchError(
                 f"SearchAPI {engine} failed with status {exc.response.status_code}"
@@ -139,19 +214,122 @@ class FlightSearchService:
         self,
         flights_client: SearchAPIClient,
         calendar_client: SearchAPIClient | None = None,
+        *,
+        cache: FlightResultsCache | None = None,
+        negative_cache: NegativeRouteCache | None = None,
+        price_history: PriceHistoryStore | None = None,
+        price_oracle: CalendarPriceOracle | None = None,
     ) -> None:
         self._flights_client = flights_client
         self._calendar_client = calendar_client or flights_client
+        self._cache = cache if cache is not None else FlightResultsCache()
+        self._negative_cache = (
+            negative_cache if negative_cache is not None else NegativeRouteCache()
+        )
+        self._price_history = price_history
+        self._price_oracle = price_oracle if price_oracle is not None else CalendarPriceOracle()
 
     def search(self, request: FlightSearchRequest) -> FlightSearchResponse:
-        flights_payload = self._flights_client.flights(request)
-        search_scope = "lh_group"
-        if _is_empty_payload(flights_payload):
-            fallback_request = request.model_copy(update={"included_airlines": star_alliance_list()})
-            flights_payload = self._flights_client.flights(fallback_request)
-            search_scope = "star_alliance"
+        cached = self._cache.lookup(request)
+        if cached is not None:
+            return cached
+        response = self._search_upstream(request)
+        if not response.metadata.get("skipped"):
+            # A response trimmed to meet a deadline must not answer later, unhurried requests.
+            self._cache.store(request, response)
+        self._record_prices(request, response)
+        return response
+
+    def search_calendar(self, request: FlightSearchRequest) -> FlightSearchResponse:
+        """Price `request.calendar_window` with one google_flights_calendar call and no search."""
+
+        cached = self._cache.lookup_calendar(request)
+        if cached is not None:
+            return cached
+        payload = self._calendar_client.calendar(request)
+        self._record_calendar(request, parse_calendar(payload, currency=request.currency))
+        calendar_url = payload.get("search_metadata", {}).get("google_url")
+        response = FlightSearchResponse(
+            flights={},
+            calendar=payload,
+            metadata={"calendar_url": calendar_url} if calendar_url else {},
+        )
+        self._cache.store_calendar(request, response)
+        return response
+
+    def quote_price(self, request: PriceLookupRequest) -> PriceQuote:
+        """Answer a price-only question from a recent calendar grid, else via a flights search."""
+
+        if not request.need_itineraries:
+            quote = self._price_oracle.lookup(request)
+            if quote is not None:
+                return quote
+        response = self.search(
+            FlightSearchRequest(
+                departure_id=request.departure_id,
+                arrival_id=request.arrival_id,
+                outbound_date=request.outbound_date,
+                return_date=request.return_date,
+                adults=request.adults,
+                travel_class=request.travel_class,
+                currency=request.currency,
+            )
+        )
+        price_hint = response.metadata.get("price_hint") or {}
+        return PriceQuote(
+            price=price_hint.get("amount"),
+            currency=price_hint.get("currency", request.currency),
+            outbound_date=request.outbound_date,
+            return_date=request.return_date,
+            source="flights",
+            fallback_reason=(
+                "itineraries_requested" if request.need_itineraries else "no_recent_calendar"
+            ),
+            offers=response.model_dump() if request.need_itineraries else None,
+        )
+
+    def _record_prices(self, request: FlightSearchRequest, response: FlightSearchResponse) -> None:
+        """Append the prices we just paid for to the history store and the calendar oracle."""
+
+        if self._price_history is not None:
+            try:
+                self._price_history.record_offer(request, response)
+            except sqlite3.Error as exc:
+                logger.warning("Price history write failed: %s", exc)
+        if response.calendar:
+            self._record_calendar(
+                request, parse_calendar(response.calendar, currency=request.currency)
+            )
+
+    def _record_calendar(
+        self, request: FlightSearchRequest, calendar: CalendarPrices | None
+    ) -> None:
+        if calendar is None:
+            return
+        departure_id, arrival_id = request.departure_id, request.arrival_id
+        travel_class, adults = request.travel_class, request.adults
+        # The oracle answers "what does this route cost", so it only learns from grids priced
+        # over any stops and the default LH Group carriers (the calendar engine ignores max_price).
+        if request.stops == "any" and _default_scope(request):
+            self._price_oracle.remember(
+                departure_id, arrival_id, calendar, travel_class=travel_class, adults=adults
+            )
+        if self._price_history is None:
+            return
+        try:
+            self._price_history.record_calendar(
+                departure_id, arrival_id, calendar, travel_class=travel_class, adults=adults
+            )
+        except sqlite3.Error as exc:
+            logger.warning("Price history write failed: %s", exc)
+
+    def _search_upstream(self, request: FlightSearchRequest) -> FlightSearchResponse:
+        flights_payload, search_scope, lh_group_skipped = self._fetch_flights(request)
         calendar_payload = None
-        if request.calendar_window:
+        skipped: list[str] = []
+        if request.calendar_window and not deadline.has_time_for(CALENDAR_MIN_SECONDS):
+            skipped.append("calendar")
+        elif request.calendar_window:
             try:
                 calendar_payload = self._calendar_client.calendar(request)
             except FlightSearchError as exc:
@@ -169,6 +347,9 @@ class FlightSearchService:
                 currency=request.currency,
             ),
             "search_scope": search_scope,
+            "negative_cache_hit": lh_group_skipped == "negative_cache",
+            "lh_group_skipped": lh_group_skipped,
+            "skipped": skipped,
         }
         return FlightSearchResponse(
             flights=flights_payload,
@@ -176,6 +357,132 @@ class FlightSearchService:
             metadata={k: v for k, v in metadata.items() if v},
         )
 
+    def _fetch_flights(
+        self, request: FlightSearchRequest
+    ) -> tuple[dict[str, Any], str, str | None]:
+        """Query LH Group first and widen to Star Alliance, skipping routes known to be empty.
+
+        The third element names why the LH Group query was skipped (`negative_cache`), or is None
+        when it was sent.
+        """
+
+        fallback_request = request.model_copy(update={"included_airlines": star_alliance_list()})
+        lh_group_scope = _default_scope(request)
+        skip_reason = self._lh_group_skip_reason(request) if lh_group_scope else None
+        if skip_reason:
+            logger.debug(
+                "Skipping LH Group query for %s-%s (%s)",
+                request.departure_id,
+                request.arrival_id,
+                skip_reason,
+            )
+            return self._flights_client.flights(fallback_request), "star_alliance", skip_reason
+
+        flights_payload = self._flights_client.flights(request)
+        if not _is_empty_payload(flights_payload):
+            return flights_payload, "lh_group", None
+        # Only the broadest LH Group query proves the route itself is unserved.
+        if lh_group_scope and request.stops == "any" and request.max_price is None:
+            self._negative_cache.record_empty(request.departure_id, request.arrival_id)
+        return self._flights_client.flights(fallback_request), "star_alliance", None
+
+    def _lh_group_skip_reason(self, request: FlightSearchRequest) -> str | None:
+        if self._negative_cache.is_known_empty(request.departure_id, request.arrival_id):
+            return "negative_cache"
+        return None
+
+    def find_trip_windows(self, request: TripWindowRequest) -> TripWindowResponse:
+        """Pick the cheapest outbound/return pairs from one or two calendar calls."""
+
+        nights = request.nights
+        window_days = (request.end_date - request.start_date).days + 1
+        calendar_request = FlightSearchRequest(
+            departure_id=request.departure_id,
+            arrival_id=request.arrival_id,
+            outbound_date=request.start_date,
+            return_date=request.start_date + timedelta(days=nights) if nights else None,
+            adults=request.adults,
+            travel_class=request.travel_class,
+            currency=request.currency,
+            calendar_window=CalendarWindow(
+                start_date=request.start_date, end_date=request.end_date
+            ),
+            calendar_limit=min(window_days, MAX_CALENDAR_DAYS),
+        )
+        outbound_payload = self._calendar_client.calendar(calendar_request)
+        outbound = parse_calendar(outbound_payload, currency=request.currency)
+        metadata: dict[str, Any] = {
+            "calendar_url": outbound_payload.get("search_metadata", {}).get("google_url"),
+            "calendar_calls": 1,
+        }
+        self._record_calendar(calendar_request, outbound)
+        if outbound is None:
+            return TripWindowResponse(windows=[], metadata=metadata)
+
+        inbound = None
+        if nights is not None and not outbound.round_trips:
+            # One-way grid: price the reverse route over the shifted window and pair the two.
+            shortest_stay = max(nights - request.flex_nights, 0)
+            inbound_start = request.start_date + timedelta(days=shortest_stay)
+            inbound_end = min(
+                request.end_date + timedelta(days=nights + request.flex_nights),
+                inbound_start + timedelta(days=MAX_CALENDAR_DAYS - 1),
+            )
+            inbound_request = calendar_request.model_copy(
+                update={
+                    "departure_id": request.arrival_id,
+                    "arrival_id": request.departure_id,
+                    "outbound_date": inbound_start,
+                    "return_date": None,
+                    "calendar_window": CalendarWindow(
+                        start_date=inbound_start, end_date=inbound_end
+                    ),
+                    "calendar_limit": (inbound_end - inbound_start).days + 1,
+                }
+            )
+            inbound = parse_calendar(
+                self._calendar_client.calendar(inbound_request), currency=request.currency
+            )
+            metadata["calendar_calls"] = 2
+            self._record_calendar(inbound_request, inbound)
+
+        windows = find_cheapest_trips(
+            outbound,
+            nights=nights,
+            flex_nights=request.flex_nights,
+            inbound=inbound,
+            outbound_weekdays=request.outbound_weekdays,
+            return_weekdays=request.return_weekdays,
+            top_n=request.top_n,
+        )
+        offers = None
+        if request.fetch_offers and windows and not deadline.has_time_for(OFFERS_MIN_SECONDS):
+            metadata["skipped"] = ["offers"]
+        elif request.fetch_offers and windows:
+            best = windows[0]
+            offers = self.search(
+                FlightSearchRequest(
+                    departure_id=request.departure_id,
+                    arrival_id=request.arrival_id,
+                    outbound_date=best.outbound_date,
+                    return_date=best.return_date,
+                    adults=request.adults,
+                    travel_class=request.travel_class,
+                    currency=request.currency,
+                )
+            ).model_dump()
+        return TripWindowResponse(
+            windows=windows,
+            offers=offers,
+            metadata={k: v for k, v in metadata.items() if v},
+        )
+
+
+def _default_scope(request: FlightSearchRequest) -> bool:
+    """True when the request asks for exactly the LH Group carriers and no others."""
+
+    return set(lhg_airlines_list(request.included_airlines)) == set(LH_GROUP_AIRLINES)
+
 
 def _is_empty_payload(payload: dict[str, Any]) -> bool:
     for key in ("best_flights", "other_flights"):
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Measure the cold-start import cost of each Lambda handler with `python -X importtime`.
+
+Every sample imports one handler in a fresh interpreter, so nothing is shared between runs. The
+median cumulative import time is compared against a budget: by default the ones below, or a
+baseline JSON written earlier with `--update-baseline` plus `--tolerance`. The script exits
+non-zero when a handler exceeds its budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+HANDLERS = (
+    "flight_search.handler",
+    "destination_scout.handler",
+    "supervisor.handler",
+)
+
+# Milliseconds; generous enough for a cold Lambda sandbox, tight enough to catch strands or a
+# service module sneaking back into a handler's import path.
+DEFAULT_BUDGETS_MS: dict[str, float] = {
+    "flight_search.handler": 900.0,
+    "destination_scout.handler": 900.0,
+    "supervisor.handler": 600.0,
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(HANDLERS), help="Modules to import.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module.")
+    parser.add_argument("--baseline", type=Path, help="JSON file of {module: milliseconds}.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed regression over the baseline as a fraction (default 0.25).",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the measured medians to --baseline instead of checking them.",
+    )
+    parser.add_argument("--top", type=int, default=5, help="Packages to list per module.")
+    return parser.parse_args()
+
+
+def _importtime(code: str) -> list[tuple[int, int, str]]:
+    """Run `code` in a fresh interpreter; return (self_us, cumulative_us, name) rows."""
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def _interpreter_modules() -> set[str]:
+    return {name.strip() for _, _, name in _importtime("pass")}
+
+
+def sample(module: str, preloaded: set[str]) -> tuple[float, Counter[str]]:
+    """Return the handler's import time in ms and the self time per top-level package."""
+
+    total_us = 0
+    packages: Counter[str] = Counter()
+    for self_us, cumulative_us, name in _importtime(f"import {module}"):
+        if name.strip() in preloaded:
+            continue
+        if not name.startswith("  "):
+            total_us += cumulative_us
+        packages[name.strip().split(".")[0]] += self_us
+    return total_us / 1000, packages
+
+
+def measure(module: str, runs: int, preloaded: set[str]) -> tuple[float, Counter[str]]:
+    totals: list[float] = []
+    packages: Counter[str] = Counter()
+    for _ in range(runs):
+        total, contributors = sample(module, preloaded)
+        totals.append(total)
+        packages.update(contributors)
+    return statistics.median(totals), Counter(
+        {name: us / runs / 1000 for name, us in packages.items()}
+    )
+
+
+def main() -> int:
+    args = parse_args()
+    preloaded = _interpreter_modules()
+    baseline: dict[str, float] = {}
+    if args.baseline and args.baseline.exists() and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+
+    results: dict[str, float] = {}
+    failures: list[str] = []
+    for module in args.modules:
+        median_ms, packages = measure(module, args.runs, preloaded)
+        results[module] = round(median_ms, 1)
+        if module in baseline:
+            budget = baseline[module] * (1 + args.tolerance)
+        else:
+            budget = DEFAULT_BUDGETS_MS.get(module, float("inf"))
+        status = "ok" if median_ms <= budget else "REGRESSED"
+        print(f"{module}: {median_ms:.1f} ms (budget {budget:.1f} ms) {status}")
+        for name, ms in packages.most_common(args.top):
+            print(f"    {name:<24} {ms:7.1f} ms")
+        if status != "ok":
+            failures.append(module)
+
+    if args.update_baseline:
+        if not args.baseline:
+            print("--update-baseline needs --baseline", file=sys.stderr)
+            return 2
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {args.baseline}")
+        return 0
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,7 +8,6 @@ import logging
 import os
 import sys
 from pathlib import Path
-from typing import Any
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
@@ -19,9 +18,12 @@ try:
 except ImportError:  # pragma: no cover - optional dependency
     load_dotenv = None
 
-from strands import Agent
+from strands import Agent  # noqa: E402
+from strands.handlers.callback_handler import null_callback_handler  # noqa: E402
 
-from supervisor.agent import build_agent as build_supervisor_agent
+from shared.registry import get_registry  # noqa: E402
+from supervisor.agent import build_agent as build_supervisor_agent  # noqa: E402
+from supervisor.streaming import iter_events, stream_reply  # noqa: E402
 
 
 def parse_args(args: list[str] | None = None) -> argparse.Namespace:
@@ -35,6 +37,12 @@ def parse_args(args: list[str] | None = None) -> argparse.Namespace:
         default=None,
         help="Optional persona identifier stored in the supervisor state.",
     )
+    parser.add_argument(
+        "--no-stream",
+        dest="stream",
+        action="store_false",
+        help="Print each reply only once it is complete instead of streaming it.",
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -43,16 +51,33 @@ def parse_args(args: list[str] | None = None) -> argparse.Namespace:
     return parser.parse_args(args=args)
 
 
-def build_agent(persona: str | None = None) -> Agent:
+def build_agent(persona: str | None = None, *, stream: bool = False) -> Agent:
     """Instantiate the supervisor agent and seed persona state if provided."""
 
-    agent = build_supervisor_agent()
+    agent = build_supervisor_agent(persona)
     if persona:
         agent.state.set("persona", persona.lower())
+    if stream:
+        # print_streamed_reply renders the events; the default handler would print them twice.
+        agent.callback_handler = null_callback_handler
     return agent
 
 
-def interactive_loop(agent: Agent) -> None:
+def print_streamed_reply(agent: Agent, user_input: str) -> None:
+    """Print reply text as it is generated, with a line per tool call."""
+
+    print("\nsupervisor> ", end="", flush=True)
+    for event in iter_events(stream_reply(agent, user_input)):
+        if event["type"] == "text":
+            print(event["text"], end="", flush=True)
+        elif event["type"] == "tool_start":
+            print(f"\n  [{event['tool']} …]", flush=True)
+        elif event["type"] == "tool_end" and event["status"] != "success":
+            print(f"  [{event['tool']} failed]", flush=True)
+    print("\n")
+
+
+def interactive_loop(agent: Agent, *, stream: bool = False) -> None:
     """Prompt the user for input until they exit."""
 
     print("--------------------------------------------------------------------")
@@ -73,6 +98,13 @@ def interactive_loop(agent: Agent) -> None:
             print("Goodbye 👋")
             break
 
+        if stream:
+            try:
+                print_streamed_reply(agent, user_input)
+            except Exception as exc:  # pragma: no cover - network/model errors
+                print(f"\n[error] {exc}")
+            continue
+
         try:
             response = agent(user_input)
         except Exception as exc:  # pragma: no cover - network/model errors
@@ -95,8 +127,13 @@ def main(raw_args: list[str] | None = None) -> None:
         level=logging.DEBUG if args.debug else logging.INFO,
         format="%(asctime)s %(levelname)s %(name)s: %(message)s",
     )
-    agent = build_agent(args.persona)
-    interactive_loop(agent)
+    registry = get_registry()
+    registry.warm_up()
+    try:
+        agent = build_agent(args.persona, stream=args.stream)
+        interactive_loop(agent, stream=args.stream)
+    finally:
+        registry.shutdown()
 
 
 if __name__ == "__main__":
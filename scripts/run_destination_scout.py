@@ -14,6 +14,7 @@ except ImportError:  # pragma: no cover
     load_dotenv = None
 
 from destination_scout.handler import lambda_handler
+from shared.registry import get_registry
 
 EXAMPLE_PAYLOAD: dict[str, Any] = {
     "departure_id": "FRA",
@@ -56,7 +57,10 @@ def main() -> None:
 
     args = parse_args()
     payload = load_payload(args.payload)
-    response = lambda_handler(payload, None)
+    try:
+        response = lambda_handler(payload, None)
+    finally:
+        get_registry().shutdown()
     print(json.dumps(response, indent=2))
 
 
@@ -14,6 +14,7 @@ except ImportError:  # pragma: no cover
     load_dotenv = None
 
 from flight_search.handler import lambda_handler
+from shared.registry import get_registry
 
 EXAMPLE_PAYLOAD: dict[str, Any] = {
     "departure_id": "FRA",
@@ -55,7 +56,10 @@ def main() -> None:
         load_dotenv()
     args = parse_args()
     payload = load_payload(args.payload)
-    response = lambda_handler(payload, None)
+    try:
+        response = lambda_handler(payload, None)
+    finally:
+        get_registry().shutdown()
     print(json.dumps(response, indent=2))
 
 
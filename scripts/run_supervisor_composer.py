@@ -8,6 +8,7 @@ import json
 from pathlib import Path
 from typing import Any
 
+from shared.registry import get_registry
 from supervisor.handler import lambda_handler
 
 SAMPLE_PAYLOAD: dict[str, Any] = {
@@ -67,7 +68,10 @@ def load_payload(path: str | None) -> dict[str, Any]:
 def main() -> None:
     args = parse_args()
     payload = load_payload(args.payload)
-    response = lambda_handler(payload, None)
+    try:
+        response = lambda_handler(payload, None)
+    finally:
+        get_registry().shutdown()
     print(json.dumps(response, indent=2))
 
 
@@ -0,0 +1,77 @@
+"""Request deadlines propagated from tool/Lambda boundaries down to every upstream call."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+_DEADLINE: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+# Smallest timeout handed to httpx once a deadline is nearly spent.
+_MIN_TIMEOUT = 0.05
+
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[None]:
+    """Bound everything run inside the block to `seconds`; never extends an outer deadline."""
+
+    if seconds is None:
+        yield
+        return
+    proposed = time.monotonic() + max(seconds, 0.0)
+    current = _DEADLINE.get()
+    token = _DEADLINE.set(proposed if current is None else min(current, proposed))
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the active deadline (may be negative), or None without one."""
+
+    deadline = _DEADLINE.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def has_time_for(seconds: float) -> bool:
+    """True when no deadline is set or at least `seconds` remain."""
+
+    left = remaining()
+    return left is None or left >= seconds
+
+
+def clamp_timeout(timeout: float) -> float:
+    """Shrink a per-call timeout to the remaining budget."""
+
+    left = remaining()
+    if left is None:
+        return timeout
+    return max(min(timeout, left), _MIN_TIMEOUT)
+
+
+def lambda_budget(context: Any | None, default: float, *, margin: float = 1.0) -> float:
+    """Seconds a Lambda invocation may spend, leaving `margin` to serialise the response."""
+
+    get_remaining = getattr(context, "get_remaining_time_in_millis", None)
+    if get_remaining is None:
+        return default
+    return max(get_remaining() / 1000 - margin, 0.0)
+
+
+__all__ = [
+    "clamp_timeout",
+    "deadline_scope",
+    "expired",
+    "has_time_for",
+    "lambda_budget",
+    "remaining",
+]
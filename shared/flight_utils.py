@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from typing import Any
 
 LH_GROUP_AIRLINES: tuple[str, ...] = ("LH", "LX", "OS", "SN", "EW", "4Y", "EN")
 STAR_ALLIANCE_AIRLINES: tuple[str, ...] = (
@@ -39,6 +41,8 @@ STAR_ALLIANCE_AIRLINES: tuple[str, ...] = (
     "ZH",
 )
 _PRICE_PATTERN = re.compile(r"([0-9]+(?:[.,][0-9]+)?)")
+_DURATION_PATTERN = re.compile(r"(?:(\d+)\s*h)?\s*(?:(\d+)\s*m)?", re.IGNORECASE)
+_CARRIER_PATTERN = re.compile(r"^([A-Z0-9]{2})\s*\d")
 
 
 def lhg_airlines_list(extra: Sequence[str] | None = None) -> list[str]:
@@ -126,10 +130,122 @@ def extract_best_price(
     return None
 
 
+def iter_itineraries(flights_payload: Mapping[str, Any]) -> list[dict[str, Any]]:
+    """Return every itinerary dict from the best/other buckets of a google_flights payload."""
+
+    itineraries: list[dict[str, Any]] = []
+    for key in ("best_flights", "other_flights"):
+        bucket = flights_payload.get(key)
+        if isinstance(bucket, list):
+            itineraries.extend(item for item in bucket if isinstance(item, dict))
+    return itineraries
+
+
+def itinerary_segments(itinerary: Mapping[str, Any]) -> list[dict[str, Any]]:
+    """Return the flight legs of an itinerary (`segments` or SearchAPI's `flights`)."""
+
+    segments = itinerary.get("segments") or itinerary.get("flights") or []
+    if not isinstance(segments, list):
+        return []
+    return [segment for segment in segments if isinstance(segment, dict)]
+
+
+def itinerary_stops(itinerary: Mapping[str, Any]) -> int | None:
+    """Return the number of stops, preferring explicit counts over the segment list."""
+
+    stops = itinerary.get("stops")
+    if stops is None:
+        stops = itinerary.get("number_of_stops")
+    if stops == "nonstop":
+        return 0
+    if stops not in (None, ""):
+        try:
+            return int(stops)
+        except (TypeError, ValueError):
+            pass
+    segments = itinerary_segments(itinerary)
+    if segments:
+        return len(segments) - 1
+    return None
+
+
+def itinerary_carriers(itinerary: Mapping[str, Any]) -> tuple[str, ...]:
+    """Return the IATA carrier codes operating an itinerary, in segment order."""
+
+    carriers: list[str] = []
+    for segment in itinerary_segments(itinerary):
+        code = segment.get("airline_code") or segment.get("carrier")
+        if not code:
+            match = _CARRIER_PATTERN.match(str(segment.get("flight_number") or "").upper())
+            code = match.group(1) if match else None
+        if code:
+            normalized = str(code).upper()
+            if normalized not in carriers:
+                carriers.append(normalized)
+    return tuple(carriers)
+
+
+def itinerary_departure(itinerary: Mapping[str, Any]) -> datetime | None:
+    """Return the departure timestamp of the first leg, if parseable."""
+
+    segments = itinerary_segments(itinerary)
+    if not segments:
+        return None
+    first = segments[0]
+    raw = first.get("departure_time")
+    airport = first.get("departure_airport")
+    if raw is None and isinstance(airport, Mapping):
+        raw = airport.get("time")
+    if not isinstance(raw, str):
+        return None
+    try:
+        return datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def itinerary_duration_minutes(itinerary: Mapping[str, Any]) -> int | None:
+    """Return the total travel time in minutes (`535` or `"08h 55m"` style inputs)."""
+
+    raw = itinerary.get("total_duration")
+    if raw is None:
+        return None
+    if isinstance(raw, (int, float)):
+        return int(raw)
+    match = _DURATION_PATTERN.fullmatch(str(raw).strip())
+    if not match or not any(match.groups()):
+        return None
+    hours, minutes = match.groups()
+    return int(hours or 0) * 60 + int(minutes or 0)
+
+
+def itinerary_price(
+    itinerary: Mapping[str, Any],
+    *,
+    currency: str = "EUR",
+) -> float | None:
+    """Return the itinerary price amount, normalising loosely formatted strings."""
+
+    normalized = normalise_price(
+        itinerary.get("price") or itinerary.get("price_per_ticket"),
+        currency=currency,
+    )
+    return float(normalized["amount"]) if normalized else None
+
+
 __all__ = [
     "LH_GROUP_AIRLINES",
+    "STAR_ALLIANCE_AIRLINES",
     "airlines_csv",
     "extract_best_price",
+    "itinerary_carriers",
+    "itinerary_departure",
+    "itinerary_duration_minutes",
+    "itinerary_price",
+    "itinerary_segments",
+    "itinerary_stops",
+    "iter_itineraries",
     "lhg_airlines_list",
     "normalise_price",
+    "star_alliance_list",
 ]
@@ -0,0 +1,55 @@
+"""Pooled httpx client shared by every call an upstream client makes."""
+
+from __future__ import annotations
+
+import logging
+import threading
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class PooledHTTP:
+    """Lazily creates one `httpx.Client` and keeps it, so DNS and TLS are paid once per process.
+
+    `httpx.Client` is safe to share between threads, so hedged attempts and concurrent tool calls
+    draw from the same connection pool. Timeouts are passed per request.
+    """
+
+    def __init__(self, *, transport: httpx.BaseTransport | None = None) -> None:
+        self._transport = transport
+        self._client: httpx.Client | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        client = self._client
+        if client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(transport=self._transport)
+                client = self._client
+        return client
+
+    def probe(self, url: str, *, timeout: float) -> bool:
+        """Open a pooled connection to `url` with a HEAD request; the status is ignored.
+
+        Used during Lambda init, so it bypasses circuit breakers and never raises.
+        """
+
+        try:
+            self.client.head(url, timeout=timeout)
+        except httpx.HTTPError as exc:
+            logger.info("Connection pre-warm for %s failed: %s", httpx.URL(url).host, exc)
+            return False
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+
+__all__ = ["PooledHTTP"]
@@ -0,0 +1,218 @@
+"""Per-engine latency histograms, adaptive timeouts and hedged requests for upstream calls."""
+
+from __future__ import annotations
+
+import bisect
+import contextvars
+import logging
+import math
+import threading
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TypeVar
+
+from shared.resilience import RetryBudget
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Geometric bucket upper bounds from 10 ms to ~2 min (20% apart).
+_BUCKETS = tuple(0.01 * 1.2**i for i in range(int(math.log(12_000, 1.2)) + 2))
+
+
+class LatencyHistogram:
+    """Bucketed latency distribution whose counts are halved every `decay_every` samples.
+
+    Halving keeps the histogram weighted towards recent traffic without storing samples.
+    """
+
+    def __init__(self, *, decay_every: int = 200) -> None:
+        self._counts = [0.0] * (len(_BUCKETS) + 1)
+        self._total = 0.0
+        self._since_decay = 0
+        self._decay_every = max(1, decay_every)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(_BUCKETS, seconds)] += 1
+            self._total += 1
+            self._since_decay += 1
+            if self._since_decay >= self._decay_every:
+                self._counts = [count / 2 for count in self._counts]
+                self._total /= 2
+                self._since_decay = 0
+
+    @property
+    def samples(self) -> float:
+        return self._total
+
+    def percentile(self, quantile: float) -> float | None:
+        """Upper bound of the bucket holding `quantile` of recent samples; None when empty."""
+
+        with self._lock:
+            if not self._total:
+                return None
+            target = quantile * self._total
+            running = 0.0
+            for index, count in enumerate(self._counts):
+                running += count
+                if running >= target and count:
+                    return _BUCKETS[index] if index < len(_BUCKETS) else _BUCKETS[-1]
+            return _BUCKETS[-1]
+
+
+class LatencyTracker:
+    """Latency histograms keyed by engine, plus the timeouts derived from them."""
+
+    def __init__(
+        self,
+        *,
+        min_samples: int = 20,
+        timeout_quantile: float = 0.99,
+        timeout_multiplier: float = 3.0,
+        timeout_floor: float = 2.0,
+    ) -> None:
+        self._min_samples = min_samples
+        self._timeout_quantile = timeout_quantile
+        self._timeout_multiplier = timeout_multiplier
+        self._timeout_floor = timeout_floor
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._timeout_streaks: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        self._histogram(key).record(seconds)
+        with self._lock:
+            self._timeout_streaks.pop(key, None)
+
+    def record_timeout(self, key: str, seconds: float) -> None:
+        """Count an attempt cut off after `seconds` and widen the next timeout.
+
+        The attempt is recorded as a sample at its timeout (it took at least that long), and each
+        consecutive timeout doubles the derived timeout until a response arrives, so an upstream
+        that slows past the learned p99 is not locked out by its own timeouts.
+        """
+
+        self._histogram(key).record(seconds)
+        with self._lock:
+            self._timeout_streaks[key] = self._timeout_streaks.get(key, 0) + 1
+
+    def percentile(self, key: str, quantile: float) -> float | None:
+        """Observed latency at `quantile`, or None until `min_samples` have been recorded."""
+
+        histogram = self._histogram(key)
+        if histogram.samples < self._min_samples:
+            return None
+        return histogram.percentile(quantile)
+
+    def timeout_for(self, key: str, *, ceiling: float) -> float:
+        """`timeout_multiplier` x observed p99, clamped to [timeout_floor, ceiling].
+
+        Doubled for every consecutive timeout since the last response.
+        """
+
+        observed = self.percentile(key, self._timeout_quantile)
+        if observed is None:
+            return ceiling
+        with self._lock:
+            backoff = 2 ** self._timeout_streaks.get(key, 0)
+        adaptive = max(self._timeout_floor, observed * self._timeout_multiplier) * backoff
+        return min(ceiling, adaptive)
+
+    def _histogram(self, key: str) -> LatencyHistogram:
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = LatencyHistogram()
+                self._histograms[key] = histogram
+            return histogram
+
+
+class HedgePolicy:
+    """Send a duplicate request once the first outlives the rolling `quantile` latency.
+
+    Hedges draw from their own budget (10% of requests by default) so a slow upstream is not
+    hit with double traffic.
+    """
+
+    def __init__(
+        self,
+        *,
+        quantile: float = 0.95,
+        budget: RetryBudget | None = None,
+        executor: ThreadPoolExecutor | None = None,
+    ) -> None:
+        self.quantile = quantile
+        self.budget = budget or RetryBudget(ratio=0.1, reserve=2.0, max_tokens=5.0)
+        self._executor = executor
+
+    def run(self, call: Callable[[], T], *, delay: float | None) -> T:
+        """Run `call`, hedging after `delay` seconds; the first successful result wins."""
+
+        self.budget.record_request()
+        if delay is None:
+            return call()
+        executor = self._executor or _hedge_executor()
+        primary = _submit(executor, call)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self.budget.try_acquire():
+            return primary.result()
+
+        logger.debug("Hedging request after %.2fs", delay)
+        pending = {primary, _submit(executor, call)}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # A loser that already started cannot be interrupted; its result is dropped.
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+            if not pending:
+                # Both attempts failed: re-raise the last failure.
+                return done.pop().result()
+
+
+def _submit(executor: ThreadPoolExecutor, call: Callable[[], T]) -> Future[T]:
+    # Each attempt runs in its own copy of the caller's context (deadlines, request ids).
+    return executor.submit(contextvars.copy_context().run, call)
+
+
+_EXECUTOR: ThreadPoolExecutor | None = None
+_TRACKERS: dict[str, LatencyTracker] = {}
+_LOCK = threading.Lock()
+
+
+def _hedge_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+        return _EXECUTOR
+
+
+def get_latency_tracker(name: str) -> LatencyTracker:
+    """Return the process-wide LatencyTracker for upstream `name`."""
+
+    with _LOCK:
+        tracker = _TRACKERS.get(name)
+        if tracker is None:
+            tracker = LatencyTracker()
+            _TRACKERS[name] = tracker
+        return tracker
+
+
+def reset_latency_trackers() -> None:
+    with _LOCK:
+        _TRACKERS.clear()
+
+
+__all__ = [
+    "HedgePolicy",
+    "LatencyHistogram",
+    "LatencyTracker",
+    "get_latency_tracker",
+    "reset_latency_trackers",
+]
@@ -0,0 +1,18 @@
+"""Pydantic base classes shared across services."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel, ConfigDict
+
+
+class DeferredModel(BaseModel):
+    """Model whose validator/serializer is built on first use instead of at import.
+
+    Used for contracts only the supervisor tools touch, so the Lambda handlers that import the
+    same modules do not pay for schemas they never validate.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+
+__all__ = ["DeferredModel"]
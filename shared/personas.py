@@ -18,6 +18,13 @@ def _persona_doc_path(persona: str) -> Path:
     return docs_dir / filename
 
 
+def persona_key(persona: str | None) -> str | None:
+    """Return the canonical key for a known persona, or None (unset or unknown)."""
+
+    key = (persona or "").strip().lower()
+    return key if key in _PERSONA_DOCS else None
+
+
 @lru_cache
 def load_persona_instructions(persona: str) -> str:
     """Read the full Markdown instructions for the supplied persona."""
@@ -26,18 +33,22 @@ def load_persona_instructions(persona: str) -> str:
     return path.read_text(encoding="utf-8").strip()
 
 
-def build_persona_prompt_block() -> str:
-    """Return a concatenated persona instruction section for prompts."""
+@lru_cache(maxsize=len(_PERSONA_DOCS) + 1)
+def build_persona_prompt_block(persona: str | None = None) -> str:
+    """Return the instruction section for one persona, or for all of them when None."""
 
+    personas = [persona.lower()] if persona else list(_PERSONA_DOCS)
     sections = []
-    for persona in ("paula", "gina", "bianca"):
-        sections.append(
-            f"### {persona.upper()} INSTRUCTIONS ###\n{load_persona_instructions(persona)}"
-        )
+    for name in personas:
+        sections.append(f"### {name.upper()} INSTRUCTIONS ###\n{load_persona_instructions(name)}")
     return "\n\n".join(sections)
 
 
-PERSONA_PROMPT_BLOCK = build_persona_prompt_block()
+def __getattr__(name: str) -> str:
+    # PERSONA_PROMPT_BLOCK is read from disk on first access, not when the module is imported.
+    if name == "PERSONA_PROMPT_BLOCK":
+        return build_persona_prompt_block()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-__all__ = ["PERSONA_PROMPT_BLOCK", "load_persona_instructions"]
+__all__ = ["build_persona_prompt_block", "load_persona_instructions", "persona_key"]
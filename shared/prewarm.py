@@ -0,0 +1,60 @@
+"""Optional, time-boxed Lambda init work: build services and open upstream connections early."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from shared.registry import ServiceRegistry, get_registry
+
+logger = logging.getLogger(__name__)
+
+
+def prewarm(
+    components: Sequence[str],
+    connections: Sequence[str] = (),
+    *,
+    timeout: float,
+    registry: ServiceRegistry | None = None,
+) -> dict[str, bool]:
+    """Build `components` (loading on-disk caches) then probe each client in `connections`.
+
+    The steps run on worker threads and init stops waiting after `timeout` seconds. Unfinished work
+    carries on in the background; a component still being built is awaited by the first request that
+    needs it. Returns which steps finished in time and succeeded. Failures are logged, never raised.
+    """
+
+    registry = registry or get_registry()
+    deadline = time.monotonic() + timeout
+
+    def build() -> bool:
+        registry.warm_up(components)
+        return True
+
+    def connect(name: str) -> bool:
+        return registry.get(name).warm(timeout=max(deadline - time.monotonic(), 0.0))
+
+    executor = ThreadPoolExecutor(
+        max_workers=1 + len(connections), thread_name_prefix="lambda-prewarm"
+    )
+    futures = {"build": executor.submit(build)}
+    futures.update({name: executor.submit(connect, name) for name in connections})
+    executor.shutdown(wait=False)
+    wait(futures.values(), timeout=timeout)
+
+    results: dict[str, bool] = {}
+    for name, future in futures.items():
+        if not future.done():
+            logger.info("Pre-warm step %s still running after %.1fs", name, timeout)
+            results[name] = False
+        elif future.exception() is not None:
+            logger.warning("Pre-warm step %s failed: %s", name, future.exception())
+            results[name] = False
+        else:
+            results[name] = bool(future.result())
+    return results
+
+
+__all__ = ["prewarm"]
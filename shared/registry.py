@@ -0,0 +1,250 @@
+"""Process-wide registry owning one instance of every upstream client, cache and service."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any
+
+from config.settings import Settings, get_settings
+
+if TYPE_CHECKING:
+    from destination_scout.service import DestinationScoutService, OpenMeteoClient
+    from destination_scout.service import SearchAPIClient as ExploreClient
+    from flight_search.negative_cache import NegativeRouteCache
+    from flight_search.price_history import PriceHistoryStore
+    from flight_search.service import FlightSearchService
+    from flight_search.service import SearchAPIClient as FlightsClient
+    from shared.routes import RouteGraph
+    from supervisor.flight_prefetch import FlightPrefetcher
+
+logger = logging.getLogger(__name__)
+
+Factory = Callable[["ServiceRegistry"], Any]
+
+
+# Factories import lazily: service modules import `shared`, and Lambda handlers should only pay
+# for the services they actually use.
+def _flights_client(registry: ServiceRegistry) -> FlightsClient:
+    from flight_search.service import SearchAPIClient
+    from shared.latency import HedgePolicy
+
+    settings = registry.settings
+    return SearchAPIClient(
+        base_url=str(settings.searchapi_endpoint),
+        api_key=settings.searchapi_key,
+        hedge=HedgePolicy() if settings.searchapi_hedging else None,
+    )
+
+
+def _explore_client(registry: ServiceRegistry) -> ExploreClient:
+    from destination_scout.service import SearchAPIClient
+
+    settings = registry.settings
+    return SearchAPIClient(
+        base_url=str(settings.searchapi_endpoint), api_key=settings.searchapi_key
+    )
+
+
+def _open_meteo_client(registry: ServiceRegistry) -> OpenMeteoClient:
+    from destination_scout.service import OpenMeteoClient
+
+    settings = registry.settings
+    return OpenMeteoClient(
+        base_url=str(settings.open_meteo_endpoint), timezone=settings.default_timezone
+    )
+
+
+def _route_graph(_registry: ServiceRegistry) -> RouteGraph:
+    from shared.routes import default_route_graph
+
+    return default_route_graph()
+
+
+def _negative_route_cache(registry: ServiceRegistry) -> NegativeRouteCache:
+    from flight_search.negative_cache import NegativeRouteCache
+
+    cache = NegativeRouteCache()
+    if registry.settings.negative_route_cache_path:
+        cache.load(registry.settings.negative_route_cache_path)
+    return cache
+
+
+def _price_history(registry: ServiceRegistry) -> PriceHistoryStore:
+    from flight_search.price_history import PriceHistoryStore
+
+    return PriceHistoryStore(registry.settings.price_history_path or ":memory:")
+
+
+def _flight_service(registry: ServiceRegistry) -> FlightSearchService:
+    from flight_search.service import FlightSearchService
+
+    return FlightSearchService(
+        registry.flights_client(),
+        negative_cache=registry.negative_route_cache(),
+        price_history=registry.price_history(),
+    )
+
+
+def _destination_service(registry: ServiceRegistry) -> DestinationScoutService:
+    from destination_scout.service import DestinationScoutService
+
+    return DestinationScoutService(
+        registry.explore_client(),
+        registry.open_meteo_client(),
+        route_graph=registry.route_graph(),
+    )
+
+
+def _flight_prefetcher(registry: ServiceRegistry) -> FlightPrefetcher:
+    from supervisor.flight_prefetch import FlightPrefetcher
+
+    settings = registry.settings
+    return FlightPrefetcher(
+        lambda request: registry.flight_service().search(request),
+        top_k=settings.flight_prefetch_top_k,
+        session_cap=settings.flight_prefetch_session_cap,
+        deadline_seconds=settings.tool_deadline_seconds,
+    )
+
+
+DEFAULT_FACTORIES: dict[str, Factory] = {
+    "flights_client": _flights_client,
+    "explore_client": _explore_client,
+    "open_meteo_client": _open_meteo_client,
+    "route_graph": _route_graph,
+    "negative_route_cache": _negative_route_cache,
+    "price_history": _price_history,
+    "flight_service": _flight_service,
+    "destination_service": _destination_service,
+    "flight_prefetcher": _flight_prefetcher,
+}
+
+
+class ServiceRegistry:
+    """Builds each component once, under a lock, on first use (or during `warm_up`).
+
+    Factories may request other components; the lock is re-entrant so dependencies resolve inside
+    the same build. `override` swaps in a prebuilt instance (tests, scripts).
+    """
+
+    def __init__(
+        self,
+        *,
+        settings: Settings | None = None,
+        factories: dict[str, Factory] | None = None,
+    ) -> None:
+        self._settings = settings
+        self._factories = dict(factories if factories is not None else DEFAULT_FACTORIES)
+        self._instances: dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def settings(self) -> Settings:
+        if self._settings is None:
+            self._settings = get_settings()
+        return self._settings
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                try:
+                    factory = self._factories[name]
+                except KeyError:
+                    raise KeyError(f"unknown registry component: {name}") from None
+                instance = factory(self)
+                self._instances[name] = instance
+                logger.debug("Registry built %s", name)
+            return instance
+
+    def override(self, name: str, instance: Any) -> None:
+        with self._lock:
+            self._instances[name] = instance
+
+    def warm_up(self, names: Iterable[str] | None = None) -> list[str]:
+        """Build the named components (default: all) ahead of the first request."""
+
+        built = []
+        for name in names if names is not None else self._factories:
+            self.get(name)
+            built.append(name)
+        return built
+
+    def shutdown(self) -> None:
+        """Persist learned state, close owned resources and forget every instance."""
+
+        with self._lock:
+            instances, self._instances = self._instances, {}
+        negative_cache = instances.get("negative_route_cache")
+        path = self.settings.negative_route_cache_path if negative_cache else None
+        if path:
+            try:
+                negative_cache.save(path)
+            except OSError as exc:
+                logger.warning("Could not save negative route cache to %s: %s", path, exc)
+        for name, instance in reversed(list(instances.items())):
+            close = getattr(instance, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as exc:  # pragma: no cover - best-effort cleanup
+                    logger.warning("Closing %s failed: %s", name, exc)
+
+    def flights_client(self) -> FlightsClient:
+        return self.get("flights_client")
+
+    def explore_client(self) -> ExploreClient:
+        return self.get("explore_client")
+
+    def open_meteo_client(self) -> OpenMeteoClient:
+        return self.get("open_meteo_client")
+
+    def route_graph(self) -> RouteGraph:
+        return self.get("route_graph")
+
+    def negative_route_cache(self) -> NegativeRouteCache:
+        return self.get("negative_route_cache")
+
+    def price_history(self) -> PriceHistoryStore:
+        return self.get("price_history")
+
+    def flight_service(self) -> FlightSearchService:
+        return self.get("flight_service")
+
+    def destination_service(self) -> DestinationScoutService:
+        return self.get("destination_service")
+
+    def flight_prefetcher(self) -> FlightPrefetcher:
+        return self.get("flight_prefetcher")
+
+
+_REGISTRY: ServiceRegistry | None = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> ServiceRegistry:
+    """Return the process-wide registry."""
+
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = ServiceRegistry()
+        return _REGISTRY
+
+
+def reset_registry() -> None:
+    """Shut down and drop the process-wide registry (tests, Lambda re-init)."""
+
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        registry, _REGISTRY = _REGISTRY, None
+    if registry is not None:
+        registry.shutdown()
+
+
+__all__ = ["DEFAULT_FACTORIES", "ServiceRegistry", "get_registry", "reset_registry"]
@@ -0,0 +1,342 @@
+"""Circuit breakers, jittered retries, a retry budget and single-flight for upstream calls."""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable, Hashable
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, TypeVar
+
+import httpx
+
+from shared import deadline
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+T = TypeVar("T")
+
+
+class UpstreamUnavailableError(RuntimeError):
+    """Raised without touching the network while an upstream's circuit is open."""
+
+    def __init__(self, upstream: str, retry_in: float) -> None:
+        self.upstream = upstream
+        self.retry_in = max(retry_in, 0.0)
+        super().__init__(
+            f"{upstream} is temporarily unavailable (circuit open); "
+            f"retry in about {self.retry_in:.0f}s"
+        )
+
+
+class DeadlineExceededError(UpstreamUnavailableError):
+    """Raised without touching the network once the caller's deadline has passed."""
+
+    def __init__(self, upstream: str) -> None:
+        self.upstream = upstream
+        self.retry_in = 0.0
+        RuntimeError.__init__(self, f"{upstream} skipped: request deadline exceeded")
+
+
+class CircuitBreaker:
+    """Closed → open after consecutive failures → half-open single probe → closed."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._failure_threshold = max(1, failure_threshold)
+        self._recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def before_call(self) -> None:
+        """Raise UpstreamUnavailableError unless a call may proceed now."""
+
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            elapsed = self._clock() - self._opened_at
+            if self._state == self.OPEN and elapsed >= self._recovery_timeout:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                logger.info("Circuit %s half-open; sending probe", self.name)
+                return
+            raise UpstreamUnavailableError(self.name, self._recovery_timeout - elapsed)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Circuit %s closed after successful probe", self.name)
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Let another call probe a half-open circuit without recording an outcome."""
+
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning("Circuit %s opened after %s failures", self.name, self._failures)
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+
+
+class RetryBudget:
+    """Token bucket capping retries to a fraction of first attempts across the process."""
+
+    def __init__(
+        self, *, ratio: float = 0.2, reserve: float = 3.0, max_tokens: float = 10.0
+    ) -> None:
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = min(reserve, max_tokens)
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class RetryPolicy:
+    """Full-jitter exponential backoff."""
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 2.0,
+        max_retry_after: float = 5.0,
+    ) -> None:
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0.0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class Upstream:
+    """Runs HTTP calls for one upstream through its breaker, retry policy and the retry budget."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        breaker: CircuitBreaker | None = None,
+        policy: RetryPolicy | None = None,
+        budget: RetryBudget | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.name = name
+        self.breaker = breaker or CircuitBreaker(name)
+        self.policy = policy or RetryPolicy()
+        self.budget = budget or _RETRY_BUDGET
+        self._sleep = sleep
+
+    def send(self, do_request: Callable[[], httpx.Response]) -> httpx.Response:
+        """Return the first non-retryable response; the last failure is returned or raised.
+
+        Raises DeadlineExceededError when the active deadline has already passed, and stops
+        retrying once the next backoff would overrun it.
+        """
+
+        if deadline.expired():
+            raise DeadlineExceededError(self.name)
+        self.budget.record_request()
+        attempt = 0
+        while True:
+            attempt += 1
+            self.breaker.before_call()
+            try:
+                response = do_request()
+            except httpx.TransportError:
+                self.breaker.record_failure()
+                delay = self._retry_delay(attempt, None)
+                if delay is None:
+                    raise
+            except Exception:
+                # Anything else is not retried, but it must still settle a half-open probe.
+                self.breaker.record_failure()
+                raise
+            except BaseException:
+                # Cancellation and interrupts say nothing about the upstream; just free the probe.
+                self.breaker.release_probe()
+                raise
+            else:
+                self._record_response(response)
+                if response.status_code not in RETRYABLE_STATUS:
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = self._retry_delay(attempt, retry_after)
+                if delay is None:
+                    return response
+            logger.debug("Retrying %s in %.2fs (attempt %s)", self.name, delay, attempt + 1)
+            self._sleep(delay)
+
+    def _record_response(self, response: httpx.Response) -> None:
+        # A 429 is throttled, but reachable: keep the breaker closed and honour Retry-After.
+        if response.status_code == 429 or response.status_code not in RETRYABLE_STATUS:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def _retry_delay(self, attempt: int, retry_after: float | None) -> float | None:
+        """Seconds to wait before the next attempt, or None when no retry is allowed."""
+
+        if attempt >= self.policy.max_attempts:
+            return None
+        if retry_after is not None and retry_after > self.policy.max_retry_after:
+            return None
+        delay = retry_after if retry_after is not None else self.policy.backoff(attempt)
+        if not deadline.has_time_for(delay):
+            return None
+        if not self.budget.try_acquire():
+            return None
+        return delay
+
+
+def parse_retry_after(raw: str | None) -> float | None:
+    """Parse a Retry-After header given as delta-seconds or an HTTP date."""
+
+    if not raw:
+        return None
+    raw = raw.strip()
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls: the first caller runs, the others share its outcome.
+
+    Only calls in progress are shared; once the leader returns the key is free again, so caching
+    stays with the services.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def run(self, key: Hashable, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            # The leader's upstream calls are bounded by its own deadline.
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = func(*args, **kwargs)
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        return flight.result
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+
+_RETRY_BUDGET = RetryBudget()
+_UPSTREAMS: dict[str, Upstream] = {}
+_UPSTREAMS_LOCK = threading.Lock()
+
+
+def get_upstream(name: str) -> Upstream:
+    """Return the process-wide Upstream (breaker + retries) for `name`."""
+
+    with _UPSTREAMS_LOCK:
+        upstream = _UPSTREAMS.get(name)
+        if upstream is None:
+            upstream = Upstream(name)
+            _UPSTREAMS[name] = upstream
+        return upstream
+
+
+def reset_upstreams() -> None:
+    """Forget all breakers and refill the retry budget (tests, Lambda re-init)."""
+
+    global _RETRY_BUDGET
+    with _UPSTREAMS_LOCK:
+        _UPSTREAMS.clear()
+        _RETRY_BUDGET = RetryBudget()
+
+
+__all__ = [
+    "CircuitBreaker",
+    "DeadlineExceededError",
+    "RetryBudget",
+    "RetryPolicy",
+    "SingleFlight",
+    "Upstream",
+    "UpstreamUnavailableError",
+    "get_upstream",
+    "parse_retry_after",
+    "reset_upstreams",
+]
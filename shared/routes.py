@@ -0,0 +1,225 @@
+"""Memory-mapped Lufthansa Group route network built from the bundled nonstop dataset."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Iterable
+from functools import lru_cache
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+LH_GROUP_HUBS = ("FRA", "MUC", "ZRH", "VIE", "BRU")
+ROUTES_DATASET = Path(__file__).with_name("data") / "lh_group_routes.csv"
+
+# Index layout (little endian):
+#   header     magic, version, airport count, adjacency length, dataset digest
+#   codes      airport_count * 3 ASCII bytes, sorted
+#   offsets    (airport_count + 1) * uint32 into the adjacency array
+#   adjacency  uint16 airport indexes, sorted per airport (compressed sparse rows)
+_MAGIC = b"LHRG"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHII16s")
+_OFFSET = struct.Struct("<I")
+_NEIGHBOUR = struct.Struct("<H")
+
+
+class RouteGraph:
+    """Read-only CSR view over an undirected route index (bytes or an mmap).
+
+    The bundled dataset is hand-curated and incomplete, so it ranks candidates but never proves
+    that a route does not exist.
+    """
+
+    def __init__(self, buffer: bytes | mmap.mmap) -> None:
+        magic, version, count, edges, digest = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("not a route index")
+        self._buffer = buffer
+        self._count = count
+        self._edges = edges
+        self.digest = digest
+        self._codes_at = _HEADER.size
+        self._offsets_at = self._codes_at + 3 * count
+        self._adjacency_at = self._offsets_at + _OFFSET.size * (count + 1)
+        self._hubs = [index for hub in LH_GROUP_HUBS if (index := self._index(hub)) is not None]
+
+    @classmethod
+    def open(cls, path: str | Path) -> RouteGraph:
+        with open(path, "rb") as handle:
+            return cls(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, airport: str) -> bool:
+        return self._index(airport) is not None
+
+    def destinations(self, airport: str) -> list[str]:
+        index = self._index(airport)
+        if index is None:
+            return []
+        return [self._code(neighbour) for neighbour in self._neighbours(index)]
+
+    def has_direct(self, origin: str, destination: str) -> bool:
+        first, second = self._index(origin), self._index(destination)
+        if first is None or second is None:
+            return False
+        return self._linked(first, second)
+
+    def one_stop_hubs(self, origin: str, destination: str) -> list[str]:
+        """LH Group hubs that connect the two airports with one change of aircraft."""
+
+        first, second = self._index(origin), self._index(destination)
+        if first is None or second is None:
+            return []
+        return [
+            self._code(hub)
+            for hub in self._hubs
+            if hub not in (first, second) and self._linked(first, hub) and self._linked(hub, second)
+        ]
+
+    def reachable(self, origin: str, destination: str, *, max_stops: int = 1) -> bool | None:
+        """Whether the dataset shows the pair within `max_stops`; None when an airport is unknown.
+
+        A ranking hint only: False means "not listed", not "not flown".
+        """
+
+        if origin not in self or destination not in self:
+            return None
+        if self.has_direct(origin, destination):
+            return True
+        return max_stops >= 1 and bool(self.one_stop_hubs(origin, destination))
+
+    def _index(self, airport: str) -> int | None:
+        key = airport.strip().upper().encode("ascii", "replace")
+        if len(key) != 3:
+            return None
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            code = self._code_bytes(middle)
+            if code == key:
+                return middle
+            if code < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _code_bytes(self, index: int) -> bytes:
+        start = self._codes_at + 3 * index
+        return bytes(self._buffer[start : start + 3])
+
+    def _code(self, index: int) -> str:
+        return self._code_bytes(index).decode("ascii")
+
+    def _row(self, index: int) -> tuple[int, int]:
+        start = _OFFSET.unpack_from(self._buffer, self._offsets_at + _OFFSET.size * index)[0]
+        end = _OFFSET.unpack_from(self._buffer, self._offsets_at + _OFFSET.size * (index + 1))[0]
+        return start, end
+
+    def _neighbour(self, position: int) -> int:
+        offset = self._adjacency_at + _NEIGHBOUR.size * position
+        return _NEIGHBOUR.unpack_from(self._buffer, offset)[0]
+
+    def _neighbours(self, index: int) -> list[int]:
+        start, end = self._row(index)
+        return [self._neighbour(position) for position in range(start, end)]
+
+    def _linked(self, first: int, second: int) -> bool:
+        low, high = self._row(first)
+        while low < high:
+            middle = (low + high) // 2
+            neighbour = self._neighbour(middle)
+            if neighbour == second:
+                return True
+            if neighbour < second:
+                low = middle + 1
+            else:
+                high = middle
+        return False
+
+
+def parse_route_pairs(lines: Iterable[str]) -> list[tuple[str, str]]:
+    """Read `ORIGIN,DESTINATION` lines, ignoring blanks and `#` comments."""
+
+    pairs: list[tuple[str, str]] = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        origin, _, destination = line.partition(",")
+        origin, destination = origin.strip().upper(), destination.strip().upper()
+        if len(origin) != 3 or len(destination) != 3 or origin == destination:
+            raise ValueError(f"invalid route line: {line!r}")
+        pairs.append((origin, destination))
+    return pairs
+
+
+def build_route_index(pairs: Iterable[tuple[str, str]], *, digest: bytes = b"") -> bytes:
+    """Serialise undirected airport pairs into the CSR index format."""
+
+    adjacency: dict[str, set[str]] = {}
+    for origin, destination in pairs:
+        adjacency.setdefault(origin, set()).add(destination)
+        adjacency.setdefault(destination, set()).add(origin)
+    codes = sorted(adjacency)
+    positions = {code: index for index, code in enumerate(codes)}
+    offsets = [0]
+    neighbours: list[int] = []
+    for code in codes:
+        neighbours.extend(sorted(positions[other] for other in adjacency[code]))
+        offsets.append(len(neighbours))
+
+    return b"".join(
+        [
+            _HEADER.pack(
+                _MAGIC, _VERSION, len(codes), len(neighbours), digest[:16].ljust(16, b"\0")
+            ),
+            "".join(codes).encode("ascii"),
+            struct.pack(f"<{len(offsets)}I", *offsets),
+            struct.pack(f"<{len(neighbours)}H", *neighbours),
+        ]
+    )
+
+
+@lru_cache(maxsize=1)
+def default_route_graph() -> RouteGraph:
+    """Return the bundled route graph, building its index in the temp dir on first use."""
+
+    raw = ROUTES_DATASET.read_bytes()
+    lines = raw.decode("utf-8").splitlines()
+    digest = hashlib.blake2b(raw, digest_size=16).digest()
+    target = Path(tempfile.gettempdir()) / f"lh_group_routes-{digest.hex()[:16]}.idx"
+    try:
+        graph = RouteGraph.open(target)
+        if graph.digest == digest:
+            return graph
+    except (OSError, ValueError, struct.error):
+        pass
+
+    index = build_route_index(parse_route_pairs(lines), digest=digest)
+    try:
+        staging = target.with_suffix(f".{os.getpid()}.tmp")
+        staging.write_bytes(index)
+        os.replace(staging, target)
+        return RouteGraph.open(target)
+    except OSError as exc:
+        logger.warning("Route index not writable (%s); keeping it in memory", exc)
+        return RouteGraph(index)
+
+
+__all__ = [
+    "LH_GROUP_HUBS",
+    "ROUTES_DATASET",
+    "RouteGraph",
+    "build_route_index",
+    "default_route_graph",
+    "parse_route_pairs",
+]
@@ -3,13 +3,33 @@
 from __future__ import annotations
 
 from strands import Agent
+from strands.agent.conversation_manager import (
+    ConversationManager,
+    SlidingWindowConversationManager,
+)
 from strands.models import BedrockModel
+from strands.models.model import CacheConfig
+from strands.models.routing import ModelRouter, RoutingCandidate
 from strands.tools import PythonAgentTool
+from strands.tools.executors import ConcurrentToolExecutor
 from strands_tools import current_time, http_request
 
-from config.settings import get_settings
-from shared.prompts import SUPERVISOR_PROMPT_TEMPLATE
-from supervisor.tools import call_destination_scout, call_flight_search, call_weather_snapshot
+from config.settings import Settings, get_settings
+from shared.prompts import build_supervisor_prompt_template
+from supervisor.conversation import DigestingConversationManager
+from supervisor.routing import IntentRoutingStrategy
+from supervisor.tools import (
+    call_destination_scout,
+    call_flight_search,
+    call_price_insights,
+    call_price_lookup,
+    call_searchapi,
+    call_trip_window_finder,
+    call_weather_snapshot,
+    get_tool_result_details,
+    query_flight_offers,
+)
+from supervisor.usage import TurnUsage
 
 HTTP_REQUEST_TOOL = PythonAgentTool(
     "http_request",
@@ -18,26 +38,86 @@ HTTP_REQUEST_TOOL = PythonAgentTool(
 )
 
 
-def build_agent() -> Agent:
-    """Instantiate the Strands supervisor agent."""
+def _prompt_cache_config(enabled: bool) -> dict[str, CacheConfig]:
+    """Cache points after the tool specs and the system prompt, the prefix every turn shares.
+
+    "auto" only emits them for Claude model ids (it also caches the conversation so far); other
+    models log a warning and run uncached.
+    """
+
+    if not enabled:
+        return {}
+    return {"cache_config": CacheConfig(strategy="auto", system_prompt_ttl=True, tools_ttl=True)}
+
+
+def _conversation_manager(settings: Settings) -> ConversationManager:
+    if settings.conversation_mode == "sliding":
+        return SlidingWindowConversationManager(window_size=settings.conversation_window_messages)
+    return DigestingConversationManager(window_size=settings.conversation_window_messages)
+
+
+def _bedrock(settings: Settings, model_id: str, max_tokens: int) -> BedrockModel:
+    return BedrockModel(
+        model_id=model_id,
+        region_name=settings.bedrock_region,
+        temperature=settings.bedrock_temperature,
+        max_tokens=max_tokens,
+        **_prompt_cache_config(settings.bedrock_prompt_cache),
+    )
+
+
+def _model(settings: Settings) -> BedrockModel | ModelRouter:
+    """The main model, or a router sending simple turns to BEDROCK_FAST_MODEL_ID when set."""
+
+    main = _bedrock(settings, settings.bedrock_model_id, settings.bedrock_max_tokens)
+    if not settings.bedrock_fast_model_id:
+        return main
+    fast = _bedrock(settings, settings.bedrock_fast_model_id, settings.bedrock_fast_max_tokens)
+    # "main" is declared first: the agent sizes its context against the first candidate.
+    return ModelRouter(
+        [RoutingCandidate(main, name="main"), RoutingCandidate(fast, name="fast")],
+        strategy=IntentRoutingStrategy(),
+    )
+
+
+def build_agent(persona: str | None = None) -> Agent:
+    """Instantiate the Strands supervisor agent for one session's persona.
+
+    The system prompt carries only that persona's instructions (a generic section when the
+    persona is unknown); templates are cached per persona. SearchAPI is reached through the typed
+    `call_searchapi` gateway unless SUPERVISOR_HTTP_REQUEST re-enables raw `http_request`.
+    """
 
     settings = get_settings()
-    prompt = SUPERVISOR_PROMPT_TEMPLATE.format(
+    http_request_enabled = settings.supervisor_http_request
+    prompt = build_supervisor_prompt_template(persona, http_request=http_request_enabled).format(
         searchapi_endpoint=settings.searchapi_endpoint,
         searchapi_key=settings.searchapi_key,
     )
-    model = BedrockModel(
-        model_id=settings.bedrock_model_id,
-        region_name=settings.bedrock_region,
-        temperature=settings.bedrock_temperature,
-        max_tokens=settings.bedrock_max_tokens,
-    )
-    tools = [
-        HTTP_REQUEST_TOOL,
+    model = _model(settings)
+    # SearchAPI goes through call_searchapi and the delegate tools (caches, breaker, digests);
+    # the raw http_request tool is opt-in via SUPERVISOR_HTTP_REQUEST.
+    tools = [HTTP_REQUEST_TOOL] if http_request_enabled else []
+    tools += [
         CURRENT_TIME_TOOL,
         call_flight_search,
+        query_flight_offers,
+        call_trip_window_finder,
+        call_price_lookup,
+        call_price_insights,
         call_destination_scout,
+        call_searchapi,
         call_weather_snapshot,
+        get_tool_result_details,
     ]
-    return Agent(model=model, system_prompt=prompt, tools=tools)
+    # Tool calls from one model turn run concurrently: the async search/weather tools overlap
+    # their upstream waits, so a flights + weather turn costs the slower call, not the sum.
+    return Agent(
+        model=model,
+        system_prompt=prompt,
+        tools=tools,
+        tool_executor=ConcurrentToolExecutor(),
+        conversation_manager=_conversation_manager(settings),
+        hooks=[TurnUsage()],
+    )
 CURRENT_TIME_TOOL = current_time.current_time
@@ -0,0 +1,306 @@
+"""Token-budgeted digests of delegate tool results, with handles to the full payloads."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from destination_scout.service import DestinationScoutResponse
+from flight_search.calendar import parse_calendar
+from flight_search.service import FlightSearchResponse
+from shared.flight_utils import (
+    iter_itineraries,
+    itinerary_carriers,
+    itinerary_duration_minutes,
+    itinerary_price,
+    itinerary_segments,
+    itinerary_stops,
+)
+
+# Rough chars-per-token ratio for JSON-heavy text; deterministic and dependency-free.
+CHARS_PER_TOKEN = 4
+CALENDAR_DAYS = 5
+WHY_NOW_CHARS = 200
+_FLIGHT_METADATA_KEYS = (
+    "price_hint",
+    "google_url",
+    "search_scope",
+    "derived_from_cache",
+    "lh_group_skipped",
+    "skipped",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DigestBudget:
+    """Upper bound on one digest: estimated tokens and list items before trimming."""
+
+    max_tokens: int = 2000
+    top_n: int = 10
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate the tokens a JSON-serialised value costs the model."""
+
+    text = json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class ToolResultStore:
+    """Session-scoped LRU of full tool results, addressed by a content-derived handle."""
+
+    def __init__(self, *, max_entries: int = 256) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, session: str, kind: str, payload: dict[str, Any]) -> str:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        handle = f"{kind}-{hashlib.sha1(canonical.encode()).hexdigest()[:10]}"
+        with self._lock:
+            self._entries[(session, handle)] = payload
+            self._entries.move_to_end((session, handle))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return handle
+
+    def get(self, session: str, handle: str) -> dict[str, Any] | None:
+        with self._lock:
+            payload = self._entries.get((session, handle))
+            if payload is not None:
+                self._entries.move_to_end((session, handle))
+            return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def digest_flight_response(
+    response: FlightSearchResponse,
+    *,
+    handle: str,
+    budget: DigestBudget,
+    currency: str = "EUR",
+) -> dict[str, Any]:
+    """Top itineraries with only the fields the reply format uses, plus a calendar summary.
+
+    `currency` is the one the search was made in; SearchAPI prices carry no reliable symbol.
+    """
+
+    itineraries = iter_itineraries(response.flights)
+    digest: dict[str, Any] = {
+        "handle": handle,
+        "total_itineraries": len(itineraries),
+        "itineraries": [
+            compact_itinerary(itinerary, rank=rank, currency=currency)
+            for rank, itinerary in enumerate(itineraries[: budget.top_n], 1)
+        ],
+        "metadata": {
+            key: response.metadata[key] for key in _FLIGHT_METADATA_KEYS if key in response.metadata
+        },
+    }
+    calendar = _calendar_digest(response.calendar, currency=currency)
+    if calendar:
+        digest["calendar"] = calendar
+    return _fit(digest, "itineraries", budget)
+
+
+def digest_destination_response(
+    response: DestinationScoutResponse,
+    *,
+    handle: str,
+    budget: DigestBudget,
+) -> dict[str, Any]:
+    """Cards trimmed to what the inspiration reply quotes."""
+
+    digest = {
+        "handle": handle,
+        "cards": [
+            _compact_card(card.model_dump(), rank=rank)
+            for rank, card in enumerate(response.cards[: budget.top_n], 1)
+        ],
+        "remaining_candidates": response.remaining_candidates,
+        "search_metadata": response.search_metadata,
+    }
+    return _fit(digest, "cards", budget)
+
+
+def compact_offer(offer: Mapping[str, Any]) -> dict[str, Any]:
+    """Replace an offer's raw SearchAPI itinerary with its compact form."""
+
+    compact = {key: value for key, value in offer.items() if key != "itinerary"}
+    itinerary = offer.get("itinerary")
+    if isinstance(itinerary, Mapping):
+        details = compact_itinerary(itinerary, currency=offer.get("currency") or "EUR")
+        compact["segments"] = details.get("segments", [])
+        for key in ("amenities", "baggage", "carbon_emissions"):
+            if key in details:
+                compact[key] = details[key]
+    return compact
+
+
+def compact_itinerary(
+    itinerary: Mapping[str, Any], *, rank: int | None = None, currency: str = "EUR"
+) -> dict[str, Any]:
+    """Keep flight numbers, times, aircraft, amenities, baggage, price (and currency) and stops."""
+
+    segments = itinerary_segments(itinerary)
+    price = itinerary_price(itinerary, currency=currency)
+    compact: dict[str, Any] = {
+        "rank": rank,
+        "price": price,
+        "currency": currency if price is not None else None,
+        "stops": itinerary_stops(itinerary),
+        "duration_minutes": itinerary_duration_minutes(itinerary),
+        "carriers": list(itinerary_carriers(itinerary)) or None,
+        "segments": [_compact_segment(segment) for segment in segments],
+        "amenities": _amenities(segments),
+        "baggage": _first_text(itinerary, ("baggage", "bag_info", "fare_conditions")),
+        "carbon_emissions": _carbon(itinerary),
+    }
+    return {key: value for key, value in compact.items() if value not in (None, [], "")}
+
+
+def result_items(payload: Mapping[str, Any]) -> list[Any]:
+    """The list a digest's ranks index into: cards, offers or flight itineraries."""
+
+    for key in ("cards", "offers"):
+        if isinstance(payload.get(key), list):
+            return payload[key]
+    flights = payload.get("flights")
+    return iter_itineraries(flights if isinstance(flights, Mapping) else payload)
+
+
+def _compact_segment(segment: Mapping[str, Any]) -> dict[str, Any]:
+    compact = {
+        "flight": _flight_code(segment),
+        "from": _airport_code(segment.get("departure_airport") or segment.get("departure_id")),
+        "to": _airport_code(segment.get("arrival_airport") or segment.get("arrival_id")),
+        "departs": _segment_time(segment, "departure"),
+        "arrives": _segment_time(segment, "arrival"),
+        "aircraft": segment.get("aircraft") or segment.get("airplane"),
+    }
+    return {key: value for key, value in compact.items() if value}
+
+
+def _flight_code(segment: Mapping[str, Any]) -> str | None:
+    number = str(segment.get("flight_number") or segment.get("number") or "").replace(" ", "")
+    carrier = str(segment.get("airline_code") or segment.get("carrier") or "")
+    if number and carrier and not number.startswith(carrier):
+        number = f"{carrier}{number}"
+    return number or None
+
+
+def _airport_code(raw: Any) -> str | None:
+    if isinstance(raw, Mapping):
+        return raw.get("id") or raw.get("code") or raw.get("name")
+    return str(raw) if raw else None
+
+
+def _segment_time(segment: Mapping[str, Any], prefix: str) -> str | None:
+    raw = segment.get(f"{prefix}_time")
+    airport = segment.get(f"{prefix}_airport")
+    if raw is None and isinstance(airport, Mapping):
+        raw = airport.get("time")
+    return str(raw) if raw else None
+
+
+def _amenities(segments: list[dict[str, Any]]) -> list[str]:
+    if not segments:
+        return []
+    first = segments[0]
+    amenities = first.get("amenities") or first.get("extensions") or []
+    items = [str(item) for item in amenities if item] if isinstance(amenities, list) else []
+    if first.get("legroom"):
+        items.append(f"Legroom {first['legroom']}")
+    if first.get("seat_type"):
+        items.append(f"Seat type {first['seat_type']}")
+    return items[:4]
+
+
+def _carbon(itinerary: Mapping[str, Any]) -> Any:
+    carbon = itinerary.get("carbon_emissions") or itinerary.get("carbon_emission")
+    if isinstance(carbon, Mapping):
+        return carbon.get("this_flight") or carbon.get("typical_for_this_route")
+    return carbon
+
+
+def _first_text(item: Mapping[str, Any], keys: tuple[str, ...]) -> str | None:
+    for key in keys:
+        value = item.get(key)
+        if value:
+            return str(value)
+    return None
+
+
+def _calendar_digest(payload: Mapping[str, Any] | None, *, currency: str) -> dict[str, Any] | None:
+    if not payload:
+        return None
+    calendar = parse_calendar(payload, currency=currency)
+    if calendar is None:
+        return None
+    priced = [(price, offset) for offset, price in enumerate(calendar.prices) if price is not None]
+    cheapest = sorted(priced)[:CALENDAR_DAYS]
+    return {
+        "start_date": calendar.start.isoformat(),
+        "end_date": calendar.end.isoformat(),
+        "currency": calendar.currency,
+        "priced_days": len(priced),
+        "cheapest_days": [
+            {"date": (calendar.start + timedelta(days=offset)).isoformat(), "price": price}
+            for price, offset in cheapest
+        ],
+    }
+
+
+def _compact_card(card: Mapping[str, Any], *, rank: int) -> dict[str, Any]:
+    why_now = str(card.get("why_now") or "")
+    if len(why_now) > WHY_NOW_CHARS:
+        why_now = why_now[: WHY_NOW_CHARS - 1].rstrip() + "…"
+    weather = card.get("weather") or {}
+    metadata = card.get("metadata") or {}
+    compact = {
+        "rank": rank,
+        "destination": card.get("destination"),
+        "arrival_id": card.get("arrival_id"),
+        "country": card.get("country"),
+        "why_now": why_now,
+        "events": list(card.get("events") or [])[:3],
+        "weather": weather.get("headline") if isinstance(weather, Mapping) else None,
+        "coordinates": card.get("coordinates"),
+        "price_text": metadata.get("price_text"),
+    }
+    return {key: value for key, value in compact.items() if value not in (None, [], "")}
+
+
+def _fit(digest: dict[str, Any], list_key: str, budget: DigestBudget) -> dict[str, Any]:
+    """Drop trailing list items until the digest fits; the first item is always kept."""
+
+    items = digest[list_key]
+    while len(items) > 1 and estimate_tokens(digest) > budget.max_tokens:
+        items.pop()
+        digest["omitted_for_budget"] = digest.get("omitted_for_budget", 0) + 1
+    return digest
+
+
+__all__ = [
+    "DigestBudget",
+    "ToolResultStore",
+    "compact_itinerary",
+    "compact_offer",
+    "digest_destination_response",
+    "digest_flight_response",
+    "estimate_tokens",
+    "result_items",
+]
@@ -0,0 +1,190 @@
+"""Bounded supervisor history: sliding window, compacted old tool results, running summary."""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from strands.agent.conversation_manager import SlidingWindowConversationManager
+
+if TYPE_CHECKING:
+    from strands import Agent
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_STATE_KEY = "session_summary"
+SUMMARY_PREFIX = "[Earlier in this session] "
+COMPACTED_PREFIX = "[compacted] "
+# Small scalar fields of the supervisor tool digests worth keeping once the rest is dropped.
+_DIGEST_KEYS = ("handle", "summary", "total_itineraries", "remaining_candidates", "reused")
+
+
+class DigestingConversationManager(SlidingWindowConversationManager):
+    """Keeps per-turn input bounded however long the conversation runs.
+
+    Before every model call:
+
+    - tool results older than the last `raw_turns` user turns are replaced by a short digest that
+      keeps the status and any detail `handle`, so `get_tool_result_details` can still reach them;
+    - once the history exceeds `window_size` messages the oldest turns are dropped (tool use/result
+      pairs stay intact) and folded into the `session_summary` state key, capped at
+      `summary_chars` and prepended to the oldest kept user message.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 20,
+        *,
+        raw_turns: int = 2,
+        digest_chars: int = 400,
+        summary_chars: int = 1500,
+    ) -> None:
+        super().__init__(window_size=window_size, should_truncate_results=True, per_turn=True)
+        self.raw_turns = raw_turns
+        self.digest_chars = digest_chars
+        self.summary_chars = summary_chars
+
+    def apply_management(self, agent: Agent, **kwargs: Any) -> None:
+        compact_tool_results(agent.messages, raw_turns=self.raw_turns, max_chars=self.digest_chars)
+        super().apply_management(agent, **kwargs)
+
+    def reduce_context(self, agent: Agent, e: Exception | None = None, **kwargs: Any) -> None:
+        before = list(agent.messages)
+        super().reduce_context(agent, e, **kwargs)
+        kept = {id(message) for message in agent.messages}
+        removed = [message for message in before if id(message) not in kept]
+        if not removed:
+            return
+        previous = agent.state.get(SUMMARY_STATE_KEY) or ""
+        summary = _fold_summary(previous, removed, limit=self.summary_chars)
+        agent.state.set(SUMMARY_STATE_KEY, summary)
+        _attach_summary(agent.messages, summary)
+        logger.debug("Dropped %d messages into the session summary", len(removed))
+
+
+def compact_tool_results(messages: list[dict[str, Any]], *, raw_turns: int, max_chars: int) -> int:
+    """Digest tool results older than the last `raw_turns` user turns; returns how many changed."""
+
+    boundary = _raw_turns_start(messages, raw_turns)
+    compacted = 0
+    for message in messages[:boundary]:
+        for block in message.get("content", []):
+            result = block.get("toolResult")
+            if result is None or _is_compacted(result):
+                continue
+            if len(_content_text(result.get("content", []))) <= max_chars:
+                continue
+            result["content"] = [{"text": COMPACTED_PREFIX + _digest(result, max_chars)}]
+            compacted += 1
+    return compacted
+
+
+def _raw_turns_start(messages: list[dict[str, Any]], raw_turns: int) -> int:
+    """Index of the first message of the last `raw_turns` traveller turns."""
+
+    seen = 0
+    for index in range(len(messages) - 1, -1, -1):
+        if _user_text(messages[index]):
+            seen += 1
+            if seen >= raw_turns:
+                return index
+    return 0
+
+
+def _digest(result: dict[str, Any], max_chars: int) -> str:
+    payload = _first_json(result.get("content", []))
+    digest: dict[str, Any] = {"status": result.get("status", "success")}
+    if isinstance(payload, dict):
+        digest["status"] = payload.get("status", digest["status"])
+        data = payload.get("data") if isinstance(payload.get("data"), dict) else payload
+        for key in _DIGEST_KEYS:
+            if key in data:
+                digest[key] = data[key]
+        if "message" in payload:
+            digest["message"] = payload["message"]
+    if "handle" in digest:
+        digest["note"] = "older result; use get_tool_result_details with the handle"
+    else:
+        digest["excerpt"] = _content_text(result.get("content", []))[: max_chars // 2]
+    return json.dumps(digest, default=str)[:max_chars]
+
+
+def _fold_summary(previous: str, removed: Iterable[dict[str, Any]], *, limit: int) -> str:
+    lines = [previous] if previous else []
+    tool_names: dict[str, str] = {}
+    for message in removed:
+        for block in message.get("content", []):
+            if "toolUse" in block:
+                tool_names[block["toolUse"].get("toolUseId", "")] = block["toolUse"].get("name", "")
+        text = _user_text(message)
+        if text:
+            lines.append(f"Traveller: {text[:160]}")
+        for block in message.get("content", []):
+            result = block.get("toolResult")
+            if result is not None:
+                name = tool_names.get(result.get("toolUseId", ""), "tool")
+                lines.append(f"{name}: {_digest(result, 200)}")
+    summary = "\n".join(lines)
+    # Oldest facts go first when the summary outgrows its budget.
+    return summary[-limit:]
+
+
+def _attach_summary(messages: list[dict[str, Any]], summary: str) -> None:
+    for message in messages:
+        if message.get("role") != "user" or not _user_text(message):
+            continue
+        content = [
+            block
+            for block in message["content"]
+            if not block.get("text", "").startswith(SUMMARY_PREFIX)
+        ]
+        message["content"] = [{"text": SUMMARY_PREFIX + summary}, *content]
+        return
+
+
+def _user_text(message: dict[str, Any]) -> str:
+    if message.get("role") != "user":
+        return ""
+    texts = [
+        block["text"]
+        for block in message.get("content", [])
+        if "text" in block and not block["text"].startswith(SUMMARY_PREFIX)
+    ]
+    return " ".join(texts).strip()
+
+
+def _is_compacted(result: dict[str, Any]) -> bool:
+    content = result.get("content", [])
+    return len(content) == 1 and content[0].get("text", "").startswith(COMPACTED_PREFIX)
+
+
+def _first_json(content: list[dict[str, Any]]) -> Any:
+    for block in content:
+        if "json" in block:
+            return block["json"]
+        if "text" in block:
+            try:
+                return json.loads(block["text"])
+            except ValueError:
+                continue
+    return None
+
+
+def _content_text(content: list[dict[str, Any]]) -> str:
+    parts = []
+    for block in content:
+        if "json" in block:
+            parts.append(json.dumps(block["json"], default=str))
+        elif "text" in block:
+            parts.append(block["text"])
+    return "".join(parts)
+
+
+__all__ = [
+    "DigestingConversationManager",
+    "SUMMARY_PREFIX",
+    "SUMMARY_STATE_KEY",
+    "compact_tool_results",
+]
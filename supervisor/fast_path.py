@@ -0,0 +1,230 @@
+"""Structured entry point that answers complete itineraries without a model call.
+
+The frontend often already knows the whole itinerary. Routing it through the supervisor LLM only
+to call `call_flight_search` and reformat the result costs two or more model round trips, so
+complete requests run the services and `compose_reply` directly. The split follows the
+`itinerary_completeness` policy in `config/supervisor.strands.json`: complete itineraries (with a
+return date unless `one_way`) go to flight search, structured inspiration requests (origin plus
+time window, no destination) go to the destination scout, and everything else falls back to the
+agent. Fast-path turns are added to the session's history for the agent's later turns.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, PositiveInt, ValidationError
+
+from config.settings import get_settings
+from destination_scout.service import (
+    DestinationScoutError,
+    DestinationScoutRequest,
+    TimeWindow,
+)
+from flight_search.service import FlightSearchError, FlightSearchRequest
+from shared.deadline import deadline_scope, lambda_budget
+from shared.registry import get_registry
+from supervisor.composer import compose_reply
+from supervisor.prefetch import prefetch_weather
+from supervisor.streaming import agent_sessions
+
+logger = logging.getLogger(__name__)
+
+# Mirrors policies.itinerary_completeness.threshold in config/supervisor.strands.json.
+COMPLETENESS_THRESHOLD = 0.7
+
+FastRoute = Literal["flights", "destinations", "agent"]
+
+
+class StructuredRequest(BaseModel):
+    """Itinerary fields the frontend already collected, plus the traveller's own words if any."""
+
+    persona: str = Field(..., min_length=2, description="Persona identifier, e.g. Paula or Gina.")
+    session_id: str | None = Field(
+        default=None, description="Conversation to continue; a new one is assigned when unset."
+    )
+    message: str | None = Field(
+        default=None,
+        description="Free-text turn handed to the agent when the fast path does not apply.",
+    )
+    intent: str | None = None
+    departure_id: str | None = Field(default=None, min_length=3)
+    arrival_id: str | None = Field(default=None, min_length=3)
+    outbound_date: date | None = None
+    return_date: date | None = None
+    one_way: bool = False
+    adults: PositiveInt = 1
+    travel_class: Literal["economy", "premium_economy", "business", "first"] | None = None
+    stops: Literal["any", "nonstop"] = "any"
+    time_window: TimeWindow | None = None
+    interests: list[str] = Field(default_factory=list)
+    conversation_state: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Earlier conversation_state (cards, travel_personality_choice) to render with.",
+    )
+
+
+class StructuredResponse(BaseModel):
+    """Reply plus how it was produced."""
+
+    persona: str
+    route: FastRoute
+    completeness: float
+    reply: str
+    session_id: str
+
+
+def itinerary_completeness(request: StructuredRequest) -> float:
+    """Share of origin, destination, outbound date, return date (or one-way) and cabin known."""
+
+    known = [
+        request.departure_id,
+        request.arrival_id,
+        request.outbound_date,
+        request.return_date or request.one_way,
+        request.travel_class,
+    ]
+    return round(sum(1 for value in known if value) / len(known), 2)
+
+
+def choose_route(request: StructuredRequest, completeness: float | None = None) -> FastRoute:
+    """Pick the deterministic path for `request`, or "agent" when it needs reasoning."""
+
+    score = itinerary_completeness(request) if completeness is None else completeness
+    today = date.today()
+    dates = [value for value in (request.outbound_date, request.return_date) if value]
+    if any(value < today for value in dates):
+        # Past dates need the agent's `current_time` normalisation.
+        return "agent"
+    if (
+        score >= COMPLETENESS_THRESHOLD
+        and request.departure_id
+        and request.arrival_id
+        and request.outbound_date
+        # A missing return date is only a one-way trip when the traveller said so.
+        and (request.return_date or request.one_way)
+    ):
+        return "flights"
+    if request.departure_id and request.time_window and not request.arrival_id:
+        return "destinations"
+    return "agent"
+
+
+def answer(request: StructuredRequest) -> StructuredResponse:
+    """Answer `request` on the fast path when possible, otherwise through the supervisor agent."""
+
+    completeness = itinerary_completeness(request)
+    route = choose_route(request, completeness)
+    logger.info("Structured request routed to %s (completeness=%.2f)", route, completeness)
+    if route != "agent":
+        try:
+            state = _run_services(request, route)
+        except (FlightSearchError, DestinationScoutError) as exc:
+            # The agent relays upstream failures in the persona's voice.
+            logger.warning("Fast path %s failed, falling back to the agent: %s", route, exc)
+        else:
+            reply = compose_reply(request.persona, prefetch_weather(state), intent=request.intent)
+            # Recorded in the session so a free-text follow-up reaches an agent that saw it.
+            session_id = agent_sessions().record_exchange(
+                request.session_id, request.message or _describe(request), reply
+            )
+            return StructuredResponse(
+                persona=request.persona,
+                route=route,
+                completeness=completeness,
+                reply=reply,
+                session_id=session_id,
+            )
+
+    session_id, reply = _ask_agent(request)
+    return StructuredResponse(
+        persona=request.persona,
+        route="agent",
+        completeness=completeness,
+        reply=reply,
+        session_id=session_id,
+    )
+
+
+def _run_services(request: StructuredRequest, route: FastRoute) -> dict[str, Any]:
+    registry = get_registry()
+    state = dict(request.conversation_state)
+    if route == "flights":
+        flights = registry.flight_service().search(
+            FlightSearchRequest(
+                departure_id=request.departure_id,
+                arrival_id=request.arrival_id,
+                outbound_date=request.outbound_date,
+                return_date=request.return_date,
+                adults=request.adults,
+                travel_class=request.travel_class or "economy",
+                stops=request.stops,
+            )
+        )
+        state["flight_results"] = flights.model_dump(mode="json")
+    else:
+        cards = registry.destination_service().generate_cards(
+            DestinationScoutRequest(
+                departure_id=request.departure_id,
+                time_window=request.time_window,
+                adults=request.adults,
+                interests=request.interests,
+            )
+        )
+        state["destination_cards"] = [card.model_dump(mode="json") for card in cards.cards]
+    return state
+
+
+def _ask_agent(request: StructuredRequest) -> tuple[str, str]:
+    session_id, agent = agent_sessions().get(request.session_id, request.persona)
+    result = agent(request.message or _describe(request))
+    return session_id, str(result)
+
+
+def _describe(request: StructuredRequest) -> str:
+    """Spell the structured fields out as a traveller message for the agent."""
+
+    window = request.time_window
+    cabin = request.travel_class
+    candidates = [
+        (request.departure_id, f"from {request.departure_id}"),
+        (request.arrival_id, f"to {request.arrival_id}"),
+        (request.outbound_date, f"leaving {request.outbound_date}"),
+        (request.return_date, f"returning {request.return_date}"),
+        (request.one_way and not request.return_date, "one way"),
+        (window, f"travelling {window.token.replace('_', ' ') if window else ''}"),
+        (cabin, f"in {cabin.replace('_', ' ') if cabin else ''}"),
+        (request.interests, f"interested in {', '.join(request.interests)}"),
+        (request.adults > 1, f"for {request.adults} adults"),
+    ]
+    parts = [text for known, text in candidates if known]
+    if not parts:
+        return request.intent or "Help me plan a trip."
+    return "I'd like to fly " + ", ".join(parts) + "."
+
+
+def lambda_handler(event: dict[str, Any], _context: Any | None = None) -> dict[str, Any]:
+    """Entry point compatible with AWS Lambda."""
+
+    try:
+        request = StructuredRequest.model_validate(event)
+    except ValidationError as exc:
+        logger.error("Invalid structured supervisor payload: %s", exc)
+        raise
+
+    with deadline_scope(lambda_budget(_context, get_settings().tool_deadline_seconds)):
+        response = answer(request)
+    return response.model_dump()
+
+
+__all__ = [
+    "COMPLETENESS_THRESHOLD",
+    "StructuredRequest",
+    "StructuredResponse",
+    "answer",
+    "choose_route",
+    "itinerary_completeness",
+    "lambda_handler",
+]
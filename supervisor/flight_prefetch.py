@@ -0,0 +1,203 @@
+"""Speculative flight searches for the destination cards a traveller is likely to pick next."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any
+
+from destination_scout.service import DestinationCard, DestinationScoutRequest
+from flight_search.service import FlightSearchRequest
+from shared.deadline import deadline_scope
+from shared.flight_utils import lhg_airlines_list
+
+logger = logging.getLogger(__name__)
+
+PrefetchKey = tuple[Any, ...]
+
+
+@dataclass(slots=True)
+class _SessionPrefetches:
+    scheduled: int = 0
+    pending: dict[PrefetchKey, Future[Any]] = field(default_factory=dict)
+
+
+class FlightPrefetcher:
+    """Runs flight searches for the top destination cards on a small background pool.
+
+    Results land in the flight service's cache, so the traveller's follow-up search for one of
+    those destinations is answered locally. Each session may schedule at most `session_cap`
+    searches. New cards replace a session's pending prefetches, and a real flight search
+    cancels every queued prefetch except the one it can reuse. With `top_k=0` nothing is
+    scheduled.
+    """
+
+    def __init__(
+        self,
+        search: Callable[[FlightSearchRequest], Any],
+        *,
+        top_k: int = 0,
+        session_cap: int = 4,
+        max_workers: int = 1,
+        deadline_seconds: float = 25.0,
+        max_sessions: int = 256,
+    ) -> None:
+        self._search = search
+        self._top_k = top_k
+        self._session_cap = session_cap
+        self._max_workers = max_workers
+        self._deadline_seconds = deadline_seconds
+        self._max_sessions = max_sessions
+        self._sessions: OrderedDict[str, _SessionPrefetches] = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._top_k > 0
+
+    def schedule(
+        self,
+        session: str,
+        request: DestinationScoutRequest,
+        cards: Sequence[DestinationCard],
+    ) -> list[FlightSearchRequest]:
+        """Replace the session's pending prefetches with searches for the top cards."""
+
+        if not self.enabled:
+            return []
+        self.cancel(session)
+        start = request.time_window.start_date
+        end = request.time_window.end_date
+        if start is None or start < date.today():
+            # Token-only windows ("one_week_trip_in_march") have no concrete dates to search.
+            return []
+        scheduled: list[FlightSearchRequest] = []
+        with self._lock:
+            state = self._session(session)
+            for card in cards[: self._top_k]:
+                if state.scheduled >= self._session_cap:
+                    break
+                if not card.arrival_id:
+                    continue
+                flight_request = FlightSearchRequest(
+                    departure_id=request.departure_id,
+                    arrival_id=card.arrival_id,
+                    outbound_date=start,
+                    return_date=end if end and end > start else None,
+                    adults=request.adults,
+                )
+                state.scheduled += 1
+                state.pending[_key(flight_request)] = self._pool().submit(self._run, flight_request)
+                scheduled.append(flight_request)
+        return scheduled
+
+    def settle(
+        self,
+        session: str,
+        request: FlightSearchRequest,
+        *,
+        timeout: float | None = None,
+    ) -> bool:
+        """Before a real search: wait for a matching prefetch and cancel the others.
+
+        Returns True when a matching prefetch finished, so the search should hit the cache.
+        """
+
+        with self._lock:
+            state = self._sessions.get(session)
+            if state is None:
+                return False
+            match = state.pending.pop(_key(request), None)
+            others = list(state.pending.values())
+            state.pending.clear()
+        for future in others:
+            future.cancel()
+        if match is None:
+            return False
+        try:
+            match.result(timeout=timeout)
+        except (CancelledError, FutureTimeoutError):
+            return False
+        return True
+
+    def cancel(self, session: str) -> int:
+        """Cancel the session's queued prefetches; returns how many never started."""
+
+        with self._lock:
+            state = self._sessions.get(session)
+            if state is None:
+                return 0
+            pending = list(state.pending.values())
+            state.pending.clear()
+        return sum(1 for future in pending if future.cancel())
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._sessions.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, request: FlightSearchRequest) -> None:
+        with deadline_scope(self._deadline_seconds):
+            try:
+                self._search(request)
+            except Exception as exc:  # prefetching is best-effort
+                logger.info(
+                    "Flight prefetch %s-%s failed: %s",
+                    request.departure_id,
+                    request.arrival_id,
+                    exc,
+                )
+
+    def _session(self, session: str) -> _SessionPrefetches:
+        state = self._sessions.get(session)
+        if state is None:
+            state = _SessionPrefetches()
+            self._sessions[session] = state
+            if len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+        self._sessions.move_to_end(session)
+        return state
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="flight-prefetch"
+            )
+        return self._executor
+
+
+def _key(request: FlightSearchRequest) -> PrefetchKey:
+    """Every field sent upstream, so a prefetch only stands in for an identical search."""
+
+    return (
+        request.departure_id.upper(),
+        request.arrival_id.upper(),
+        request.outbound_date,
+        request.return_date,
+        request.adults,
+        request.travel_class,
+        request.stops,
+        request.max_price,
+        frozenset(lhg_airlines_list(request.included_airlines)),
+        request.currency,
+        request.locale,
+        request.region,
+        (
+            (request.calendar_window.start_date, request.calendar_window.end_date)
+            if request.calendar_window
+            else None
+        ),
+        request.calendar_limit if request.calendar_window else None,
+    )
+
+
+__all__ = ["FlightPrefetcher"]
@@ -7,7 +7,10 @@ from typing import Any
 
 from pydantic import BaseModel, Field, ValidationError
 
+from config.settings import get_settings
+from shared.deadline import deadline_scope, lambda_budget
 from supervisor.composer import compose_reply
+from supervisor.prefetch import prefetch_weather
 
 logger = logging.getLogger(__name__)
 
@@ -35,11 +38,15 @@ class ComposeResponse(BaseModel):
 
 
 def render_reply(request: ComposeRequest) -> ComposeResponse:
-    """Convert a validated request into a formatted persona reply."""
+    """Convert a validated request into a formatted persona reply.
 
+    Weather the reply needs is fetched first; `compose_reply` itself only formats.
+    """
+
+    conversation_state = prefetch_weather(request.conversation_state)
     reply_text = compose_reply(
         request.persona,
-        request.conversation_state,
+        conversation_state,
         intent=request.intent,
     )
     return ComposeResponse(persona=request.persona, intent=request.intent, reply=reply_text)
@@ -54,7 +61,8 @@ def lambda_handler(event: dict[str, Any], _context: Any | None = None) -> dict[s
         logger.error("Invalid Supervisor compose payload: %s", exc)
         raise
 
-    response = render_reply(request)
+    with deadline_scope(lambda_budget(_context, get_settings().tool_deadline_seconds)):
+        response = render_reply(request)
     return response.model_dump()
 
 
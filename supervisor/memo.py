@@ -0,0 +1,82 @@
+"""Per-session memo of successful supervisor tool results, keyed by the validated request."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import BaseModel
+
+MemoKey = tuple[str, str, str]
+
+
+class ToolMemo:
+    """Short-lived LRU of tool results so a repeated call within a conversation is free.
+
+    Keys combine the session, the tool name and the request's canonical JSON, so two requests
+    that validate to the same model share an entry however the model spelled them.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[MemoKey, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def recall(
+        self, session: str, tool: str, request: BaseModel, *, max_age: float
+    ) -> dict[str, Any] | None:
+        """Return the stored result marked `reused`, or None when absent or older than max_age."""
+
+        if max_age <= 0:
+            return None
+        key = _key(session, tool, request)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            age = now - stored_at
+            if age > max_age:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return {**result, "reused": True, "reused_age_seconds": round(age, 1)}
+
+    def remember(
+        self, session: str, tool: str, request: BaseModel, result: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Store a successful result and return it unchanged; errors are never memoised."""
+
+        if result.get("status") != "success":
+            return result
+        key = _key(session, tool, request)
+        with self._lock:
+            self._entries[key] = (self._clock(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _key(session: str, tool: str, request: BaseModel) -> MemoKey:
+    return session, tool, request.model_dump_json()
+
+
+__all__ = ["ToolMemo"]
@@ -0,0 +1,89 @@
+"""I/O stage run before `compose_reply` so rendering never waits on the network."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Mapping
+from datetime import date, timedelta
+from typing import Any
+
+from supervisor.renderers import weather_target
+from supervisor.weather import fetch_weather_snapshot, summarise_weather
+
+logger = logging.getLogger(__name__)
+
+FORECAST_HORIZON = timedelta(days=16)
+
+WeatherFetcher = Callable[..., dict[str, Any]]
+
+
+def prefetch_weather(
+    conversation_state: Mapping[str, Any],
+    *,
+    fetch: WeatherFetcher | None = None,
+) -> dict[str, Any]:
+    """Return a copy of the state whose weather-report card carries weather.
+
+    Only the card `build_destination_weather_report` will describe is considered, and only when
+    it has neither a headline nor raw forecast arrays but does have coordinates and the trip
+    window is inside Open-Meteo's forecast horizon. Failures leave the state unchanged.
+    """
+
+    state = dict(conversation_state)
+    target = weather_target(state)
+    if target is None:
+        return state
+    card, (start_text, end_text) = target
+    if _has_weather(card):
+        return state
+    coordinates = _coordinates(card)
+    if coordinates is None:
+        return state
+    start, end = date.fromisoformat(start_text), date.fromisoformat(end_text)
+    today = date.today()
+    if end < today or start - today > FORECAST_HORIZON:
+        return state
+
+    # Imported here so the supervisor handler only loads httpx and the scout service when a
+    # forecast is actually fetched.
+    from destination_scout.service import DestinationScoutError
+
+    try:
+        payload = (fetch or fetch_weather_snapshot)(
+            latitude=coordinates[0],
+            longitude=coordinates[1],
+            start_date=max(start, today),
+            end_date=end,
+        )
+    except DestinationScoutError as exc:
+        logger.warning("Weather prefetch for %s failed: %s", card.get("destination"), exc)
+        return state
+
+    headline = summarise_weather(payload)
+    if not headline:
+        return state
+    enriched = {**card, "weather": {"headline": headline}, "forecast": payload.get("daily")}
+    state["destination_cards"] = [
+        enriched if existing is card else existing for existing in state["destination_cards"]
+    ]
+    return state
+
+
+def _has_weather(card: Mapping[str, Any]) -> bool:
+    weather = card.get("weather")
+    if isinstance(weather, Mapping) and weather.get("headline"):
+        return True
+    return isinstance(card.get("forecast"), Mapping)
+
+
+def _coordinates(card: Mapping[str, Any]) -> tuple[float, float] | None:
+    coords = card.get("coordinates")
+    if not isinstance(coords, Mapping):
+        return None
+    try:
+        return float(coords["latitude"]), float(coords["longitude"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+__all__ = ["prefetch_weather"]
@@ -3,14 +3,11 @@
 from __future__ import annotations
 
 from collections.abc import Iterable, Mapping
-from datetime import date, datetime, timedelta
+from datetime import datetime
 from typing import Any
 
-import httpx
-
-from config.settings import get_settings
 from shared.flight_utils import normalise_price
-from supervisor.weather import fetch_weather_snapshot, summarise_weather
+from supervisor.weather import summarise_weather
 
 
 def format_destination_cards(cards: Iterable[dict[str, Any]]) -> str:
@@ -67,7 +64,11 @@ def format_flight_summary(
     return "\n\n".join(sections)
 
 
-def build_destination_weather_report(conversation_state: Mapping[str, Any]) -> str | None:
+def weather_target(
+    conversation_state: Mapping[str, Any],
+) -> tuple[dict[str, Any], tuple[str, str]] | None:
+    """Return the card matching the lead flight's destination plus that flight's trip window."""
+
     cards = conversation_state.get("destination_cards")
     if not isinstance(cards, list) or not cards:
         return None
@@ -79,15 +80,27 @@ def build_destination_weather_report(conversation_state: Mapping[str, Any]) -> s
     if not flights:
         return None
     target_flight = flights[0]
-    arrival_code = _extract_arrival_code(target_flight)
-    matched_card = _match_destination_card(cards, arrival_code)
+    matched_card = _match_destination_card(cards, _extract_arrival_code(target_flight))
     if not matched_card:
         return None
     trip_window = _extract_trip_window(target_flight)
     if not trip_window:
         return None
-    destination = matched_card.get("destination") or arrival_code or "Destination"
-    weather_headline = _resolve_weather_headline(matched_card, trip_window)
+    return matched_card, trip_window
+
+
+def build_destination_weather_report(conversation_state: Mapping[str, Any]) -> str | None:
+    """Render the closing weather line from data already in the state; never fetches.
+
+    Missing weather is resolved beforehand by `supervisor.prefetch.prefetch_weather`.
+    """
+
+    target = weather_target(conversation_state)
+    if target is None:
+        return None
+    card, trip_window = target
+    destination = card.get("destination") or card.get("arrival_id") or "Destination"
+    weather_headline = _resolve_weather_headline(card)
 
     return f"Destination Weather\n{destination} ({trip_window[0]} to {trip_window[1]}): {weather_headline}"
 
@@ -261,41 +274,24 @@ def _extract_trip_window(flight: dict[str, Any]) -> tuple[str, str] | None:
     return depart, return_arrival
 
 
-def _resolve_weather_headline(card: dict[str, Any], trip_window: tuple[str, str]) -> str:
+def _resolve_weather_headline(card: Mapping[str, Any]) -> str:
     weather = card.get("weather")
     if isinstance(weather, Mapping):
         headline = weather.get("headline")
         if headline:
             return str(headline)
 
-    metadata = card.get("metadata") or {}
-    coords = metadata.get("coordinates") or card.get("coordinates") or {}
-    latitude = _coerce_float(coords.get("latitude"))
-    longitude = _coerce_float(coords.get("longitude"))
-    if latitude is None or longitude is None:
-        return "Weather snapshot unavailable"
-
-def _coerce_float(value: Any) -> float | None:
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return None
-
-    start = date.fromisoformat(trip_window[0])
-    end = date.fromisoformat(trip_window[1])
-    if start - date.today() > timedelta(days=16):
-        return "Weather snapshot unavailable"
-    try:
-        payload = fetch_weather_snapshot(
-            latitude=latitude,
-            longitude=longitude,
-            start_date=start,
-            end_date=end,
-        )
-        summary = summarise_weather(payload)
-        return summary or "Weather snapshot unavailable"
-    except httpx.HTTPError:
-        return "Weather snapshot unavailable"
+    forecast = card.get("forecast")
+    if isinstance(forecast, Mapping):
+        summary = summarise_weather({"daily": forecast})
+        if summary:
+            return summary
+    return "Weather snapshot unavailable"
 
 
-__all__ = ["format_destination_cards", "format_flight_summary"]
+__all__ = [
+    "build_destination_weather_report",
+    "format_destination_cards",
+    "format_flight_summary",
+    "weather_target",
+]
@@ -0,0 +1,96 @@
+"""Send simple supervisor turns to a small, fast model and everything else to the main one."""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections.abc import Sequence
+from typing import Any, Literal
+
+from strands.models.routing import RoutingCandidate, RoutingContext
+
+from supervisor.conversation import SUMMARY_PREFIX
+
+logger = logging.getLogger(__name__)
+
+TurnIntent = Literal["greeting", "confirmation", "slot_filling", "planning"]
+
+FAST_INTENTS: frozenset[str] = frozenset({"greeting", "confirmation", "slot_filling"})
+
+_GREETING = re.compile(
+    r"^(hi|hello|hey|hallo|good (morning|afternoon|evening)|thanks?( you)?|thank you|bye|"
+    r"goodbye|ciao|servus|moin)\b[\s!.,]*\w{0,12}[\s!.]*$",
+    re.IGNORECASE,
+)
+_CONFIRMATION = re.compile(
+    r"^(yes|yeah|yep|sure|ok(ay)?|no|nope|correct|exactly|sounds good|go ahead|please do|"
+    r"[1-4])\b[\s!.,]*(please|thanks?|thank you)?[\s!.]*$",
+    re.IGNORECASE,
+)
+# Words that signal the traveller wants the supervisor to search, compare or plan.
+_PLANNING = re.compile(
+    r"\b(flights?|fly|plan|itinerar\w*|trip|compare|cheap\w*|price\w*|weather|recommend\w*|"
+    r"suggest\w*|ideas?|inspir\w*|options?|where|which|why|how|book\w*|budget|hotel\w*)\b",
+    re.IGNORECASE,
+)
+_SLOT_WORDS = 8
+
+
+def classify_turn(text: str) -> TurnIntent:
+    """Cheap local guess at how much reasoning a traveller message needs."""
+
+    stripped = " ".join(text.split())
+    if not stripped:
+        return "planning"
+    if _GREETING.match(stripped):
+        return "greeting"
+    if _CONFIRMATION.match(stripped):
+        return "confirmation"
+    if len(stripped.split()) <= _SLOT_WORDS and not _PLANNING.search(stripped):
+        # Short answers to a clarifying question: "Frankfurt", "2 adults", "mid March".
+        return "slot_filling"
+    return "planning"
+
+
+class IntentRoutingStrategy:
+    """`ModelRouter` strategy choosing the candidate named "fast" for simple turns.
+
+    Everything else, and any turn whose fast attempt failed, goes to the candidate named "main".
+    The latest decision is kept on `last_decision` for logging and tests.
+    """
+
+    def __init__(self, fast_intents: frozenset[str] = FAST_INTENTS) -> None:
+        self._fast_intents = fast_intents
+        self.last_decision: tuple[TurnIntent, str] | None = None
+
+    async def select(self, context: RoutingContext, **_kwargs: Any) -> RoutingCandidate | None:
+        by_name = {candidate.name: candidate for candidate in context.candidates}
+        if context.attempts:
+            # The fast model failed; let the main model answer rather than surfacing the error.
+            used = {attempt.candidate.name for attempt in context.attempts}
+            return by_name.get("main") if "main" not in used else None
+
+        intent = classify_turn(_latest_user_text(context.messages))
+        name = "fast" if intent in self._fast_intents and "fast" in by_name else "main"
+        self.last_decision = (intent, name)
+        logger.info("Supervisor turn routed to %s model (intent=%s)", name, intent)
+        return by_name.get(name)
+
+
+def _latest_user_text(messages: Sequence[dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") != "user":
+            continue
+        texts = [
+            block["text"]
+            for block in message.get("content", [])
+            if "text" in block and not block["text"].startswith(SUMMARY_PREFIX)
+        ]
+        if texts:
+            return " ".join(texts)
+        # A tool-result turn: the model is mid-plan, so keep reasoning on the main model.
+        return "plan"
+    return ""
+
+
+__all__ = ["FAST_INTENTS", "IntentRoutingStrategy", "TurnIntent", "classify_turn"]
@@ -0,0 +1,26 @@
+"""Session identity helpers shared by the supervisor tools."""
+
+from __future__ import annotations
+
+import uuid
+from typing import Any
+
+DEFAULT_SESSION = "default"
+
+
+def session_key(agent: Any | None) -> str:
+    """Return a stable key for the agent's conversation, seeding one into agent.state if absent."""
+
+    if agent is None:
+        return DEFAULT_SESSION
+    state = getattr(agent, "state", None)
+    if state is None:
+        return DEFAULT_SESSION
+    key = state.get("session_id")
+    if not key:
+        key = uuid.uuid4().hex
+        state.set("session_id", key)
+    return str(key)
+
+
+__all__ = ["DEFAULT_SESSION", "session_key"]
@@ -0,0 +1,193 @@
+"""Incremental supervisor replies: text deltas and tool progress as they happen."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Iterator
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, Field, ValidationError
+
+from supervisor.session import session_key
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def stream_reply(agent: Any, message: str) -> AsyncIterator[dict[str, Any]]:
+    """Run one supervisor turn and yield compact events while it runs.
+
+    Event types: `text` (a reply delta), `tool_start` / `tool_end` (one per tool call, with its
+    name and, when finished, status) and a final `done` carrying the full reply and stop reason.
+    """
+
+    tool_names: dict[str, str] = {}
+    async for event in agent.stream_async(message):
+        if "data" in event and event["data"]:
+            yield {"type": "text", "text": event["data"]}
+        elif "current_tool_use" in event:
+            tool_use = event["current_tool_use"] or {}
+            tool_id, name = tool_use.get("toolUseId"), tool_use.get("name")
+            if tool_id and name and tool_id not in tool_names:
+                tool_names[tool_id] = name
+                yield {"type": "tool_start", "tool": name}
+        elif "message" in event:
+            for block in event["message"].get("content", []):
+                result = block.get("toolResult")
+                if result is not None:
+                    yield {
+                        "type": "tool_end",
+                        "tool": tool_names.get(result.get("toolUseId"), "tool"),
+                        "status": result.get("status", "success"),
+                    }
+        elif "result" in event:
+            result = event["result"]
+            yield {"type": "done", "reply": str(result), "stop_reason": result.stop_reason}
+
+
+def iter_events(events: AsyncIterator[T]) -> Iterator[T]:
+    """Drive an async event stream from synchronous code (CLI, WSGI/Lambda streaming adapters)."""
+
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(anext(events))
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(events.aclose())
+        loop.close()
+
+
+class ChatRequest(BaseModel):
+    """Input contract for the streaming supervisor handler."""
+
+    message: str = Field(..., min_length=1)
+    persona: str | None = None
+    session_id: str | None = None
+
+
+class AgentSessions:
+    """LRU of supervisor agents by session id, so a conversation keeps its history and state.
+
+    Turns answered without the agent (the structured fast path) are kept per session until an
+    agent is built for it, so the fast path never pays for building one.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str | None], Any] | None = None,
+        *,
+        max_sessions: int = 64,
+    ) -> None:
+        self._factory = factory or _build_quiet_agent
+        self._max_sessions = max_sessions
+        self._agents: OrderedDict[str, Any] = OrderedDict()
+        self._pending: OrderedDict[str, list[dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str | None, persona: str | None) -> tuple[str, Any]:
+        with self._lock:
+            agent = self._agents.get(session_id) if session_id else None
+            if agent is None:
+                agent = self._factory(persona)
+                if persona:
+                    agent.state.set("persona", persona.lower())
+                if session_id:
+                    agent.state.set("session_id", session_id)
+                    agent.messages.extend(self._pending.pop(session_id, []))
+                session_id = session_key(agent)
+                self._agents[session_id] = agent
+                while len(self._agents) > self._max_sessions:
+                    self._agents.popitem(last=False)
+            self._agents.move_to_end(session_id)
+            return session_id, agent
+
+    def record_exchange(self, session_id: str | None, message: str, reply: str) -> str:
+        """Append a turn answered outside the agent to the session; returns the session id."""
+
+        turn = [
+            {"role": "user", "content": [{"text": message}]},
+            {"role": "assistant", "content": [{"text": reply}]},
+        ]
+        with self._lock:
+            session_id = session_id or uuid.uuid4().hex
+            agent = self._agents.get(session_id)
+            if agent is not None:
+                agent.messages.extend(turn)
+                self._agents.move_to_end(session_id)
+                return session_id
+            self._pending.setdefault(session_id, []).extend(turn)
+            self._pending.move_to_end(session_id)
+            while len(self._pending) > self._max_sessions:
+                self._pending.popitem(last=False)
+            return session_id
+
+    def clear(self) -> None:
+        with self._lock:
+            self._agents.clear()
+            self._pending.clear()
+
+
+def _build_quiet_agent(persona: str | None) -> Any:
+    from strands.handlers.callback_handler import null_callback_handler
+
+    from supervisor.agent import build_agent
+
+    agent = build_agent(persona)
+    # Events go to the stream; the default handler would also print them to stdout.
+    agent.callback_handler = null_callback_handler
+    return agent
+
+
+_sessions = AgentSessions()
+
+
+def agent_sessions() -> AgentSessions:
+    """Process-wide supervisor sessions, shared by the streaming and structured entry points."""
+
+    return _sessions
+
+
+def stream_handler(event: dict[str, Any], _context: Any | None = None) -> Iterator[str]:
+    """Streaming entry point: yields one NDJSON line per event, starting with the session id.
+
+    Suits Lambda response streaming through a web adapter or any chunked HTTP response; pass the
+    returned `session_id` back to continue the conversation.
+    """
+
+    try:
+        request = ChatRequest.model_validate(event)
+    except ValidationError as exc:
+        logger.error("Invalid supervisor chat payload: %s", exc)
+        raise
+
+    session_id, agent = _sessions.get(request.session_id, request.persona)
+    yield _ndjson({"type": "session", "session_id": session_id})
+    try:
+        for item in iter_events(stream_reply(agent, request.message)):
+            yield _ndjson(item)
+    except Exception as exc:  # surface model/tool failures in-band; headers are already sent
+        logger.exception("Supervisor stream failed")
+        yield _ndjson({"type": "error", "message": str(exc)})
+
+
+def _ndjson(item: dict[str, Any]) -> str:
+    return json.dumps(item, ensure_ascii=False) + "\n"
+
+
+__all__ = [
+    "AgentSessions",
+    "ChatRequest",
+    "agent_sessions",
+    "iter_events",
+    "stream_handler",
+    "stream_reply",
+]
@@ -2,63 +2,167 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from contextlib import AbstractContextManager
 from datetime import date, timedelta
-from typing import Any
+from typing import Any, Literal, TypeVar
 
-from pydantic import BaseModel, ValidationError
-from strands import tool
+from pydantic import BaseModel, Field, PositiveInt, ValidationError, model_validator
+from strands import Agent, tool
 
 from config.settings import get_settings
 from destination_scout.service import (
+    DestinationScoutError,
     DestinationScoutRequest,
     DestinationScoutResponse,
     DestinationScoutService,
-    OpenMeteoClient,
-    SearchAPIClient as DestinationSearchClient,
+    TimeWindow,
 )
+from flight_search.calendar import MAX_CALENDAR_DAYS, TripWindowRequest
+from flight_search.offers import OfferQuery, SessionOfferStore
+from flight_search.price_history import PriceHistoryStore, PriceInsightRequest
+from flight_search.price_oracle import PriceLookupRequest
 from flight_search.service import (
+    CalendarWindow,
+    FlightSearchError,
     FlightSearchRequest,
     FlightSearchResponse,
     FlightSearchService,
-    SearchAPIClient as FlightSearchClient,
 )
+from shared import deadline
+from shared.deadline import deadline_scope
+from shared.models import DeferredModel
+from shared.registry import get_registry
+from shared.resilience import SingleFlight
+from supervisor.compaction import (
+    DigestBudget,
+    ToolResultStore,
+    compact_offer,
+    digest_destination_response,
+    digest_flight_response,
+    result_items,
+)
+from supervisor.memo import ToolMemo
+from supervisor.session import session_key
 from supervisor.weather import fetch_weather_snapshot, summarise_weather
 
-_flight_service: FlightSearchService | None = None
-_destination_service: DestinationScoutService | None = None
+_offer_stores: OrderedDict[str, SessionOfferStore] = OrderedDict()
+_offer_stores_lock = threading.Lock()
+_MAX_OFFER_SESSIONS = 256
+_tool_results = ToolResultStore()
+_tool_memo = ToolMemo()
+_searchapi_calls = SingleFlight()
+
+T = TypeVar("T")
 
 
 def _get_flight_service() -> FlightSearchService:
-    global _flight_service
-    if _flight_service is None:
-        settings = get_settings()
-        client = FlightSearchClient(
-            base_url=str(settings.searchapi_endpoint),
-            api_key=settings.searchapi_key,
-        )
-        _flight_service = FlightSearchService(client)
-    return _flight_service
+    return get_registry().flight_service()
 
 
 def _get_destination_service() -> DestinationScoutService:
-    global _destination_service
-    if _destination_service is None:
-        settings = get_settings()
-        search_client = DestinationSearchClient(
-            base_url=str(settings.searchapi_endpoint),
-            api_key=settings.searchapi_key,
-        )
-        weather_client = OpenMeteoClient(base_url=str(settings.open_meteo_endpoint))
-        _destination_service = DestinationScoutService(search_client, weather_client)
-    return _destination_service
+    return get_registry().destination_service()
+
+
+def _get_price_history() -> PriceHistoryStore:
+    return get_registry().price_history()
+
+
+def _search_flights(agent: Agent | None, request: FlightSearchRequest) -> FlightSearchResponse:
+    # Reuse a speculative search for this destination (it fills the service cache) and drop
+    # the prefetches the traveller did not pick.
+    get_registry().flight_prefetcher().settle(
+        session_key(agent), request, timeout=deadline.remaining()
+    )
+    return _get_flight_service().search(request)
+
+
+def _get_offer_store(agent: Agent | None) -> SessionOfferStore:
+    key = session_key(agent)
+    with _offer_stores_lock:
+        store = _offer_stores.get(key)
+        if store is None:
+            store = SessionOfferStore()
+            _offer_stores[key] = store
+            if len(_offer_stores) > _MAX_OFFER_SESSIONS:
+                _offer_stores.popitem(last=False)
+        _offer_stores.move_to_end(key)
+        return store
+
+
+def reset_session_stores() -> None:
+    """Forget per-session offers, tool results and memoised calls (tests)."""
+
+    with _offer_stores_lock:
+        _offer_stores.clear()
+    _tool_results.clear()
+    _tool_memo.clear()
+
+
+def _digest_budget() -> DigestBudget:
+    settings = get_settings()
+    return DigestBudget(
+        max_tokens=settings.tool_result_token_budget, top_n=settings.tool_result_top_n
+    )
+
+
+def _recall(agent: Agent | None, tool_name: str, request: BaseModel) -> dict[str, Any] | None:
+    session = session_key(agent)
+    max_age = get_settings().tool_memo_ttl_seconds
+    reused = _tool_memo.recall(session, tool_name, request, max_age=max_age)
+    handle = (reused or {}).get("data", {}).get("handle")
+    if handle and _tool_results.get(session, handle) is None:
+        # The shared result store evicted the payload behind the handle; fetch it again.
+        return None
+    return reused
+
+
+def _remember(
+    agent: Agent | None,
+    tool_name: str,
+    request: BaseModel,
+    result: dict[str, Any],
+    *,
+    partial: bool = False,
+) -> dict[str, Any]:
+    # Results trimmed by the deadline are not reused, so a retry can fetch the skipped parts.
+    if partial:
+        return result
+    return _tool_memo.remember(session_key(agent), tool_name, request, result)
+
+
+def _tool_deadline() -> AbstractContextManager[None]:
+    return deadline_scope(get_settings().tool_deadline_seconds)
+
+
+async def _run_blocking(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a blocking service call on a worker thread under the tool deadline.
+
+    The deadline is entered first so `asyncio.to_thread`, which copies the current context,
+    carries it into the worker. The event loop stays free for sibling tool calls from the same
+    model turn.
+    """
+
+    with _tool_deadline():
+        return await asyncio.to_thread(func, *args, **kwargs)
 
 
 def _error(message: str) -> dict[str, Any]:
     return {"status": "error", "message": message}
 
 
+def _upstream_error(service: str, exc: Exception) -> dict[str, Any]:
+    return _error(
+        f"{service} is unavailable right now ({exc}). Do not retry immediately; tell the traveller "
+        "and offer to try again in a moment."
+    )
+
+
 @tool
-def call_flight_search(request: dict[str, Any]) -> dict[str, Any]:
+async def call_flight_search(request: dict[str, Any], agent: Agent | None = None) -> dict[str, Any]:
     """
     Use the dedicated Flight Search service powered by Google Flights SearchAPI.
 
@@ -66,7 +170,9 @@ def call_flight_search(request: dict[str, Any]) -> dict[str, Any]:
         request: JSON matching FlightSearchRequest (departure_id, arrival_id, outbound_date, optional return_date,
             adults, travel_class, stops, included_airlines, calendar_window).
     Returns:
-        Dict with status=success and SearchAPI payloads (flights, calendar, metadata).
+        Dict with status=success and a digest: top itineraries (flight numbers, times, aircraft,
+        amenities, baggage, price, stops), the cheapest calendar days, metadata and a `handle`
+        for get_tool_result_details. reused=true marks a repeat of an identical recent call.
     """
 
     try:
@@ -88,13 +194,220 @@ def call_flight_search(request: dict[str, Any]) -> dict[str, Any]:
                 "Calendar window dates are in the past. Use `current_time` to anchor the traveller's request to the future."
             )
 
-    service = _get_flight_service()
-    response: FlightSearchResponse = service.search(parsed)
-    return {"status": "success", "data": response.model_dump()}
+    reused = _recall(agent, "call_flight_search", parsed)
+    if reused is not None:
+        return reused
+
+    try:
+        response: FlightSearchResponse = await _run_blocking(_search_flights, agent, parsed)
+    except FlightSearchError as exc:
+        return _upstream_error("Flight search", exc)
+    _get_offer_store(agent).ingest(parsed, response)
+    handle = _tool_results.put(session_key(agent), "flights", response.model_dump(mode="json"))
+    digest = digest_flight_response(
+        response, handle=handle, budget=_digest_budget(), currency=parsed.currency
+    )
+    result = {"status": "success", "data": digest}
+    partial = bool(response.metadata.get("skipped"))
+    return _remember(agent, "call_flight_search", parsed, result, partial=partial)
 
 
 @tool
-def call_destination_scout(request: dict[str, Any]) -> dict[str, Any]:
+def query_flight_offers(request: dict[str, Any], agent: Agent | None = None) -> dict[str, Any]:
+    """
+    Filter, sort and rank flight offers already fetched in this conversation.
+
+    Use this for follow-ups such as "only morning departures", "cheapest nonstop" or "under 300 EUR"
+    instead of repeating call_flight_search. SearchAPI is only called when the query falls outside
+    what has already been fetched; route fields it leaves out are taken from the newest search.
+
+    Args:
+        request: JSON matching OfferQuery (optional departure_id, arrival_id, outbound_date,
+            return_date, min_price, max_price, departure_after/departure_before (HH:MM),
+            max_duration_minutes, max_stops, carriers, sort_by price|departure|duration|stops,
+            descending, limit).
+    Returns:
+        Dict with status=success, the matching offers and whether SearchAPI was called.
+    """
+
+    try:
+        parsed = OfferQuery.model_validate(request)
+    except ValidationError as exc:
+        return _error(f"Invalid OfferQuery: {exc}")
+
+    store = _get_offer_store(agent)
+    index = store.find(parsed)
+    fetched = False
+    if index is None:
+        parsed = store.complete_route(parsed)
+        if parsed is None:
+            return _error(
+                "No fetched offers cover this query. Call call_flight_search first or include "
+                "departure_id, arrival_id and outbound_date."
+            )
+        if parsed.outbound_date < date.today():
+            return _error(
+                "Outbound date is in the past. Call the `current_time` tool and normalise the "
+                "itinerary to future dates."
+            )
+        search_request = FlightSearchRequest(
+            departure_id=parsed.departure_id,
+            arrival_id=parsed.arrival_id,
+            outbound_date=parsed.outbound_date,
+            return_date=parsed.return_date,
+            stops="nonstop" if parsed.max_stops == 0 else "any",
+            **({"included_airlines": parsed.carriers} if parsed.carriers else {}),
+        )
+        try:
+            with _tool_deadline():
+                response = _get_flight_service().search(search_request)
+        except FlightSearchError as exc:
+            return _upstream_error("Flight search", exc)
+        index = store.ingest(search_request, response)
+        fetched = True
+
+    offers = [offer.to_dict() for offer in index.query(parsed)]
+    handle = _tool_results.put(session_key(agent), "offers", {"offers": offers})
+    return {
+        "status": "success",
+        "data": {
+            "handle": handle,
+            "offers": [compact_offer(offer) for offer in offers],
+            "matched": len(offers),
+            "searched": len(index),
+            "search_scope": index.search_scope,
+            "fetched_upstream": fetched,
+        },
+    }
+
+
+@tool
+def call_trip_window_finder(
+    request: dict[str, Any], agent: Agent | None = None
+) -> dict[str, Any]:
+    """
+    Find the cheapest outbound/return date pairs from Google Flights Calendar prices.
+
+    Use this instead of reasoning over raw calendar grids when the traveller is flexible on dates.
+
+    Args:
+        request: JSON matching TripWindowRequest (departure_id, arrival_id, start_date, end_date
+            (max 60 days), nights, flex_nights, outbound_weekdays/return_weekdays (0=Monday),
+            top_n, fetch_offers to also fetch full itineraries for the winning pair).
+    Returns:
+        Dict with status=success and the ranked windows (plus offers when requested).
+    """
+
+    try:
+        parsed = TripWindowRequest.model_validate(request)
+    except ValidationError as exc:
+        return _error(f"Invalid TripWindowRequest: {exc}")
+
+    if parsed.start_date < date.today():
+        return _error(
+            "Calendar window starts in the past. Use `current_time` to anchor the traveller's "
+            "request to the future."
+        )
+
+    try:
+        with _tool_deadline():
+            response = _get_flight_service().find_trip_windows(parsed)
+    except FlightSearchError as exc:
+        return _upstream_error("Flight calendar search", exc)
+    data = response.model_dump(exclude={"offers"})
+    if response.offers:
+        handle = _tool_results.put(session_key(agent), "offers", response.offers)
+        data["offers"] = digest_flight_response(
+            FlightSearchResponse.model_validate(response.offers),
+            handle=handle,
+            budget=_digest_budget(),
+            currency=parsed.currency,
+        )
+    return {"status": "success", "data": data}
+
+
+@tool
+def call_price_lookup(request: dict[str, Any], agent: Agent | None = None) -> dict[str, Any]:
+    """
+    Price a specific route/date ("how much would the 12th be?") from recent calendar data.
+
+    Answers from a Google Flights Calendar grid fetched within max_age_minutes when one covers the
+    date, and only runs a full flights search when none does or need_itineraries is true.
+
+    Args:
+        request: JSON matching PriceLookupRequest (departure_id, arrival_id, outbound_date,
+            optional return_date, adults, travel_class, currency, max_age_minutes,
+            need_itineraries).
+    Returns:
+        Dict with status=success and {price, currency, source calendar|flights, age_seconds,
+        fallback_reason, offers (only when itineraries were requested: the same digest and
+        `handle` as call_flight_search)}.
+    """
+
+    try:
+        parsed = PriceLookupRequest.model_validate(request)
+    except ValidationError as exc:
+        return _error(f"Invalid PriceLookupRequest: {exc}")
+
+    if parsed.outbound_date < date.today():
+        return _error(
+            "Outbound date is in the past. Call the `current_time` tool and normalise the "
+            "itinerary to future dates."
+        )
+
+    try:
+        with _tool_deadline():
+            quote = _get_flight_service().quote_price(parsed)
+    except FlightSearchError as exc:
+        return _upstream_error("Flight search", exc)
+    data = quote.model_dump(exclude={"offers"}, exclude_none=True)
+    if quote.offers:
+        handle = _tool_results.put(session_key(agent), "flights", quote.offers)
+        data["offers"] = digest_flight_response(
+            FlightSearchResponse.model_validate(quote.offers),
+            handle=handle,
+            budget=_digest_budget(),
+            currency=parsed.currency,
+        )
+    return {"status": "success", "data": data}
+
+
+@tool
+def call_price_insights(request: dict[str, Any]) -> dict[str, Any]:
+    """
+    Answer broad price questions for a route from previously fetched calendar and offer prices.
+
+    Use this for "which month is cheapest", "what does this route usually cost" or "are prices
+    going up" before spending a SearchAPI call. It never calls SearchAPI; use call_flight_search
+    or call_trip_window_finder when bookable offers are needed.
+
+    Args:
+        request: JSON matching PriceInsightRequest (departure_id, arrival_id,
+            question cheapest_month|typical_price|price_trend, optional month YYYY-MM, nights
+            for round trips, travel_class, currency, max_age_days).
+    Returns:
+        Dict with status=success and the answer, or status=no_data when nothing is stored yet.
+    """
+
+    try:
+        parsed = PriceInsightRequest.model_validate(request)
+    except ValidationError as exc:
+        return _error(f"Invalid PriceInsightRequest: {exc}")
+
+    answer = _get_price_history().answer(parsed)
+    if answer is None:
+        return {
+            "status": "no_data",
+            "message": "No stored prices for this route yet. Use call_trip_window_finder or "
+            "call_flight_search to fetch live prices.",
+        }
+    return {"status": "success", "data": {"question": parsed.question, **answer}}
+
+
+@tool
+async def call_destination_scout(
+    request: dict[str, Any], agent: Agent | None = None
+) -> dict[str, Any]:
     """
     Use the Destination Scout service (SearchAPI Explore + Open-Meteo) to fetch cards.
 
@@ -102,7 +415,8 @@ def call_destination_scout(request: dict[str, Any]) -> dict[str, Any]:
         request: JSON matching DestinationScoutRequest (departure_id, time_window token [+ optional dates],
             arrival_ids or interests, max_cards).
     Returns:
-        Dict with status=success and cards metadata.
+        Dict with status=success, compact cards, search metadata and a `handle` for
+        get_tool_result_details.
     """
 
     try:
@@ -110,12 +424,228 @@ def call_destination_scout(request: dict[str, Any]) -> dict[str, Any]:
     except ValidationError as exc:
         return _error(f"Invalid DestinationScoutRequest: {exc}")
 
+    reused = _recall(agent, "call_destination_scout", parsed)
+    if reused is not None:
+        return reused
+
     service = _get_destination_service()
-    response: DestinationScoutResponse = service.generate_cards(parsed)
-    return {"status": "success", "data": response.model_dump()}
+    try:
+        response: DestinationScoutResponse = await _run_blocking(service.generate_cards, parsed)
+    except DestinationScoutError as exc:
+        return _upstream_error("Destination Scout", exc)
+    handle = _tool_results.put(session_key(agent), "cards", response.model_dump(mode="json"))
+    get_registry().flight_prefetcher().schedule(session_key(agent), parsed, response.cards)
+    digest = digest_destination_response(response, handle=handle, budget=_digest_budget())
+    result = {"status": "success", "data": digest}
+    partial = bool(response.search_metadata.get("skipped"))
+    return _remember(agent, "call_destination_scout", parsed, result, partial=partial)
+
+
+SearchEngine = Literal["google_flights", "google_flights_calendar", "google_travel_explore"]
+
+_ENGINE_FIELDS: dict[str, tuple[str, ...]] = {
+    "google_flights": ("arrival_id", "outbound_date"),
+    "google_flights_calendar": ("arrival_id", "start_date", "end_date"),
+    "google_travel_explore": ("time_period",),
+}
+
+
+class SearchAPIRequest(DeferredModel):
+    """One SearchAPI engine call made through `call_searchapi` instead of raw `http_request`."""
+
+    engine: SearchEngine
+    departure_id: str = Field(..., min_length=3)
+    arrival_id: str | None = Field(default=None, min_length=3)
+    outbound_date: date | None = None
+    return_date: date | None = None
+    start_date: date | None = None
+    end_date: date | None = None
+    time_period: str | None = Field(default=None, min_length=3)
+    interests: list[str] = Field(default_factory=list)
+    adults: PositiveInt = 1
+    travel_class: Literal["economy", "premium_economy", "business", "first"] = "economy"
+    stops: Literal["any", "nonstop"] = "any"
+    max_price: PositiveInt | None = None
+    included_airlines: list[str] | None = None
+    max_results: PositiveInt = Field(10, le=24)
+
+    @model_validator(mode="after")
+    def require_engine_fields(self) -> SearchAPIRequest:
+        missing = [name for name in _ENGINE_FIELDS[self.engine] if getattr(self, name) is None]
+        if missing:
+            raise ValueError(f"engine={self.engine} requires {', '.join(missing)}")
+        if self.included_airlines is not None and self.engine == "google_travel_explore":
+            raise ValueError(
+                "included_airlines is not supported for google_travel_explore, which always "
+                "searches Star Alliance"
+            )
+        if self.start_date and self.end_date:
+            if self.start_date > self.end_date:
+                raise ValueError("start_date cannot be after end_date")
+            if self.engine == "google_flights_calendar" and (
+                (self.end_date - self.start_date).days >= MAX_CALENDAR_DAYS
+            ):
+                raise ValueError(f"calendar window cannot exceed {MAX_CALENDAR_DAYS} days")
+        return self
+
+    def dates(self) -> list[date]:
+        candidates = (self.outbound_date, self.return_date, self.start_date, self.end_date)
+        return [value for value in candidates if value is not None]
+
+    def flight_request(self) -> FlightSearchRequest:
+        """google_flights, or the google_flights_calendar grid over start_date..end_date."""
+
+        fields: dict[str, Any] = {
+            "departure_id": self.departure_id,
+            "arrival_id": self.arrival_id,
+            "return_date": self.return_date,
+            "adults": self.adults,
+            "travel_class": self.travel_class,
+            "stops": self.stops,
+            "max_price": self.max_price,
+        }
+        if self.included_airlines is not None:
+            fields["included_airlines"] = self.included_airlines
+        if self.engine == "google_flights":
+            return FlightSearchRequest(outbound_date=self.outbound_date, **fields)
+        return FlightSearchRequest(
+            outbound_date=self.start_date,
+            calendar_window=CalendarWindow(start_date=self.start_date, end_date=self.end_date),
+            calendar_limit=(self.end_date - self.start_date).days + 1,
+            **fields,
+        )
+
+    def scout_request(self) -> DestinationScoutRequest:
+        return DestinationScoutRequest(
+            departure_id=self.departure_id,
+            time_window=TimeWindow(
+                token=self.time_period, start_date=self.start_date, end_date=self.end_date
+            ),
+            adults=self.adults,
+            interests=self.interests,
+            arrival_ids=[self.arrival_id] if self.arrival_id else [],
+            max_cards=self.max_results,
+            # Weather is a separate call_weather_snapshot call, as it was with http_request.
+            include_weather=False,
+        )
+
 
+@tool
+async def call_searchapi(request: dict[str, Any], agent: Agent | None = None) -> dict[str, Any]:
+    """
+    Query a SearchAPI engine with typed parameters instead of a raw http_request.
+
+    Calls go through the same caches, circuit breaker and retry budget as the delegate tools,
+    and identical calls in flight at the same time share one upstream request.
+
+    Args:
+        request: {engine (google_flights|google_flights_calendar|google_travel_explore),
+            departure_id, plus per engine: google_flights -> arrival_id, outbound_date, optional
+            return_date; google_flights_calendar -> arrival_id, start_date, end_date (max 60
+            days); google_travel_explore -> time_period token, optional start_date/end_date,
+            arrival_id, interests. Optional for all: adults, travel_class, stops, max_price,
+            max_results; for the flights engines also included_airlines (codes added to the
+            Lufthansa Group carriers)}.
+    Returns:
+        Dict with status=success and the same compact digest as call_flight_search or
+        call_destination_scout, including a `handle` for get_tool_result_details.
+    """
+
+    try:
+        parsed = SearchAPIRequest.model_validate(request)
+    except ValidationError as exc:
+        return _error(f"Invalid SearchAPIRequest: {exc}")
+
+    if any(value < date.today() for value in parsed.dates()):
+        return _error(
+            "Dates are in the past. Call the `current_time` tool and normalise the request to "
+            "future dates."
+        )
+
+    reused = _recall(agent, "call_searchapi", parsed)
+    if reused is not None:
+        return reused
+
+    key = parsed.model_dump_json()
+    if parsed.engine == "google_travel_explore":
+        scout = parsed.scout_request()
+        try:
+            cards: DestinationScoutResponse = await _run_blocking(
+                _searchapi_calls.run, key, _get_destination_service().generate_cards, scout
+            )
+        except DestinationScoutError as exc:
+            return _upstream_error("SearchAPI", exc)
+        handle = _tool_results.put(session_key(agent), "cards", cards.model_dump(mode="json"))
+        digest = digest_destination_response(cards, handle=handle, budget=_digest_budget())
+        partial = bool(cards.search_metadata.get("skipped"))
+    else:
+        flight_request = parsed.flight_request()
+        if parsed.engine == "google_flights_calendar":
+            # Only the calendar grid: no paid google_flights search for its first day.
+            call, args = _get_flight_service().search_calendar, (flight_request,)
+        else:
+            call, args = _search_flights, (agent, flight_request)
+        try:
+            flights: FlightSearchResponse = await _run_blocking(
+                _searchapi_calls.run, key, call, *args
+            )
+        except FlightSearchError as exc:
+            return _upstream_error("SearchAPI", exc)
+        if flights.flights:
+            _get_offer_store(agent).ingest(flight_request, flights)
+        handle = _tool_results.put(session_key(agent), "flights", flights.model_dump(mode="json"))
+        digest = digest_flight_response(
+            flights, handle=handle, budget=_digest_budget(), currency=flight_request.currency
+        )
+        partial = bool(flights.metadata.get("skipped"))
+    result = {"status": "success", "data": {"engine": parsed.engine, **digest}}
+    return _remember(agent, "call_searchapi", parsed, result, partial=partial)
+
+
+class DetailsRequest(DeferredModel):
+    handle: str
+    item: PositiveInt | None = None
+    section: str | None = None
 
-class WeatherRequest(BaseModel):
+
+@tool
+def get_tool_result_details(request: dict[str, Any], agent: Agent | None = None) -> dict[str, Any]:
+    """
+    Fetch the full data behind a compacted call_flight_search, call_destination_scout,
+    query_flight_offers or call_trip_window_finder result.
+
+    Only call this when the digest lacks a field the traveller asked about.
+
+    Args:
+        request: {handle, optional item (1-based position in the digest's itineraries, cards or
+            offers), optional section (e.g. flights, calendar, metadata, search_metadata)}.
+    Returns:
+        Dict with status=success and the requested raw data.
+    """
+
+    try:
+        parsed = DetailsRequest.model_validate(request)
+    except ValidationError as exc:
+        return _error(f"Invalid DetailsRequest: {exc}")
+
+    payload = _tool_results.get(session_key(agent), parsed.handle)
+    if payload is None:
+        return _error(f"Unknown or expired handle {parsed.handle}; repeat the original tool call.")
+    if parsed.item is not None:
+        items = result_items(payload)
+        if parsed.item > len(items):
+            return _error(f"Item {parsed.item} is out of range; the result holds {len(items)}.")
+        details = items[parsed.item - 1]
+    elif parsed.section is not None:
+        if parsed.section not in payload:
+            return _error(f"Unknown section {parsed.section}; choose from {sorted(payload)}.")
+        details = payload[parsed.section]
+    else:
+        details = payload
+    return {"status": "success", "data": {"handle": parsed.handle, "details": details}}
+
+
+class WeatherRequest(DeferredModel):
     latitude: float
     longitude: float
     start_date: date
@@ -123,14 +653,17 @@ class WeatherRequest(BaseModel):
 
 
 @tool
-def call_weather_snapshot(request: dict[str, Any]) -> dict[str, Any]:
+async def call_weather_snapshot(
+    request: dict[str, Any], agent: Agent | None = None
+) -> dict[str, Any]:
     """
     Fetch a weather snapshot for the supplied coordinates and trip window using Open-Meteo.
 
     Args:
         request: {latitude, longitude, start_date, end_date}.
     Returns:
-        {status, data: {summary, raw}} where summary is a concise weather string.
+        {status, data: {summary, raw}} where summary is a concise weather string; reused=true
+        marks a repeat of an identical recent call.
     """
 
     try:
@@ -142,18 +675,37 @@ def call_weather_snapshot(request: dict[str, Any]) -> dict[str, Any]:
     if parsed.start_date > horizon or parsed.end_date > horizon:
         return _error("Open-Meteo only provides forecasts up to ~16 days ahead.")
 
+    reused = _recall(agent, "call_weather_snapshot", parsed)
+    if reused is not None:
+        return reused
+
     try:
-        payload = fetch_weather_snapshot(
+        payload = await _run_blocking(
+            fetch_weather_snapshot,
             latitude=parsed.latitude,
             longitude=parsed.longitude,
             start_date=parsed.start_date,
             end_date=parsed.end_date,
         )
+    except DestinationScoutError as exc:
+        return _upstream_error("Open-Meteo", exc)
     except Exception as exc:  # pragma: no cover - network errors
         return _error(f"Open-Meteo lookup failed: {exc}")
 
     summary = summarise_weather(payload) or "Weather snapshot unavailable"
-    return {"status": "success", "data": {"summary": summary, "payload": payload}}
-
-
-__all__ = ["call_destination_scout", "call_flight_search", "call_weather_snapshot"]
+    result = {"status": "success", "data": {"summary": summary, "payload": payload}}
+    return _remember(agent, "call_weather_snapshot", parsed, result)
+
+
+__all__ = [
+    "call_destination_scout",
+    "call_flight_search",
+    "call_price_insights",
+    "call_price_lookup",
+    "call_searchapi",
+    "call_trip_window_finder",
+    "call_weather_snapshot",
+    "get_tool_result_details",
+    "query_flight_offers",
+    "reset_session_stores",
+]
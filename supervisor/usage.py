@@ -0,0 +1,46 @@
+"""Per-turn token accounting for the supervisor agent, including Bedrock prompt-cache hits."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from strands.hooks import AfterInvocationEvent, HookProvider, HookRegistry
+
+logger = logging.getLogger(__name__)
+
+_USAGE_KEYS = {
+    "input_tokens": "inputTokens",
+    "output_tokens": "outputTokens",
+    "cache_read_tokens": "cacheReadInputTokens",
+    "cache_write_tokens": "cacheWriteInputTokens",
+}
+
+
+class TurnUsage(HookProvider):
+    """Logs each turn's token usage and keeps the latest figures on `last`.
+
+    A warm prompt cache shows up as `cache_read_tokens` close to the size of the static system
+    prompt plus tool specs, with `input_tokens` covering only the conversation tail.
+    """
+
+    def __init__(self) -> None:
+        self.last: dict[str, int] | None = None
+
+    def register_hooks(self, registry: HookRegistry, **_kwargs: Any) -> None:
+        registry.add_callback(AfterInvocationEvent, self._record)
+
+    def _record(self, event: AfterInvocationEvent) -> None:
+        metrics = event.result.metrics if event.result else event.agent.event_loop_metrics
+        invocation = metrics.latest_agent_invocation
+        if invocation is None:
+            return
+        usage = invocation.usage
+        self.last = {name: int(usage.get(key, 0)) for name, key in _USAGE_KEYS.items()}
+        logger.info(
+            "Supervisor turn tokens: input=%d output=%d cache_read=%d cache_write=%d",
+            *self.last.values(),
+        )
+
+
+__all__ = ["TurnUsage"]
@@ -5,9 +5,7 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import Any, Iterable
 
-import httpx
-
-from config.settings import get_settings
+from shared.registry import get_registry
 
 
 def fetch_weather_snapshot(
@@ -17,28 +15,13 @@ def fetch_weather_snapshot(
     start_date: date,
     end_date: date,
 ) -> dict[str, Any]:
-    """Call Open-Meteo daily forecast."""
+    """Call Open-Meteo daily forecast through the shared registry client.
+
+    Raises DestinationScoutError when the call fails or is skipped (open circuit, deadline).
+    """
 
-    settings = get_settings()
-    params = {
-        "latitude": latitude,
-        "longitude": longitude,
-        "start_date": start_date.isoformat(),
-        "end_date": end_date.isoformat(),
-        "daily": ",".join(
-            [
-                "temperature_2m_max",
-                "temperature_2m_min",
-                "precipitation_probability_max",
-                "wind_speed_10m_max",
-            ]
-        ),
-        "timezone": settings.default_timezone,
-    }
-    with httpx.Client(timeout=15) as client:
-        response = client.get(str(settings.open_meteo_endpoint), params=params)
-        response.raise_for_status()
-        return response.json()
+    client = get_registry().open_meteo_client()
+    return client.fetch_daily(latitude, longitude, start_date=start_date, end_date=end_date)
 
 
 def summarise_weather(payload: dict[str, Any]) -> str | None:
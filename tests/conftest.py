@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 import warnings
+from collections.abc import Iterator
 
 import pytest
 
+from shared.latency import reset_latency_trackers
+from shared.registry import reset_registry
+from shared.resilience import reset_upstreams
+from supervisor.tools import reset_session_stores
+
 warnings.filterwarnings(
     "ignore",
     message="These events have been moved to production",
@@ -12,8 +18,48 @@ warnings.filterwarnings(
 )
 
 
+class FakeClock:
+    """Stand-in for `time.time`/`time.monotonic` that only moves when a test sets `now`."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """A fake clock starting at 0 for components that take a `clock` callable."""
+
+    return FakeClock()
+
+
 @pytest.fixture(autouse=True)
 def _env(monkeypatch: pytest.MonkeyPatch) -> None:
     """Ensure required env vars exist during tests."""
 
     monkeypatch.setenv("SEARCHAPI_KEY", "test-searchapi-key")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_upstreams() -> None:
+    """Give every test closed circuit breakers, a full retry budget and no latency history."""
+
+    reset_upstreams()
+    reset_latency_trackers()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry() -> Iterator[None]:
+    """Drop registry instances (and test overrides) after every test."""
+
+    yield
+    reset_registry()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_sessions() -> None:
+    """Start every test without memoised tool calls or stored offers/results."""
+
+    reset_session_stores()
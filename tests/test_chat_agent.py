@@ -8,6 +8,8 @@ from scripts import chat_agent
 def test_parse_args_defaults_to_none() -> None:
     args = chat_agent.parse_args([])
     assert args.persona is None
+    assert args.stream is True
+    assert chat_agent.parse_args(["--no-stream"]).stream is False
 
 
 class DummyAgent:
@@ -22,19 +24,22 @@ class DummyAgent:
 def test_build_agent_seeds_persona(monkeypatch) -> None:
     dummy = DummyAgent()
 
-    def fake_builder():
+    def fake_builder(persona=None):
+        dummy.built_for = persona
         return dummy
 
     monkeypatch.setattr(chat_agent, "build_supervisor_agent", fake_builder)
 
     agent = chat_agent.build_agent("Gina")
     assert agent.persona == "gina"
+    assert agent.built_for == "Gina"
 
 
 def test_build_agent_handles_missing_persona(monkeypatch) -> None:
     dummy = DummyAgent()
 
-    def fake_builder():
+    def fake_builder(persona=None):
+        dummy.built_for = persona
         return dummy
 
     monkeypatch.setattr(chat_agent, "build_supervisor_agent", fake_builder)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+
+from flight_search.price_oracle import PriceQuote
+from flight_search.service import FlightSearchResponse
+from shared.registry import get_registry
+from supervisor import tools as supervisor_tools
+from supervisor.compaction import DigestBudget, digest_flight_response, estimate_tokens
+
+
+def _itinerary(number: int) -> dict[str, object]:
+    return {
+        "price": f"€{300 + number}",
+        "total_duration": "8h 55m",
+        "carbon_emissions": {"this_flight": 512000},
+        "flights": [
+            {
+                "flight_number": f"LH {400 + number}",
+                "departure_airport": {"id": "FRA", "name": "Frankfurt", "time": "2099-03-01 10:00"},
+                "arrival_airport": {
+                    "id": "JFK",
+                    "name": "John F. Kennedy",
+                    "time": "2099-03-01 12:55",
+                },
+                "airplane": "Boeing 747-8",
+                "extensions": ["Average legroom (31 in)", "In-seat USB outlet"],
+                "ticket_also_sold_by": ["United"] * 20,
+            }
+        ],
+        "booking_token": "x" * 400,
+    }
+
+
+def _response(count: int) -> FlightSearchResponse:
+    return FlightSearchResponse(
+        flights={"best_flights": [_itinerary(n) for n in range(count)]},
+        calendar={
+            "calendar": [
+                {"departure": "2099-03-01", "price": "€320"},
+                {"departure": "2099-03-02", "price": "€280"},
+                {"departure": "2099-03-03", "price": "€350"},
+            ]
+        },
+        metadata={"price_hint": {"amount": 300.0, "currency": "EUR"}, "search_scope": "lh_group"},
+    )
+
+
+def test_flight_digest_keeps_reply_fields_and_drops_raw_payload() -> None:
+    response = _response(3)
+
+    digest = digest_flight_response(response, handle="flights-abc", budget=DigestBudget())
+
+    first = digest["itineraries"][0]
+    assert first["price"] == 300.0 and first["stops"] == 0
+    assert first["segments"][0] == {
+        "flight": "LH400",
+        "from": "FRA",
+        "to": "JFK",
+        "departs": "2099-03-01 10:00",
+        "arrives": "2099-03-01 12:55",
+        "aircraft": "Boeing 747-8",
+    }
+    assert "booking_token" not in str(digest)
+    assert digest["calendar"]["cheapest_days"][0] == {"date": "2099-03-02", "price": 280.0}
+    assert estimate_tokens(digest) < estimate_tokens(response.model_dump()) / 2
+
+
+def test_flight_digest_trims_trailing_itineraries_to_fit_budget() -> None:
+    budget = DigestBudget(max_tokens=400, top_n=10)
+
+    digest = digest_flight_response(_response(12), handle="flights-abc", budget=budget)
+
+    assert digest["total_itineraries"] == 12
+    assert 1 <= len(digest["itineraries"]) < 10
+    assert digest["omitted_for_budget"] == 10 - len(digest["itineraries"])
+    assert estimate_tokens(digest) <= budget.max_tokens
+    assert digest == digest_flight_response(_response(12), handle="flights-abc", budget=budget)
+
+
+def test_details_tool_returns_full_itinerary_behind_handle(monkeypatch) -> None:
+    class Service:
+        def search(self, _request):
+            return _response(2)
+
+    get_registry().override("flight_service", Service())
+    monkeypatch.setattr(supervisor_tools, "_tool_results", supervisor_tools.ToolResultStore())
+
+    result = asyncio.run(
+        supervisor_tools.call_flight_search(
+            {"departure_id": "FRA", "arrival_id": "JFK", "outbound_date": "2099-03-01"}
+        )
+    )
+    handle = result["data"]["handle"]
+    details = supervisor_tools.get_tool_result_details({"handle": handle, "item": 2})
+    missing = supervisor_tools.get_tool_result_details({"handle": "flights-unknown"})
+
+    assert details["data"]["details"]["booking_token"] == "x" * 400
+    assert details["data"]["details"]["flights"][0]["flight_number"] == "LH 401"
+    assert missing["status"] == "error"
+
+
+def test_flight_digest_carries_the_search_currency() -> None:
+    digest = digest_flight_response(
+        _response(1), handle="flights-abc", budget=DigestBudget(), currency="CHF"
+    )
+
+    assert digest["itineraries"][0]["currency"] == "CHF"
+    assert digest["calendar"]["currency"] == "CHF"
+
+
+def test_memo_hit_is_dropped_once_its_handle_is_evicted(monkeypatch) -> None:
+    searches: list[object] = []
+
+    class Service:
+        def search(self, request):
+            searches.append(request)
+            return _response(2)
+
+    get_registry().override("flight_service", Service())
+    store = supervisor_tools.ToolResultStore(max_entries=1)
+    monkeypatch.setattr(supervisor_tools, "_tool_results", store)
+    request = {"departure_id": "FRA", "arrival_id": "JFK", "outbound_date": "2099-03-01"}
+
+    asyncio.run(supervisor_tools.call_flight_search(request))
+    store.put("default", "cards", {"cards": []})
+    repeat = asyncio.run(supervisor_tools.call_flight_search(request))
+    details = supervisor_tools.get_tool_result_details({"handle": repeat["data"]["handle"]})
+
+    assert "reused" not in repeat
+    assert len(searches) == 2
+    assert details["status"] == "success"
+
+
+def test_price_lookup_itineraries_come_back_as_a_digest(monkeypatch) -> None:
+    class Service:
+        def quote_price(self, request):
+            return PriceQuote(
+                price=300.0,
+                currency=request.currency,
+                outbound_date=request.outbound_date,
+                source="flights",
+                fallback_reason="itineraries_requested",
+                offers=_response(2).model_dump(),
+            )
+
+    get_registry().override("flight_service", Service())
+    monkeypatch.setattr(supervisor_tools, "_tool_results", supervisor_tools.ToolResultStore())
+
+    result = supervisor_tools.call_price_lookup(
+        {
+            "departure_id": "FRA",
+            "arrival_id": "JFK",
+            "outbound_date": "2099-03-01",
+            "currency": "USD",
+            "need_itineraries": True,
+        }
+    )
+    offers = result["data"]["offers"]
+    details = supervisor_tools.get_tool_result_details({"handle": offers["handle"], "item": 1})
+
+    assert offers["total_itineraries"] == 2
+    assert offers["itineraries"][0]["currency"] == "USD"
+    assert "booking_token" not in str(offers)
+    assert details["data"]["details"]["booking_token"] == "x" * 400
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from typing import Any
+
+from supervisor.conversation import (
+    SUMMARY_STATE_KEY,
+    DigestingConversationManager,
+    compact_tool_results,
+)
+
+
+class State(dict):
+    def set(self, key: str, value: Any) -> None:
+        self[key] = value
+
+
+def _turn(number: int) -> list[dict[str, Any]]:
+    tool_id = f"t{number}"
+    result = {
+        "status": "success",
+        "data": {
+            "handle": f"flights-{number:04d}",
+            "total_itineraries": 12,
+            "itineraries": [{"price": 300 + i, "segments": ["x" * 80]} for i in range(10)],
+        },
+    }
+    return [
+        {"role": "user", "content": [{"text": f"Flights FRA to LIS, option {number}"}]},
+        {
+            "role": "assistant",
+            "content": [{"toolUse": {"toolUseId": tool_id, "name": "call_flight_search"}}],
+        },
+        {
+            "role": "user",
+            "content": [
+                {
+                    "toolResult": {
+                        "toolUseId": tool_id,
+                        "status": "success",
+                        "content": [{"text": json.dumps(result)}],
+                    }
+                }
+            ],
+        },
+        {"role": "assistant", "content": [{"text": f"Here are flights for option {number}."}]},
+    ]
+
+
+def _size(messages: list[dict[str, Any]]) -> int:
+    return len(json.dumps(messages))
+
+
+def test_old_tool_results_keep_only_status_and_handle() -> None:
+    messages = _turn(1) + _turn(2) + _turn(3)
+
+    changed = compact_tool_results(messages, raw_turns=2, max_chars=400)
+
+    old = messages[2]["content"][0]["toolResult"]["content"][0]["text"]
+    recent = messages[6]["content"][0]["toolResult"]["content"][0]["text"]
+    assert changed == 1
+    assert old.startswith("[compacted] ")
+    assert json.loads(old.removeprefix("[compacted] "))["handle"] == "flights-0001"
+    assert "itineraries" in json.loads(recent)["data"]
+    assert compact_tool_results(messages, raw_turns=2, max_chars=400) == 0
+
+
+def test_history_stays_bounded_and_fills_session_summary() -> None:
+    manager = DigestingConversationManager(window_size=8)
+    agent = SimpleNamespace(messages=[], state=State())
+    sizes = []
+
+    for number in range(1, 31):
+        agent.messages.extend(_turn(number))
+        manager.apply_management(agent)
+        sizes.append(_size(agent.messages))
+
+    summary = agent.state[SUMMARY_STATE_KEY]
+    assert len(agent.messages) <= 8
+    assert max(sizes[10:]) <= max(sizes[:10]) + manager.summary_chars * 2
+    assert "option 22" in summary and "flights-0022" in summary
+    assert len(summary) <= manager.summary_chars
+    assert agent.messages[0]["content"][0]["text"].startswith("[Earlier in this session] ")
+    assert agent.messages[0]["role"] == "user"
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+from destination_scout.service import (
+    DestinationScoutRequest,
+    DestinationScoutService,
+    OpenMeteoClient,
+    TimeWindow,
+)
+from destination_scout.service import SearchAPIClient as ExploreClient
+from flight_search.service import (
+    CalendarWindow,
+    FlightSearchError,
+    FlightSearchRequest,
+    FlightSearchService,
+    SearchAPIClient,
+)
+from shared import deadline
+from shared.deadline import deadline_scope
+from shared.resilience import DeadlineExceededError, RetryPolicy, Upstream
+
+
+def test_nested_scope_never_extends_outer_deadline() -> None:
+    assert deadline.remaining() is None
+    with deadline_scope(1.0):
+        with deadline_scope(60.0):
+            assert deadline.remaining() <= 1.0
+            assert deadline.clamp_timeout(20.0) <= 1.0
+        assert not deadline.has_time_for(5.0)
+    assert deadline.remaining() is None
+
+
+def test_upstream_refuses_calls_after_deadline() -> None:
+    upstream = Upstream("searchapi", sleep=lambda _: None)
+
+    with deadline_scope(0.0), pytest.raises(DeadlineExceededError):
+        upstream.send(lambda: httpx.Response(200))
+
+
+def test_upstream_stops_retrying_when_backoff_would_overrun_deadline() -> None:
+    calls: list[int] = []
+    upstream = Upstream(
+        "searchapi",
+        policy=RetryPolicy(max_attempts=3, base_delay=5.0, max_delay=5.0),
+        sleep=lambda _: None,
+    )
+
+    def do_request() -> httpx.Response:
+        calls.append(1)
+        return httpx.Response(503, headers={"Retry-After": "2"})
+
+    with deadline_scope(1.0):
+        response = upstream.send(do_request)
+
+    assert response.status_code == 503
+    assert calls == [1]
+
+
+def _flight_client() -> SearchAPIClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["engine"] == "google_flights_calendar":
+            raise AssertionError("calendar must be skipped")
+        return httpx.Response(200, json={"best_flights": [{"price": "€300"}]})
+
+    return SearchAPIClient(
+        base_url="https://example.com/search",
+        api_key="token",
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def test_flight_search_skips_calendar_when_time_is_short(monkeypatch) -> None:
+    monkeypatch.setattr("flight_search.service.CALENDAR_MIN_SECONDS", 30.0)
+    service = FlightSearchService(_flight_client())
+    request = FlightSearchRequest(
+        departure_id="FRA",
+        arrival_id="JFK",
+        outbound_date=date(2099, 3, 1),
+        calendar_window=CalendarWindow(start_date=date(2099, 3, 1), end_date=date(2099, 3, 10)),
+    )
+
+    with deadline_scope(10.0):
+        response = service.search(request)
+
+    assert response.calendar is None
+    assert response.metadata["skipped"] == ["calendar"]
+    assert service._cache.lookup(request) is None
+
+
+def test_flight_search_fails_fast_once_deadline_passed() -> None:
+    service = FlightSearchService(_flight_client())
+
+    with deadline_scope(0.0), pytest.raises(FlightSearchError, match="deadline"):
+        service.search(
+            FlightSearchRequest(
+                departure_id="FRA", arrival_id="JFK", outbound_date=date(2099, 3, 1)
+            )
+        )
+
+
+def test_destination_scout_reports_skipped_weather(monkeypatch) -> None:
+    monkeypatch.setattr("destination_scout.service.WEATHER_MIN_SECONDS", 30.0)
+    explore_payload = {
+        "explore_results": [
+            {"destination": "Lisbon", "iata_code": "LIS", "coordinates": [38.7, -9.1]}
+        ]
+    }
+
+    def weather_handler(_request: httpx.Request) -> httpx.Response:
+        raise AssertionError("weather must be skipped")
+
+    service = DestinationScoutService(
+        ExploreClient(
+            base_url="https://example.com/search",
+            api_key="token",
+            transport=httpx.MockTransport(lambda _: httpx.Response(200, json=explore_payload)),
+        ),
+        OpenMeteoClient(
+            base_url="https://weather.example.com",
+            transport=httpx.MockTransport(weather_handler),
+        ),
+        pacing_delay=0.0,
+    )
+    start = date.today() + timedelta(days=1)
+    request = DestinationScoutRequest(
+        departure_id="FRA",
+        time_window=TimeWindow(token="next_week", start_date=start, end_date=start),
+    )
+
+    with deadline_scope(10.0):
+        response = service.generate_cards(request)
+
+    assert response.cards[0].weather is None
+    assert response.search_metadata["skipped"] == ["weather"]
@@ -86,6 +86,8 @@ def test_generate_cards_includes_weather_snapshot() -> None:
     assert card.weather is not None
     assert "°C" in card.weather.headline
     assert "open-meteo" in card.sources
+    assert card.coordinates is not None and card.coordinates.latitude == 38.7167
+    assert card.forecast is not None and card.forecast.temperature_2m_max == [22.1]
 
 
 def test_generate_cards_gracefully_handles_weather_failure() -> None:
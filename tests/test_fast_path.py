@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from destination_scout.service import DestinationCard, DestinationScoutResponse
+from flight_search.service import FlightSearchError, FlightSearchResponse
+from shared.registry import get_registry
+from supervisor import fast_path, streaming
+from supervisor.fast_path import StructuredRequest, choose_route, itinerary_completeness
+
+MANIFEST = Path(__file__).resolve().parent.parent / "config" / "supervisor.strands.json"
+START = date.today() + timedelta(days=30)
+END = START + timedelta(days=5)
+
+
+def _request(**fields: Any) -> StructuredRequest:
+    return StructuredRequest(persona="Paula", **fields)
+
+
+class FakeAgentState(dict):
+    def set(self, key: str, value: Any) -> None:
+        self[key] = value
+
+
+class FakeAgent:
+    def __init__(self) -> None:
+        self.state = FakeAgentState()
+        self.messages: list[Any] = []
+
+    def __call__(self, message: str) -> str:
+        self.messages.append(message)
+        return "Which city would you like to fly to?"
+
+
+@pytest.fixture
+def agents(monkeypatch: pytest.MonkeyPatch) -> list[FakeAgent]:
+    built: list[FakeAgent] = []
+
+    def factory(_persona: str | None) -> FakeAgent:
+        built.append(FakeAgent())
+        return built[-1]
+
+    monkeypatch.setattr(streaming, "_sessions", streaming.AgentSessions(factory))
+    return built
+
+
+class FakeFlights:
+    def __init__(self, error: Exception | None = None) -> None:
+        self.requests = []
+        self._error = error
+
+    def search(self, request):
+        self.requests.append(request)
+        if self._error:
+            raise self._error
+        return FlightSearchResponse(
+            flights={
+                "best_flights": [
+                    {"itinerary": "LH1172", "price": "€320", "total_duration": "03h", "stops": 0}
+                ]
+            }
+        )
+
+
+def test_threshold_matches_manifest_policy() -> None:
+    policy = json.loads(MANIFEST.read_text(encoding="utf-8"))["policies"]["itinerary_completeness"]
+
+    assert fast_path.COMPLETENESS_THRESHOLD == policy["threshold"]
+
+
+@pytest.mark.parametrize(
+    ("fields", "score", "route"),
+    [
+        (
+            {
+                "departure_id": "FRA",
+                "arrival_id": "LIS",
+                "outbound_date": START,
+                "return_date": END,
+            },
+            0.8,
+            "flights",
+        ),
+        ({"departure_id": "FRA", "arrival_id": "LIS", "outbound_date": START}, 0.6, "agent"),
+        (
+            {
+                "departure_id": "FRA",
+                "arrival_id": "LIS",
+                "outbound_date": START,
+                "travel_class": "business",
+            },
+            0.8,
+            "agent",
+        ),
+        (
+            {"departure_id": "FRA", "arrival_id": "LIS", "outbound_date": START, "one_way": True},
+            0.8,
+            "flights",
+        ),
+        (
+            {"departure_id": "FRA", "time_window": {"token": "long_weekend_in_may"}},
+            0.2,
+            "destinations",
+        ),
+        (
+            {
+                "departure_id": "FRA",
+                "arrival_id": "LIS",
+                "outbound_date": date.today() - timedelta(days=1),
+                "return_date": END,
+                "travel_class": "business",
+            },
+            1.0,
+            "agent",
+        ),
+        ({}, 0.0, "agent"),
+    ],
+)
+def test_completeness_and_route(fields: dict[str, Any], score: float, route: str) -> None:
+    request = _request(**fields)
+
+    assert itinerary_completeness(request) == score
+    assert choose_route(request) == route
+
+
+def test_complete_itinerary_is_answered_without_the_agent(agents: list[FakeAgent]) -> None:
+    flights = FakeFlights()
+    get_registry().override("flight_service", flights)
+
+    response = fast_path.lambda_handler(
+        {
+            "persona": "Paula",
+            "departure_id": "FRA",
+            "arrival_id": "LIS",
+            "outbound_date": START.isoformat(),
+            "return_date": END.isoformat(),
+            "travel_class": "business",
+        }
+    )
+
+    assert response["route"] == "flights"
+    assert "LH1172" in response["reply"]
+    assert response["reply"].startswith("Hi, I am Paula.")
+    assert flights.requests[0].travel_class == "business"
+    assert response["session_id"]
+    assert agents == []
+
+
+def test_fast_path_turn_is_part_of_the_agent_history(agents: list[FakeAgent]) -> None:
+    get_registry().override("flight_service", FakeFlights())
+
+    first = fast_path.answer(
+        _request(departure_id="FRA", arrival_id="LIS", outbound_date=START, one_way=True)
+    )
+    follow_up = fast_path.answer(
+        _request(message="Any later flights?", session_id=first.session_id)
+    )
+
+    assert first.route == "flights" and agents[0].messages[0]["role"] == "user"
+    assert agents[0].messages[1] == {"role": "assistant", "content": [{"text": first.reply}]}
+    assert agents[0].messages[2:] == ["Any later flights?"]
+    assert follow_up.session_id == first.session_id
+
+
+def test_structured_inspiration_request_uses_the_destination_scout(
+    agents: list[FakeAgent],
+) -> None:
+    class Scout:
+        def generate_cards(self, request):
+            assert request.interests == ["beach"]
+            return DestinationScoutResponse(
+                cards=[DestinationCard(destination="Lisbon", arrival_id="LIS", why_now="Sun.")]
+            )
+
+    get_registry().override("destination_service", Scout())
+
+    response = fast_path.answer(
+        _request(
+            departure_id="FRA",
+            time_window={"token": "long_weekend_in_may"},
+            interests=["beach"],
+        )
+    )
+
+    assert response.route == "destinations"
+    assert "**Lisbon**" in response.reply
+    assert agents == []
+
+
+def test_incomplete_request_falls_back_to_the_agent(agents: list[FakeAgent]) -> None:
+    response = fast_path.answer(_request(departure_id="FRA", outbound_date=START, session_id="abc"))
+
+    assert response.route == "agent"
+    assert response.session_id == "abc"
+    assert response.reply == "Which city would you like to fly to?"
+    assert agents[0].messages == [f"I'd like to fly from FRA, leaving {START.isoformat()}."]
+
+
+def test_upstream_failure_falls_back_to_the_agent(agents: list[FakeAgent]) -> None:
+    get_registry().override("flight_service", FakeFlights(FlightSearchError("503")))
+
+    response = fast_path.answer(
+        _request(
+            departure_id="FRA",
+            arrival_id="LIS",
+            outbound_date=START,
+            return_date=END,
+            message="Flights FRA to LIS please",
+        )
+    )
+
+    assert response.route == "agent"
+    assert agents[0].messages == ["Flights FRA to LIS please"]
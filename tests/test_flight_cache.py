@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from datetime import date
+
+import httpx
+
+from flight_search.service import FlightSearchRequest, FlightSearchService, SearchAPIClient
+
+
+def _itinerary(carrier: str, price: int, stops: int) -> dict[str, object]:
+    return {
+        "price": price,
+        "stops": stops,
+        "segments": [{"airline_code": carrier, "flight_number": "100"}] * (stops + 1),
+    }
+
+
+def _service(counter: dict[str, int]) -> FlightSearchService:
+    def handler(_request: httpx.Request) -> httpx.Response:
+        counter["calls"] += 1
+        return httpx.Response(
+            200,
+            json={
+                "best_flights": [_itinerary("LH", 420, 0), _itinerary("LX", 260, 1)],
+                "other_flights": [_itinerary("OS", 310, 0)],
+            },
+        )
+
+    client = SearchAPIClient(
+        base_url="https://example.com/search",
+        api_key="token",
+        transport=httpx.MockTransport(handler),
+    )
+    return FlightSearchService(client)
+
+
+def _request(**overrides: object) -> FlightSearchRequest:
+    payload: dict[str, object] = {
+        "departure_id": "FRA",
+        "arrival_id": "LIS",
+        "outbound_date": date(2026, 12, 1),
+    }
+    payload.update(overrides)
+    return FlightSearchRequest(**payload)
+
+
+def test_nonstop_follow_up_is_derived_from_any_stops_result() -> None:
+    counter = {"calls": 0}
+    service = _service(counter)
+    service.search(_request())
+
+    response = service.search(_request(stops="nonstop"))
+
+    assert counter["calls"] == 1
+    assert [f["price"] for f in response.flights["best_flights"]] == [420]
+    assert [f["price"] for f in response.flights["other_flights"]] == [310]
+    assert response.metadata["derived_from_cache"] is True
+    assert response.metadata["price_hint"]["amount"] == 420.0
+
+
+def test_lower_price_limit_is_derived_locally() -> None:
+    counter = {"calls": 0}
+    service = _service(counter)
+    service.search(_request(max_price=500))
+
+    response = service.search(_request(max_price=300))
+
+    assert counter["calls"] == 1
+    assert [f["price"] for f in response.flights["best_flights"]] == [260]
+
+
+def test_broader_query_goes_upstream() -> None:
+    counter = {"calls": 0}
+    service = _service(counter)
+    service.search(_request(stops="nonstop"))
+
+    response = service.search(_request())
+
+    assert counter["calls"] == 2
+    assert "derived_from_cache" not in response.metadata
+
+
+def test_identical_query_is_served_from_cache() -> None:
+    counter = {"calls": 0}
+    service = _service(counter)
+    service.search(_request())
+    response = service.search(_request())
+
+    assert counter["calls"] == 1
+    assert "derived_from_cache" not in response.metadata
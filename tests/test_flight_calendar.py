@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import httpx
+
+from flight_search.calendar import TripWindowRequest, find_cheapest_trips, parse_calendar
+from flight_search.service import FlightSearchService, SearchAPIClient
+
+
+def _one_way(start: date, prices: list[int | None]) -> dict[str, object]:
+    return {
+        "calendar": [
+            {"departure": (start + timedelta(days=i)).isoformat(), "price": price}
+            for i, price in enumerate(prices)
+            if price is not None
+        ]
+    }
+
+
+def test_parse_calendar_builds_dense_array() -> None:
+    start = date(2026, 12, 1)
+    parsed = parse_calendar(_one_way(start, [100, None, 80]))
+
+    assert parsed is not None
+    assert parsed.start == start
+    assert parsed.prices == [100.0, None, 80.0]
+
+
+def test_sliding_window_pairs_outbound_with_cheapest_return() -> None:
+    start = date(2026, 12, 1)
+    outbound = parse_calendar(_one_way(start, [100, 90, 300, 120]))
+    inbound = parse_calendar(_one_way(start + timedelta(days=2), [50, 40, 200, 10, 60, 70]))
+
+    windows = find_cheapest_trips(outbound, nights=3, flex_nights=1, inbound=inbound, top_n=2)
+
+    assert [(w.outbound_date.day, w.return_date.day, w.price) for w in windows] == [
+        (2, 6, 100.0),
+        (4, 6, 130.0),
+    ]
+
+
+def test_round_trip_grid_respects_return_weekdays() -> None:
+    payload = {
+        "calendar": [
+            {"departure": "2026-12-04", "return": "2026-12-11", "price": "€300"},
+            {"departure": "2026-12-05", "return": "2026-12-12", "price": "€250"},
+        ]
+    }
+    parsed = parse_calendar(payload)
+
+    windows = find_cheapest_trips(parsed, nights=7, return_weekdays=[4])
+
+    assert len(windows) == 1
+    assert windows[0].return_date == date(2026, 12, 11)
+
+
+def test_find_trip_windows_calls_reverse_calendar_for_one_way_grids() -> None:
+    start = date.today() + timedelta(days=30)
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        departure = request.url.params["departure_id"]
+        calls.append(departure)
+        if departure == "FRA":
+            return httpx.Response(200, json=_one_way(start, [200, 150]))
+        return httpx.Response(200, json=_one_way(start + timedelta(days=4), [90, 60, 300]))
+
+    client = SearchAPIClient(
+        base_url="https://example.com/search",
+        api_key="token",
+        transport=httpx.MockTransport(handler),
+    )
+    service = FlightSearchService(client)
+
+    response = service.find_trip_windows(
+        TripWindowRequest(
+            departure_id="FRA",
+            arrival_id="LIS",
+            start_date=start,
+            end_date=start + timedelta(days=1),
+            nights=4,
+            top_n=1,
+        )
+    )
+
+    assert calls == ["FRA", "LIS"]
+    assert response.windows[0].outbound_date == start + timedelta(days=1)
+    assert response.windows[0].price == 210.0
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from datetime import date
+
+from flight_search.offers import OfferQuery, SessionOfferStore
+from flight_search.service import FlightSearchRequest, FlightSearchResponse
+
+
+def _itinerary(code: str, price: str, departs: str, duration: int, stops: int) -> dict[str, object]:
+    carrier = code[:2]
+    return {
+        "price": price,
+        "total_duration": duration,
+        "stops": stops,
+        "segments": [
+            {
+                "airline_code": carrier,
+                "flight_number": code[2:],
+                "departure_airport": "FRA",
+                "arrival_airport": "LIS",
+                "departure_time": f"2026-12-01T{departs}:00",
+            }
+        ],
+    }
+
+
+def _store() -> SessionOfferStore:
+    request = FlightSearchRequest(
+        departure_id="FRA",
+        arrival_id="LIS",
+        outbound_date=date(2026, 12, 1),
+    )
+    response = FlightSearchResponse(
+        flights={
+            "best_flights": [
+                _itinerary("LH1172", "€320", "07:10", 190, 0),
+                _itinerary("LX1500", "€210", "13:45", 310, 1),
+            ],
+            "other_flights": [
+                _itinerary("TP571", "€180", "06:00", 180, 0),
+                _itinerary("OS201", "€450", "09:30", 400, 1),
+            ],
+        },
+        metadata={"search_scope": "star_alliance"},
+    )
+    store = SessionOfferStore()
+    store.ingest(request, response)
+    return store
+
+
+def test_query_filters_morning_departures_sorted_by_price() -> None:
+    store = _store()
+    query = OfferQuery(departure_before="10:00")
+
+    offers = store.find(query).query(query)
+
+    assert [offer.itinerary["segments"][0]["flight_number"] for offer in offers] == [
+        "571",
+        "1172",
+        "201",
+    ]
+
+
+def test_query_cheapest_nonstop_top_one() -> None:
+    store = _store()
+    query = OfferQuery(max_stops=0, limit=1)
+
+    offers = store.find(query).query(query)
+
+    assert len(offers) == 1
+    assert offers[0].carriers == ("TP",)
+    assert offers[0].price == 180.0
+
+
+def test_query_price_cap_and_carrier_filter() -> None:
+    store = _store()
+    query = OfferQuery(max_price=300, carriers=["lx", "lh"])
+
+    offers = store.find(query).query(query)
+
+    assert [offer.carriers for offer in offers] == [("LX",)]
+
+
+def test_find_returns_none_for_other_route() -> None:
+    store = _store()
+    query = OfferQuery(departure_id="MUC", arrival_id="LIS", outbound_date="2026-12-01")
+
+    assert store.find(query) is None
+
+
+def test_find_returns_none_for_partial_route_mismatch() -> None:
+    store = _store()
+
+    assert store.find(OfferQuery(arrival_id="OPO", max_price=300)) is None
+    assert store.find(OfferQuery(outbound_date="2026-12-02")) is None
+    assert store.find(OfferQuery(arrival_id="lis")) is not None
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from datetime import date, timedelta
+
+import httpx
+
+from destination_scout.service import (
+    DestinationCard,
+    DestinationScoutRequest,
+    DestinationScoutResponse,
+    TimeWindow,
+)
+from flight_search.service import FlightSearchRequest, FlightSearchService, SearchAPIClient
+from shared.registry import get_registry
+from supervisor import tools as supervisor_tools
+from supervisor.flight_prefetch import FlightPrefetcher
+
+START = date.today() + timedelta(days=20)
+END = START + timedelta(days=7)
+
+
+def _scout_request() -> DestinationScoutRequest:
+    return DestinationScoutRequest(
+        departure_id="FRA",
+        time_window=TimeWindow(token="one_week_trip_in_march", start_date=START, end_date=END),
+    )
+
+
+def _cards(*arrivals: str) -> list[DestinationCard]:
+    return [DestinationCard(destination=code, arrival_id=code, why_now="Now.") for code in arrivals]
+
+
+def _flight_request(arrival: str, **overrides: object) -> FlightSearchRequest:
+    return FlightSearchRequest(
+        departure_id="FRA",
+        arrival_id=arrival,
+        outbound_date=START,
+        return_date=END,
+        **overrides,
+    )
+
+
+def test_schedules_top_k_cards_within_session_cap() -> None:
+    searched: list[str] = []
+    prefetcher = FlightPrefetcher(
+        lambda request: searched.append(request.arrival_id), top_k=2, session_cap=3
+    )
+    try:
+        first = prefetcher.schedule("s1", _scout_request(), _cards("LIS", "OPO", "BCN"))
+        second = prefetcher.schedule("s1", _scout_request(), _cards("MAD", "AGP"))
+        prefetcher.settle("s1", _flight_request("MAD"), timeout=2)
+    finally:
+        prefetcher.close()
+
+    assert [request.arrival_id for request in first] == ["LIS", "OPO"]
+    assert [request.arrival_id for request in second] == ["MAD"]
+    assert "BCN" not in searched and "AGP" not in searched
+
+
+def test_real_search_waits_for_matching_prefetch_and_cancels_the_rest() -> None:
+    release = threading.Event()
+    searched: list[str] = []
+
+    def search(request: FlightSearchRequest) -> None:
+        release.wait(timeout=2)
+        searched.append(request.arrival_id)
+
+    prefetcher = FlightPrefetcher(search, top_k=3)
+    try:
+        prefetcher.schedule("s1", _scout_request(), _cards("LIS", "OPO", "BCN"))
+        # LIS occupies the single worker until settle() has cancelled the queued OPO/BCN.
+        threading.Timer(0.05, release.set).start()
+        reused = prefetcher.settle("s1", _flight_request("LIS"), timeout=2)
+    finally:
+        prefetcher.close()
+
+    assert reused
+    assert searched == ["LIS"]
+
+
+def test_prefetch_only_matches_an_identical_search() -> None:
+    prefetcher = FlightPrefetcher(lambda request: None, top_k=1)
+    different = [
+        _flight_request("LIS", travel_class="business"),
+        _flight_request("LIS", stops="nonstop"),
+        _flight_request("LIS", currency="USD"),
+        _flight_request("LIS", included_airlines=["UA"]),
+    ]
+    try:
+        reused = []
+        for request in different:
+            prefetcher.schedule("s1", _scout_request(), _cards("LIS"))
+            reused.append(prefetcher.settle("s1", request, timeout=2))
+    finally:
+        prefetcher.close()
+
+    assert reused == [False, False, False, False]
+
+
+def test_disabled_prefetcher_schedules_nothing() -> None:
+    prefetcher = FlightPrefetcher(lambda request: None)
+
+    assert prefetcher.schedule("s1", _scout_request(), _cards("LIS")) == []
+
+
+def test_follow_up_flight_search_is_served_from_prefetched_cache() -> None:
+    upstream_calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        upstream_calls.append(request.url.params["arrival_id"])
+        return httpx.Response(200, json={"best_flights": [{"price": "€210", "stops": 0}]})
+
+    class Scout:
+        def generate_cards(self, _request):
+            return DestinationScoutResponse(cards=_cards("LIS", "OPO"))
+
+    service = FlightSearchService(
+        SearchAPIClient(
+            base_url="https://example.com/search",
+            api_key="token",
+            transport=httpx.MockTransport(handler),
+        )
+    )
+    registry = get_registry()
+    registry.override("flight_service", service)
+    registry.override("destination_service", Scout())
+    registry.override("flight_prefetcher", FlightPrefetcher(service.search, top_k=1))
+
+    asyncio.run(
+        supervisor_tools.call_destination_scout(
+            {
+                "departure_id": "FRA",
+                "time_window": {
+                    "token": "one_week_trip_in_march",
+                    "start_date": START.isoformat(),
+                    "end_date": END.isoformat(),
+                },
+            }
+        )
+    )
+    result = asyncio.run(
+        supervisor_tools.call_flight_search(
+            {
+                "departure_id": "FRA",
+                "arrival_id": "LIS",
+                "outbound_date": START.isoformat(),
+                "return_date": END.isoformat(),
+            }
+        )
+    )
+
+    assert result["status"] == "success"
+    assert upstream_calls == ["LIS"]
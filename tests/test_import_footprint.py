@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _loaded(module: str, candidates: list[str]) -> list[str]:
+    code = (
+        f"import json, sys; import {module}; "
+        f"print(json.dumps([name for name in {candidates!r} if name in sys.modules]))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout)
+
+
+@pytest.mark.parametrize(
+    ("module", "forbidden"),
+    [
+        ("flight_search.handler", ["strands", "destination_scout.service", "supervisor.tools"]),
+        ("destination_scout.handler", ["strands", "flight_search.service", "supervisor.tools"]),
+        ("supervisor.handler", ["strands", "httpx", "flight_search.service"]),
+        ("supervisor.fast_path", ["strands", "supervisor.tools", "supervisor.agent"]),
+    ],
+)
+def test_handlers_import_only_their_own_path(module: str, forbidden: list[str]) -> None:
+    assert _loaded(module, forbidden) == []
+
+
+def test_persona_docs_are_read_on_first_prompt_access() -> None:
+    from shared import personas, prompts
+
+    personas.build_persona_prompt_block.cache_clear()
+
+    assert personas.build_persona_prompt_block.cache_info().currsize == 0
+    assert "PAULA INSTRUCTIONS" in prompts.build_supervisor_prompt_template("paula")
+    assert personas.PERSONA_PROMPT_BLOCK is personas.build_persona_prompt_block()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date
+
+import httpx
+import pytest
+
+from flight_search.service import FlightSearchError, FlightSearchRequest, SearchAPIClient
+from shared.latency import HedgePolicy, LatencyHistogram, LatencyTracker
+from shared.resilience import RetryBudget, RetryPolicy, Upstream
+
+
+def test_histogram_percentiles_follow_recent_samples() -> None:
+    histogram = LatencyHistogram(decay_every=1_000)
+    for _ in range(95):
+        histogram.record(0.2)
+    for _ in range(5):
+        histogram.record(4.0)
+
+    assert histogram.percentile(0.5) == pytest.approx(0.2, rel=0.2)
+    assert histogram.percentile(0.99) == pytest.approx(4.0, rel=0.2)
+
+
+def test_timeout_is_derived_from_p99_and_clamped() -> None:
+    tracker = LatencyTracker(min_samples=10, timeout_multiplier=3.0, timeout_floor=2.0)
+
+    assert tracker.timeout_for("google_flights", ceiling=20.0) == 20.0
+    for _ in range(10):
+        tracker.record("google_flights", 1.5)
+    assert tracker.timeout_for("google_flights", ceiling=20.0) == pytest.approx(4.5, rel=0.2)
+    for _ in range(10):
+        tracker.record("google_flights_calendar", 0.05)
+    assert tracker.timeout_for("google_flights_calendar", ceiling=20.0) == 2.0
+
+
+def test_hedge_returns_first_response_when_primary_is_slow() -> None:
+    release = threading.Event()
+    calls: list[int] = []
+
+    def call() -> str:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            release.wait(timeout=2)
+            return "slow"
+        return "fast"
+
+    policy = HedgePolicy()
+    try:
+        assert policy.run(call, delay=0.01) == "fast"
+    finally:
+        release.set()
+    assert len(calls) == 2
+
+
+def test_hedge_respects_budget() -> None:
+    policy = HedgePolicy(budget=RetryBudget(ratio=0.0, reserve=0.0))
+    calls: list[int] = []
+
+    def call() -> str:
+        calls.append(1)
+        time.sleep(0.05)
+        return "only"
+
+    assert policy.run(call, delay=0.001) == "only"
+    assert len(calls) == 1
+
+
+def test_hedge_reraises_when_both_attempts_fail() -> None:
+    def call() -> str:
+        time.sleep(0.02)
+        raise httpx.ConnectError("down")
+
+    with pytest.raises(httpx.ConnectError):
+        HedgePolicy().run(call, delay=0.001)
+
+
+def test_client_records_engine_latency() -> None:
+    tracker = LatencyTracker(min_samples=1)
+    client = SearchAPIClient(
+        base_url="https://example.com/search",
+        api_key="token",
+        transport=httpx.MockTransport(lambda _: httpx.Response(200, json={"best_flights": []})),
+        latency=tracker,
+    )
+
+    client.flights(
+        FlightSearchRequest(departure_id="FRA", arrival_id="JFK", outbound_date=date(2099, 3, 1))
+    )
+
+    assert tracker.percentile("google_flights", 0.5) is not None
+    assert tracker.percentile("google_flights_calendar", 0.5) is None
+
+
+def test_timeouts_widen_when_the_upstream_slows_down() -> None:
+    tracker = LatencyTracker(min_samples=10, timeout_floor=2.0)
+    for _ in range(50):
+        tracker.record("google_flights", 0.1)
+    timeouts: list[float] = []
+
+    def slow_upstream(request: httpx.Request) -> httpx.Response:
+        # The engine now needs 5 s: any attempt with a shorter read timeout is cut off.
+        timeout = request.extensions["timeout"]["read"]
+        timeouts.append(timeout)
+        if timeout < 5.0:
+            raise httpx.ReadTimeout("slow", request=request)
+        return httpx.Response(200, json={"best_flights": []})
+
+    client = SearchAPIClient(
+        base_url="https://example.com/search",
+        api_key="token",
+        transport=httpx.MockTransport(slow_upstream),
+        upstream=Upstream("searchapi", policy=RetryPolicy(max_attempts=1)),
+        latency=tracker,
+    )
+    request = FlightSearchRequest(
+        departure_id="FRA", arrival_id="JFK", outbound_date=date(2099, 3, 1)
+    )
+
+    with pytest.raises(FlightSearchError):
+        client.flights(request)
+    client.flights(request)
+
+    # The cut-off attempt counts at its timeout, so the next one waits long enough.
+    assert timeouts[0] == 2.0
+    assert timeouts[1] >= 5.0
+
+
+def test_timeout_streak_resets_after_a_response() -> None:
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record("google_flights", 0.1)
+    tracker.record_timeout("google_flights", 2.0)
+
+    widened = tracker.timeout_for("google_flights", ceiling=60.0)
+    tracker.record("google_flights", 0.1)
+
+    assert widened > tracker.timeout_for("google_flights", ceiling=60.0)
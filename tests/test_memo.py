@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from supervisor.memo import ToolMemo
+
+
+class Request(BaseModel):
+    departure_id: str
+    arrival_id: str
+
+
+def test_memo_expires_after_ttl_and_is_scoped_to_session(clock) -> None:
+    memo = ToolMemo(clock=clock)
+    request = Request(departure_id="FRA", arrival_id="JFK")
+    memo.remember("s1", "call_flight_search", request, {"status": "success", "data": {}})
+
+    clock.now = 30.0
+    assert memo.recall("s1", "call_flight_search", request, max_age=60)["reused_age_seconds"] == 30
+    assert memo.recall("s2", "call_flight_search", request, max_age=60) is None
+    assert memo.recall("s1", "call_weather_snapshot", request, max_age=60) is None
+
+    clock.now = 90.0
+    assert memo.recall("s1", "call_flight_search", request, max_age=60) is None
+    assert len(memo) == 0
+
+
+def test_memo_never_stores_errors_and_can_be_disabled() -> None:
+    memo = ToolMemo()
+    request = Request(departure_id="FRA", arrival_id="JFK")
+
+    memo.remember("s1", "call_flight_search", request, {"status": "error", "message": "down"})
+    assert memo.recall("s1", "call_flight_search", request, max_age=60) is None
+
+    memo.remember("s1", "call_flight_search", request, {"status": "success", "data": {}})
+    assert memo.recall("s1", "call_flight_search", request, max_age=0) is None
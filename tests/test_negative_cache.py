@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from datetime import date
+
+import httpx
+
+from flight_search.negative_cache import BloomFilter, NegativeRouteCache
+from flight_search.service import FlightSearchRequest, FlightSearchService, SearchAPIClient
+
+
+def test_bloom_filter_round_trips_through_bytes() -> None:
+    bloom = BloomFilter.for_capacity(100)
+    bloom.add("FRA>ZNZ")
+
+    copy = BloomFilter(bloom.size_bits, bloom.num_hashes, bloom.to_bytes())
+
+    assert "FRA>ZNZ" in copy
+    assert "FRA>LIS" not in copy
+
+
+def test_negative_cache_expires_after_ttl(clock) -> None:
+    cache = NegativeRouteCache(ttl_seconds=60, clock=clock)
+    cache.record_empty("fra", "znz")
+
+    assert cache.is_known_empty("FRA", "ZNZ")
+    clock.now += 61
+    assert not cache.is_known_empty("FRA", "ZNZ")
+
+
+def test_expired_route_stays_expired_on_repeated_lookups(clock) -> None:
+    cache = NegativeRouteCache(ttl_seconds=60, clock=clock)
+    clock.now += 30
+    cache.record_empty("FRA", "ZNZ")
+    clock.now += 61
+
+    assert not cache.is_known_empty("FRA", "ZNZ")
+    assert not cache.is_known_empty("FRA", "ZNZ")
+
+
+def test_snapshot_ships_routes_to_another_instance(tmp_path, clock) -> None:
+    source = NegativeRouteCache(ttl_seconds=60, clock=clock)
+    source.record_empty("MUC", "ZNZ")
+    path = tmp_path / "negative-routes.json"
+    source.save(path)
+
+    target = NegativeRouteCache(ttl_seconds=60, clock=clock)
+    assert target.load(path)
+    assert target.is_known_empty("MUC", "ZNZ")
+
+    clock.now += 61
+    assert not target.is_known_empty("MUC", "ZNZ")
+
+
+def test_service_skips_lh_group_query_for_known_empty_route() -> None:
+    scopes: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        airlines = request.url.params["included_airlines"]
+        scopes.append("star" if "UA" in airlines else "lh")
+        if "UA" in airlines:
+            return httpx.Response(200, json={"best_flights": [{"price": "€700"}]})
+        return httpx.Response(200, json={"best_flights": []})
+
+    client = SearchAPIClient(
+        base_url="https://example.com/search",
+        api_key="token",
+        transport=httpx.MockTransport(handler),
+    )
+    service = FlightSearchService(client)
+
+    service.search(
+        FlightSearchRequest(departure_id="FRA", arrival_id="ZNZ", outbound_date=date(2026, 12, 1))
+    )
+    response = service.search(
+        FlightSearchRequest(departure_id="FRA", arrival_id="ZNZ", outbound_date=date(2026, 12, 8))
+    )
+
+    assert scopes == ["lh", "star", "star"]
+    assert response.metadata["search_scope"] == "star_alliance"
+    assert response.metadata["negative_cache_hit"] is True
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import httpx
+
+from destination_scout.service import OpenMeteoClient
+from flight_search.service import SearchAPIClient
+from shared.prewarm import prewarm
+from shared.registry import ServiceRegistry
+
+
+def test_prewarm_builds_components_and_reuses_the_probed_connection_pool() -> None:
+    methods: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        methods.append(request.method)
+        if request.method == "HEAD":
+            return httpx.Response(401)
+        return httpx.Response(200, json={"best_flights": []})
+
+    client = SearchAPIClient(
+        base_url="https://example.com/search",
+        api_key="token",
+        transport=httpx.MockTransport(handler),
+    )
+    built: list[str] = []
+    registry = ServiceRegistry(factories={"service": lambda _registry: built.append("service")})
+    registry.override("flights_client", client)
+
+    results = prewarm(["service"], ["flights_client"], timeout=2, registry=registry)
+    pooled = client._http.client
+    client._perform_request({"engine": "google_flights"}, "google_flights")
+
+    assert results == {"build": True, "flights_client": True}
+    assert built == ["service"]
+    assert methods == ["HEAD", "GET"]
+    assert client._http.client is pooled
+    registry.shutdown()
+    assert client._http._client is None
+
+
+def test_prewarm_is_time_boxed_and_swallows_failures() -> None:
+    release = threading.Event()
+
+    class SlowClient:
+        def warm(self, *, timeout: float) -> bool:
+            release.wait(timeout=2)
+            return True
+
+    def refuse(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    registry = ServiceRegistry(factories={})
+    registry.override("slow", SlowClient())
+    registry.override(
+        "open_meteo",
+        OpenMeteoClient("https://example.com/forecast", transport=httpx.MockTransport(refuse)),
+    )
+
+    started = time.monotonic()
+    results = prewarm([], ["slow", "open_meteo"], timeout=0.1, registry=registry)
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert results == {"build": True, "slow": False, "open_meteo": False}
+    assert elapsed < 1
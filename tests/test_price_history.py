@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+import httpx
+import pytest
+
+from flight_search.calendar import CalendarPrices
+from flight_search.price_history import PriceHistoryStore, PriceInsightRequest
+from flight_search.service import (
+    FlightSearchRequest,
+    FlightSearchService,
+    SearchAPIClient,
+)
+
+DAY = 86_400.0
+
+
+@pytest.fixture
+def clock(clock):
+    """The shared fake clock, started on 2099-01-01 so recorded quotes sit before travel dates."""
+
+    clock.now = datetime(2099, 1, 1, tzinfo=timezone.utc).timestamp()
+    return clock
+
+
+def _insight(question: str, **extra) -> PriceInsightRequest:
+    route = {"departure_id": "FRA", "arrival_id": "LIS", **extra}
+    return PriceInsightRequest(question=question, **route)
+
+
+def test_cheapest_month_uses_latest_quote_per_date(tmp_path, clock) -> None:
+    store = PriceHistoryStore(tmp_path / "prices.sqlite", clock=clock)
+    store.record_calendar("FRA", "LIS", CalendarPrices(date(2099, 2, 26), [90.0, 120.0, 80.0]))
+    store.record_calendar("FRA", "LIS", CalendarPrices(date(2099, 3, 1), [150.0, 140.0]))
+    clock.now += DAY
+    store.record_calendar("FRA", "LIS", CalendarPrices(date(2099, 2, 28), [130.0]))
+
+    months = store.cheapest_months(_insight("cheapest_month"))
+
+    assert [(low.month, low.price, low.travel_date) for low in months] == [
+        ("2099-02", 90.0, date(2099, 2, 26)),
+        ("2099-03", 140.0, date(2099, 3, 2)),
+    ]
+
+
+def test_typical_price_and_trend(clock) -> None:
+    store = PriceHistoryStore(clock=clock)
+    store.record_calendar("FRA", "LIS", CalendarPrices(date(2099, 3, 1), [100.0, 200.0, 300.0]))
+    clock.now += 3 * DAY
+    store.record_calendar("FRA", "LIS", CalendarPrices(date(2099, 3, 1), [150.0, 240.0, 330.0]))
+
+    stats = store.typical_price(_insight("typical_price", month="2099-03"))
+    trend = store.price_trend(_insight("price_trend"))
+
+    assert stats is not None and stats.median == 240.0 and stats.samples == 3
+    assert trend.direction == "rising"
+    assert trend.change_pct == 20.0
+    assert store.answer(_insight("typical_price", arrival_id="JFK")) is None
+
+
+def test_trend_compares_the_same_travel_dates(clock) -> None:
+    store = PriceHistoryStore(clock=clock)
+    # Cheap far-out dates first, then pricier near dates: the daily median alone would rise.
+    store.record_calendar("FRA", "LIS", CalendarPrices(date(2099, 5, 1), [100.0, 110.0]))
+    store.record_calendar("FRA", "LIS", CalendarPrices(date(2099, 2, 1), [300.0]))
+    clock.now += 2 * DAY
+    store.record_calendar("FRA", "LIS", CalendarPrices(date(2099, 2, 1), [240.0, 260.0, 280.0]))
+
+    trend = store.price_trend(_insight("price_trend"))
+
+    assert trend.direction == "falling"
+    assert trend.change_pct == -20.0
+    assert [point.samples for point in trend.points] == [1, 1]
+
+
+def test_service_records_offers_per_adult(clock) -> None:
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"best_flights": [{"price": "€900"}, {"price": "€700"}]})
+
+    store = PriceHistoryStore(clock=clock)
+    client = SearchAPIClient(
+        base_url="https://example.com/search",
+        api_key="token",
+        transport=httpx.MockTransport(handler),
+    )
+    service = FlightSearchService(client, price_history=store)
+
+    service.search(
+        FlightSearchRequest(
+            departure_id="FRA",
+            arrival_id="LIS",
+            outbound_date=date(2099, 3, 1),
+            return_date=date(2099, 3, 8),
+            adults=2,
+        )
+    )
+
+    stats = store.typical_price(_insight("typical_price", nights=7))
+    assert stats is not None and stats.median == 350.0
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import date
+
+import httpx
+
+from flight_search.calendar import CalendarPrices
+from flight_search.price_oracle import CalendarPriceOracle, PriceLookupRequest
+from flight_search.service import (
+    CalendarWindow,
+    FlightSearchRequest,
+    FlightSearchService,
+    SearchAPIClient,
+)
+
+
+def _lookup(**extra) -> PriceLookupRequest:
+    fields = {"departure_id": "FRA", "arrival_id": "LIS", "outbound_date": date(2099, 3, 12)}
+    return PriceLookupRequest(**{**fields, **extra})
+
+
+def test_oracle_reads_one_way_and_round_trip_grids(clock) -> None:
+    oracle = CalendarPriceOracle(clock=clock)
+    oracle.remember("FRA", "LIS", CalendarPrices(date(2099, 3, 10), [90.0, None, 110.0]))
+    oracle.remember(
+        "FRA",
+        "LIS",
+        CalendarPrices(date(2099, 3, 12), [240.0], round_trips={7: [240.0]}),
+    )
+    clock.now += 30
+
+    one_way = oracle.lookup(_lookup())
+    round_trip = oracle.lookup(_lookup(return_date=date(2099, 3, 19)))
+
+    assert one_way is not None and one_way.price == 110.0 and one_way.age_seconds == 30
+    assert round_trip is not None and round_trip.price == 240.0
+    assert oracle.lookup(_lookup(return_date=date(2099, 3, 15))) is None
+    assert oracle.lookup(_lookup(outbound_date=date(2099, 3, 11))) is None
+
+
+def test_oracle_ignores_stale_grids(clock) -> None:
+    oracle = CalendarPriceOracle(clock=clock)
+    oracle.remember("FRA", "LIS", CalendarPrices(date(2099, 3, 12), [110.0]))
+    clock.now += 61 * 60
+
+    assert oracle.lookup(_lookup(max_age_minutes=60)) is None
+
+
+def test_quote_price_uses_calendar_then_falls_back_to_flights() -> None:
+    engines: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        engine = request.url.params["engine"]
+        engines.append(engine)
+        if engine == "google_flights_calendar":
+            return httpx.Response(
+                200,
+                json={"calendar": [{"departure": "2099-03-12", "price": "€120"}]},
+            )
+        return httpx.Response(200, json={"best_flights": [{"price": "€180"}]})
+
+    client = SearchAPIClient(
+        base_url="https://example.com/search",
+        api_key="token",
+        transport=httpx.MockTransport(handler),
+    )
+    service = FlightSearchService(client)
+    service.search(
+        FlightSearchRequest(
+            departure_id="FRA",
+            arrival_id="LIS",
+            outbound_date=date(2099, 3, 10),
+            calendar_window=CalendarWindow(
+                start_date=date(2099, 3, 10), end_date=date(2099, 3, 20)
+            ),
+        )
+    )
+    engines.clear()
+
+    from_calendar = service.quote_price(_lookup())
+    from_flights = service.quote_price(_lookup(outbound_date=date(2099, 3, 14)))
+
+    assert from_calendar.source == "calendar" and from_calendar.price == 120.0
+    assert from_flights.source == "flights" and from_flights.price == 180.0
+    assert from_flights.fallback_reason == "no_recent_calendar"
+    assert engines == ["google_flights"]
+
+
+def test_quote_price_ignores_grids_priced_with_narrower_filters() -> None:
+    engines: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        engine = request.url.params["engine"]
+        engines.append(engine)
+        if engine == "google_flights_calendar":
+            return httpx.Response(
+                200,
+                json={"calendar": [{"departure": "2099-03-12", "price": "€320"}]},
+            )
+        return httpx.Response(200, json={"best_flights": [{"price": "€180"}]})
+
+    client = SearchAPIClient(
+        base_url="https://example.com/search",
+        api_key="token",
+        transport=httpx.MockTransport(handler),
+    )
+    service = FlightSearchService(client)
+    window = CalendarWindow(start_date=date(2099, 3, 10), end_date=date(2099, 3, 20))
+    base = FlightSearchRequest(
+        departure_id="FRA",
+        arrival_id="LIS",
+        outbound_date=date(2099, 3, 10),
+        calendar_window=window,
+    )
+    service.search_calendar(base.model_copy(update={"stops": "nonstop"}))
+    service.search_calendar(base.model_copy(update={"included_airlines": ["TP"]}))
+    engines.clear()
+
+    quote = service.quote_price(_lookup())
+
+    assert quote.source == "flights" and quote.price == 180.0
+    assert engines == ["google_flights"]
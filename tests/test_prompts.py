@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from shared.prompts import build_supervisor_prompt_template
+
+
+def test_supervisor_prompt_carries_only_the_session_persona() -> None:
+    paula = build_supervisor_prompt_template("Paula")
+
+    assert "PAULA INSTRUCTIONS" in paula
+    assert "GINA INSTRUCTIONS" not in paula and "BIANCA INSTRUCTIONS" not in paula
+    assert build_supervisor_prompt_template("paula") is paula
+
+
+def test_unknown_persona_falls_back_to_generic_prompt() -> None:
+    generic = build_supervisor_prompt_template(None)
+
+    assert build_supervisor_prompt_template("zoe") is generic
+    assert "INSTRUCTIONS ###" not in generic
+    assert len(generic) < len(build_supervisor_prompt_template("gina")) / 2
+    generic.format(searchapi_endpoint="https://example.com", searchapi_key="token")
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config.settings import Settings
+from flight_search.negative_cache import NegativeRouteCache
+from shared.registry import ServiceRegistry
+
+
+class Closable:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_concurrent_first_calls_build_one_instance() -> None:
+    builds: list[int] = []
+    start = threading.Barrier(8)
+
+    def factory(_registry: ServiceRegistry) -> object:
+        builds.append(1)
+        time.sleep(0.01)
+        return object()
+
+    registry = ServiceRegistry(factories={"service": factory})
+
+    def first_call() -> object:
+        start.wait()
+        return registry.get("service")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        instances = list(pool.map(lambda _: first_call(), range(8)))
+
+    assert len(builds) == 1
+    assert all(instance is instances[0] for instance in instances)
+
+
+def test_warm_up_resolves_dependencies_once() -> None:
+    registry = ServiceRegistry(
+        factories={
+            "client": lambda _registry: object(),
+            "service": lambda registry: ("service", registry.get("client")),
+        }
+    )
+
+    assert registry.warm_up(["service"]) == ["service"]
+    assert registry.get("service")[1] is registry.get("client")
+
+
+def test_default_services_share_one_client_per_upstream() -> None:
+    registry = ServiceRegistry(settings=Settings(searchapi_key="token"))
+
+    flights = registry.flight_service()
+    destinations = registry.destination_service()
+
+    assert flights._flights_client is registry.flights_client()
+    assert destinations._weather_client is registry.open_meteo_client()
+    assert destinations._route_graph is registry.route_graph()
+
+
+def test_shutdown_saves_negative_cache_and_closes_resources(tmp_path) -> None:
+    path = tmp_path / "negative.json"
+    settings = Settings(searchapi_key="token", negative_route_cache_path=str(path))
+    registry = ServiceRegistry(settings=settings)
+    registry.negative_route_cache().record_empty("FRA", "ZNZ")
+    resource = Closable()
+    registry.override("resource", resource)
+
+    registry.shutdown()
+
+    assert resource.closed
+    restored = NegativeRouteCache()
+    assert restored.load(path)
+    assert restored.is_known_empty("FRA", "ZNZ")
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import httpx
+import pytest
+
+from shared.resilience import (
+    CircuitBreaker,
+    RetryBudget,
+    RetryPolicy,
+    SingleFlight,
+    Upstream,
+    UpstreamUnavailableError,
+    parse_retry_after,
+)
+
+
+def _responses(*statuses: int, headers: dict[str, str] | None = None):
+    calls = {"count": 0}
+    queue = list(statuses)
+
+    def do_request() -> httpx.Response:
+        calls["count"] += 1
+        status = queue.pop(0) if queue else statuses[-1]
+        return httpx.Response(status, headers=headers or {})
+
+    return do_request, calls
+
+
+def test_breaker_opens_then_half_open_probe_closes_it(clock) -> None:
+    breaker = CircuitBreaker("searchapi", failure_threshold=2, recovery_timeout=10, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.before_call()
+
+    clock.now = 11
+    breaker.before_call()  # the single half-open probe is let through
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_upstream_fails_fast_while_open() -> None:
+    delays: list[float] = []
+    upstream = Upstream(
+        "searchapi",
+        breaker=CircuitBreaker("searchapi", failure_threshold=2),
+        policy=RetryPolicy(max_attempts=2),
+        budget=RetryBudget(reserve=5),
+        sleep=delays.append,
+    )
+    do_request, calls = _responses(503)
+
+    response = upstream.send(do_request)
+    assert response.status_code == 503
+    assert calls["count"] == 2
+    assert len(delays) == 1
+
+    with pytest.raises(UpstreamUnavailableError):
+        upstream.send(do_request)
+    assert calls["count"] == 2
+
+
+def test_probe_that_raises_does_not_wedge_the_breaker(clock) -> None:
+    breaker = CircuitBreaker("searchapi", failure_threshold=1, recovery_timeout=10, clock=clock)
+    upstream = Upstream("searchapi", breaker=breaker, sleep=lambda _: None)
+    breaker.record_failure()
+    clock.now = 11
+
+    def broken() -> httpx.Response:
+        raise ValueError("malformed upstream URL")
+
+    with pytest.raises(ValueError):
+        upstream.send(broken)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now = 22
+    do_request, calls = _responses(200)
+    assert upstream.send(do_request).status_code == 200
+    assert calls["count"] == 1
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_interrupted_call_neither_trips_nor_wedges_the_breaker(clock) -> None:
+    breaker = CircuitBreaker("searchapi", failure_threshold=1, recovery_timeout=10, clock=clock)
+    upstream = Upstream("searchapi", breaker=breaker, sleep=lambda _: None)
+
+    def interrupted() -> httpx.Response:
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        upstream.send(interrupted)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    clock.now = 11
+    with pytest.raises(KeyboardInterrupt):
+        upstream.send(interrupted)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    do_request, calls = _responses(200)
+    assert upstream.send(do_request).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_upstream_honours_retry_after_on_429() -> None:
+    delays: list[float] = []
+    upstream = Upstream("searchapi", budget=RetryBudget(reserve=5), sleep=delays.append)
+    do_request, calls = _responses(429, 200, headers={"Retry-After": "1.5"})
+
+    response = upstream.send(do_request)
+
+    assert response.status_code == 200
+    assert delays == [1.5]
+    assert upstream.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_retry_budget_stops_retry_amplification() -> None:
+    upstream = Upstream(
+        "open-meteo",
+        breaker=CircuitBreaker("open-meteo", failure_threshold=100),
+        budget=RetryBudget(reserve=1, ratio=0.0),
+        sleep=lambda _delay: None,
+    )
+    do_request, calls = _responses(500)
+
+    upstream.send(do_request)
+    upstream.send(do_request)
+
+    assert calls["count"] == 3  # one budgeted retry, then first attempts only
+
+
+def test_parse_retry_after_accepts_seconds_and_dates() -> None:
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+
+def test_single_flight_shares_one_call_between_concurrent_callers() -> None:
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls: list[str] = []
+    results: list[str] = []
+
+    def fetch(route: str) -> str:
+        calls.append(route)
+        started.set()
+        release.wait(timeout=2)
+        return f"offers for {route}"
+
+    leader = threading.Thread(target=lambda: results.append(flights.run("FRA-LIS", fetch, "LIS")))
+    leader.start()
+    started.wait(timeout=2)
+    follower = threading.Thread(target=lambda: results.append(flights.run("FRA-LIS", fetch, "LIS")))
+    follower.start()
+    time.sleep(0.05)  # let the follower join the in-flight call before the leader finishes
+    release.set()
+    leader.join(timeout=2)
+    follower.join(timeout=2)
+
+    assert calls == ["LIS"]
+    assert results == ["offers for LIS", "offers for LIS"]
+    assert len(flights) == 0
+    assert flights.run("FRA-LIS", fetch, "LIS") == "offers for LIS"
+    assert len(calls) == 2
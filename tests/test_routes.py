@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import httpx
+
+from destination_scout.service import (
+    DestinationScoutRequest,
+    DestinationScoutService,
+    OpenMeteoClient,
+    TimeWindow,
+)
+from destination_scout.service import SearchAPIClient as ExploreClient
+from shared.routes import RouteGraph, build_route_index, default_route_graph, parse_route_pairs
+
+PAIRS = [("FRA", "JFK"), ("FRA", "LIS"), ("MUC", "LIS"), ("BRU", "DKR"), ("BRU", "FRA")]
+
+
+def _graph() -> RouteGraph:
+    return RouteGraph(build_route_index(PAIRS))
+
+
+def test_direct_service_is_undirected() -> None:
+    graph = _graph()
+
+    assert graph.has_direct("FRA", "JFK")
+    assert graph.has_direct("jfk", "fra")
+    assert not graph.has_direct("JFK", "LIS")
+    assert graph.destinations("LIS") == ["FRA", "MUC"]
+
+
+def test_one_stop_via_hub_and_unknown_airports() -> None:
+    graph = _graph()
+
+    assert graph.one_stop_hubs("JFK", "LIS") == ["FRA"]
+    assert graph.one_stop_hubs("DKR", "JFK") == []
+    assert graph.reachable("DKR", "LIS", max_stops=1) is False
+    assert graph.reachable("JFK", "LIS", max_stops=0) is False
+    assert graph.reachable("JFK", "ZNZ") is None
+
+
+def test_index_is_memory_mapped_from_disk(tmp_path) -> None:
+    path = tmp_path / "routes.idx"
+    path.write_bytes(build_route_index(parse_route_pairs(["# comment", "fra,jfk", ""])))
+
+    graph = RouteGraph.open(path)
+
+    assert len(graph) == 2
+    assert graph.has_direct("JFK", "FRA")
+
+
+def test_bundled_dataset_covers_hubs() -> None:
+    graph = default_route_graph()
+
+    assert graph.has_direct("FRA", "JFK")
+    assert "ZRH" in graph.one_stop_hubs("GVA", "JFK")
+
+
+def test_destination_scout_ranks_unlisted_candidates_last() -> None:
+    weather_calls: list[str] = []
+    explore_payload = {
+        "explore_results": [
+            {"destination": "Dakar", "iata_code": "DKR", "coordinates": [14.7, -17.4]},
+            {"destination": "Lisbon", "iata_code": "LIS", "coordinates": [38.7, -9.1]},
+        ]
+    }
+
+    def weather_handler(request: httpx.Request) -> httpx.Response:
+        weather_calls.append(request.url.params["latitude"])
+        return httpx.Response(200, json={})
+
+    service = DestinationScoutService(
+        ExploreClient(
+            base_url="https://example.com/search",
+            api_key="token",
+            transport=httpx.MockTransport(lambda _: httpx.Response(200, json=explore_payload)),
+        ),
+        OpenMeteoClient(
+            base_url="https://weather.example.com",
+            transport=httpx.MockTransport(weather_handler),
+        ),
+        pacing_delay=0.0,
+        route_graph=_graph(),
+    )
+    start = date.today() + timedelta(days=1)
+    request = DestinationScoutRequest(
+        departure_id="JFK",
+        time_window=TimeWindow(token="next_week", start_date=start, end_date=start),
+        max_cards=1,
+    )
+
+    response = service.generate_cards(request)
+
+    # Dakar comes first from explore but has no listed route from JFK, so Lisbon takes the slot.
+    assert [card.arrival_id for card in response.cards] == ["LIS"]
+    assert response.remaining_candidates == 1
+    assert response.search_metadata["off_network_ranked_last"] == 1
+    assert len(weather_calls) == 1
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from strands.handlers.callback_handler import null_callback_handler
+
+from config.settings import Settings
+from supervisor import agent as supervisor_agent
+from supervisor.routing import classify_turn
+
+USAGE = {"usage": {"inputTokens": 1, "outputTokens": 1, "totalTokens": 2}, "metrics": {}}
+
+
+@pytest.mark.parametrize(
+    ("text", "intent"),
+    [
+        ("Hi!", "greeting"),
+        ("hello Paula", "greeting"),
+        ("Yes please", "confirmation"),
+        ("3", "confirmation"),
+        ("Frankfurt, 2 adults", "slot_filling"),
+        ("mid March", "slot_filling"),
+        ("Find me the cheapest flights from FRA to Lisbon in March", "planning"),
+        ("Plan a two week trip through Portugal with beaches and good weather", "planning"),
+    ],
+)
+def test_classify_turn(text: str, intent: str) -> None:
+    assert classify_turn(text) == intent
+
+
+class RecordingClient:
+    def __init__(self, model_id: str, calls: list[tuple[str, int]]) -> None:
+        self._model_id = model_id
+        self._calls = calls
+
+    def converse_stream(self, **request: Any) -> dict[str, Any]:
+        self._calls.append((self._model_id, request["inferenceConfig"]["maxTokens"]))
+        return {
+            "stream": [
+                {"messageStart": {"role": "assistant"}},
+                {"contentBlockDelta": {"delta": {"text": "Sure."}}},
+                {"contentBlockStop": {}},
+                {"messageStop": {"stopReason": "end_turn"}},
+                {"metadata": USAGE},
+            ]
+        }
+
+
+def test_simple_turns_use_the_fast_model(monkeypatch) -> None:
+    monkeypatch.setenv("BEDROCK_MODEL_ID", "anthropic.claude-sonnet")
+    monkeypatch.setenv("BEDROCK_FAST_MODEL_ID", "anthropic.claude-haiku")
+    monkeypatch.setattr(supervisor_agent, "get_settings", Settings)
+    calls: list[tuple[str, int]] = []
+    build_model = supervisor_agent._bedrock
+
+    def stub_bedrock(settings, model_id, max_tokens):
+        model = build_model(settings, model_id, max_tokens)
+        model.client = RecordingClient(model_id, calls)
+        return model
+
+    monkeypatch.setattr(supervisor_agent, "_bedrock", stub_bedrock)
+    agent = supervisor_agent.build_agent()
+    agent.callback_handler = null_callback_handler
+
+    agent("Hello!")
+    agent("Find the cheapest flights from FRA to Lisbon next month and compare the weather")
+
+    assert calls == [("anthropic.claude-haiku", 512), ("anthropic.claude-sonnet", 4096)]
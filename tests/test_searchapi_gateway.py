@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from datetime import date, timedelta
+
+import httpx
+
+from destination_scout.service import DestinationCard, DestinationScoutResponse
+from flight_search.service import (
+    CalendarWindow,
+    FlightSearchRequest,
+    FlightSearchService,
+    SearchAPIClient,
+)
+from shared.prompts import build_supervisor_prompt_template
+from shared.registry import get_registry
+from supervisor import tools as supervisor_tools
+
+START = date.today() + timedelta(days=30)
+
+
+def _flights_service(calls: list[dict[str, str]]) -> FlightSearchService:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(dict(request.url.params))
+        return httpx.Response(
+            200,
+            json={
+                "best_flights": [
+                    {"price": 210, "stops": 0, "flights": [{"airline": "Lufthansa"}]},
+                    {"price": 180, "stops": 1, "flights": [{"airline": "Lufthansa"}]},
+                ]
+            },
+        )
+
+    client = SearchAPIClient(
+        base_url="https://example.com/search",
+        api_key="token",
+        transport=httpx.MockTransport(handler),
+    )
+    return FlightSearchService(client)
+
+
+def test_flights_engine_is_cached_and_compacted() -> None:
+    calls: list[dict[str, str]] = []
+    get_registry().override("flight_service", _flights_service(calls))
+    request = {
+        "engine": "google_flights",
+        "departure_id": "FRA",
+        "arrival_id": "LIS",
+        "outbound_date": START.isoformat(),
+    }
+
+    first = asyncio.run(supervisor_tools.call_searchapi(request))
+    repeat = asyncio.run(supervisor_tools.call_searchapi(request))
+    narrower = asyncio.run(supervisor_tools.call_searchapi({**request, "stops": "nonstop"}))
+
+    assert first["status"] == "success"
+    assert first["data"]["engine"] == "google_flights"
+    assert first["data"]["total_itineraries"] == 2
+    assert "handle" in first["data"]
+    assert repeat["reused"] is True
+    # The nonstop query is derived from the cached broader search.
+    assert narrower["data"]["total_itineraries"] == 1
+    assert [call["engine"] for call in calls] == ["google_flights"]
+
+
+def test_calendar_engine_requests_the_window() -> None:
+    calls: list[dict[str, str]] = []
+    get_registry().override("flight_service", _flights_service(calls))
+
+    result = asyncio.run(
+        supervisor_tools.call_searchapi(
+            {
+                "engine": "google_flights_calendar",
+                "departure_id": "FRA",
+                "arrival_id": "LIS",
+                "start_date": START.isoformat(),
+                "end_date": (START + timedelta(days=13)).isoformat(),
+            }
+        )
+    )
+
+    assert result["status"] == "success"
+    # Only the calendar grid is bought; no google_flights search for the first day.
+    assert [call["engine"] for call in calls] == ["google_flights_calendar"]
+    assert calls[0]["limit"] == "14"
+
+
+def test_calendar_grids_are_cached_per_window_and_stops() -> None:
+    calls: list[dict[str, str]] = []
+    service = _flights_service(calls)
+    request = FlightSearchRequest(
+        departure_id="FRA",
+        arrival_id="LIS",
+        outbound_date=START,
+        calendar_window=CalendarWindow(start_date=START, end_date=START + timedelta(days=13)),
+    )
+
+    first = service.search_calendar(request)
+    repeat = service.search_calendar(request)
+    service.search_calendar(request.model_copy(update={"stops": "nonstop"}))
+
+    assert repeat.calendar == first.calendar
+    assert [call.get("stops") for call in calls] == ["any", "nonstop"]
+
+
+def test_included_airlines_are_sent_upstream() -> None:
+    calls: list[dict[str, str]] = []
+    get_registry().override("flight_service", _flights_service(calls))
+    request = {
+        "engine": "google_flights",
+        "departure_id": "FRA",
+        "arrival_id": "ORD",
+        "outbound_date": START.isoformat(),
+        "included_airlines": ["ua"],
+    }
+
+    result = asyncio.run(supervisor_tools.call_searchapi(request))
+    explore = asyncio.run(
+        supervisor_tools.call_searchapi(
+            {
+                "engine": "google_travel_explore",
+                "departure_id": "FRA",
+                "time_period": "one_week_trip_in_march",
+                "included_airlines": ["UA"],
+            }
+        )
+    )
+
+    assert result["status"] == "success"
+    assert calls[0]["included_airlines"].split(",")[-1] == "UA"
+    assert explore["status"] == "error" and "included_airlines" in explore["message"]
+
+
+def test_engine_parameters_are_validated() -> None:
+    missing = asyncio.run(
+        supervisor_tools.call_searchapi(
+            {"engine": "google_flights_calendar", "departure_id": "FRA", "arrival_id": "LIS"}
+        )
+    )
+    unknown = asyncio.run(
+        supervisor_tools.call_searchapi({"engine": "google_hotels", "departure_id": "FRA"})
+    )
+    past = asyncio.run(
+        supervisor_tools.call_searchapi(
+            {
+                "engine": "google_flights",
+                "departure_id": "FRA",
+                "arrival_id": "LIS",
+                "outbound_date": (date.today() - timedelta(days=1)).isoformat(),
+            }
+        )
+    )
+
+    assert missing["status"] == "error" and "start_date, end_date" in missing["message"]
+    assert unknown["status"] == "error"
+    assert past["status"] == "error" and "current_time" in past["message"]
+
+
+def test_concurrent_explore_calls_share_one_upstream_request() -> None:
+    requests = []
+    release = threading.Event()
+
+    class Scout:
+        def generate_cards(self, request):
+            requests.append(request)
+            release.wait(timeout=2)
+            return DestinationScoutResponse(
+                cards=[DestinationCard(destination="Lisbon", arrival_id="LIS", why_now="Sun.")]
+            )
+
+    get_registry().override("destination_service", Scout())
+    request = {
+        "engine": "google_travel_explore",
+        "departure_id": "FRA",
+        "time_period": "one_week_trip_in_march",
+        "interests": ["beaches"],
+        "max_results": 5,
+    }
+
+    async def both():
+        first = asyncio.create_task(supervisor_tools.call_searchapi(request))
+        second = asyncio.create_task(supervisor_tools.call_searchapi(request))
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(first, second)
+
+    results = asyncio.run(both())
+
+    assert [result["status"] for result in results] == ["success", "success"]
+    assert results[0]["data"]["cards"][0]["destination"] == "Lisbon"
+    assert len(requests) == 1
+    assert requests[0].include_weather is False and requests[0].max_cards == 5
+
+
+def test_supervisor_prompt_drops_the_raw_searchapi_contract_by_default() -> None:
+    gateway = build_supervisor_prompt_template("paula")
+    raw = build_supervisor_prompt_template("paula", http_request=True)
+
+    assert "{searchapi_key}" not in gateway and "`call_searchapi`" in gateway
+    assert "{searchapi_key}" in raw
+    gateway.format(searchapi_endpoint="https://example.com", searchapi_key="token")
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from strands import Agent, tool
+from strands.handlers.callback_handler import null_callback_handler
+from strands.models import BedrockModel
+
+from supervisor import streaming
+from supervisor.streaming import AgentSessions, iter_events, stream_reply
+
+USAGE = {"usage": {"inputTokens": 1, "outputTokens": 1, "totalTokens": 2}, "metrics": {}}
+
+
+@tool
+def lookup(code: str) -> dict[str, Any]:
+    """Look up an airport."""
+
+    return {"status": "success", "data": {"code": code}}
+
+
+class ScriptedBedrockClient:
+    """First call asks for the lookup tool, the second streams the reply in two deltas."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def converse_stream(self, **_request: Any) -> dict[str, Any]:
+        self.calls += 1
+        if self.calls == 1:
+            start = {"toolUse": {"toolUseId": "t1", "name": "lookup"}}
+            events = [
+                {"contentBlockStart": {"start": start, "contentBlockIndex": 0}},
+                {"contentBlockDelta": {"delta": {"toolUse": {"input": '{"code": "LIS"}'}}}},
+                {"contentBlockStop": {"contentBlockIndex": 0}},
+                {"messageStop": {"stopReason": "tool_use"}},
+            ]
+        else:
+            events = [
+                {"contentBlockDelta": {"delta": {"text": "Lisbon "}}},
+                {"contentBlockDelta": {"delta": {"text": "it is."}}},
+                {"contentBlockStop": {}},
+                {"messageStop": {"stopReason": "end_turn"}},
+            ]
+        return {"stream": [{"messageStart": {"role": "assistant"}}, *events, {"metadata": USAGE}]}
+
+
+def _agent(_persona: str | None = None) -> Agent:
+    model = BedrockModel(model_id="anthropic.claude-3-5-haiku", region_name="us-east-1")
+    model.client = ScriptedBedrockClient()
+    return Agent(model=model, tools=[lookup], callback_handler=null_callback_handler)
+
+
+def test_stream_reply_yields_tool_progress_then_text_deltas() -> None:
+    events = list(iter_events(stream_reply(_agent(), "Where to?")))
+
+    assert [event["type"] for event in events] == [
+        "tool_start",
+        "tool_end",
+        "text",
+        "text",
+        "done",
+    ]
+    assert events[0]["tool"] == "lookup" and events[1]["status"] == "success"
+    assert events[-1]["reply"].strip() == "Lisbon it is."
+
+
+def test_stream_handler_emits_ndjson_and_keeps_the_session(monkeypatch) -> None:
+    sessions = AgentSessions(_agent)
+    monkeypatch.setattr(streaming, "_sessions", sessions)
+
+    lines = list(streaming.stream_handler({"message": "Hi", "persona": "Paula"}))
+    first = json.loads(lines[0])
+    _, agent = sessions.get(first["session_id"], None)
+
+    assert first["type"] == "session"
+    assert all(line.endswith("\n") for line in lines)
+    assert json.loads(lines[-1])["type"] == "done"
+    assert agent.state.get("persona") == "paula"
+    assert len(agent.messages) == 4
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Any
+
+from config.settings import Settings
+from supervisor import agent as supervisor_agent
+from supervisor.usage import TurnUsage
+
+
+class StubBedrockClient:
+    """Stands in for the bedrock-runtime client and records each Converse request."""
+
+    def __init__(self) -> None:
+        self.requests: list[dict[str, Any]] = []
+
+    def converse_stream(self, **request: Any) -> dict[str, Any]:
+        self.requests.append(request)
+        return {
+            "stream": [
+                {"messageStart": {"role": "assistant"}},
+                {"contentBlockDelta": {"contentBlockIndex": 0, "delta": {"text": "Hi"}}},
+                {"contentBlockStop": {"contentBlockIndex": 0}},
+                {"messageStop": {"stopReason": "end_turn"}},
+                {
+                    "metadata": {
+                        "usage": {
+                            "inputTokens": 40,
+                            "outputTokens": 2,
+                            "totalTokens": 5042,
+                            "cacheReadInputTokens": 5000,
+                            "cacheWriteInputTokens": 0,
+                        },
+                        "metrics": {"latencyMs": 5},
+                    }
+                },
+            ]
+        }
+
+
+def _run_turn(monkeypatch, *, cache: bool) -> tuple[TurnUsage, dict[str, Any]]:
+    usage = TurnUsage()
+    monkeypatch.setattr(supervisor_agent, "TurnUsage", lambda: usage)
+    monkeypatch.setenv("BEDROCK_MODEL_ID", "anthropic.claude-3-5-haiku-20241022-v1:0")
+    monkeypatch.setenv("BEDROCK_PROMPT_CACHE", "true" if cache else "false")
+    monkeypatch.setattr(supervisor_agent, "get_settings", Settings)
+    agent = supervisor_agent.build_agent("paula")
+    client = StubBedrockClient()
+    agent.model.client = client
+    agent("Hello")
+    return usage, client.requests[0]
+
+
+def test_prompt_cache_marks_static_prefix_and_reports_usage(monkeypatch) -> None:
+    usage, request = _run_turn(monkeypatch, cache=True)
+
+    assert request["system"][0]["text"].startswith("You are the Lufthansa Inspiria supervisor")
+    assert request["system"][-1] == {"cachePoint": {"type": "default"}}
+    assert request["toolConfig"]["tools"][-1] == {"cachePoint": {"type": "default"}}
+    assert usage.last == {
+        "input_tokens": 40,
+        "output_tokens": 2,
+        "cache_read_tokens": 5000,
+        "cache_write_tokens": 0,
+    }
+
+
+def test_prompt_cache_can_be_disabled(monkeypatch) -> None:
+    _usage, request = _run_turn(monkeypatch, cache=False)
+
+    assert all("cachePoint" not in block for block in request["system"])
+    assert all("cachePoint" not in tool for tool in request["toolConfig"]["tools"])
+
+
+def test_http_request_tool_is_opt_in(monkeypatch) -> None:
+    monkeypatch.setattr(supervisor_agent, "get_settings", Settings)
+
+    default = supervisor_agent.build_agent("paula")
+    monkeypatch.setenv("SUPERVISOR_HTTP_REQUEST", "true")
+    raw = supervisor_agent.build_agent("paula")
+
+    assert "call_searchapi" in default.tool_names
+    assert "http_request" not in default.tool_names
+    assert "test-searchapi-key" not in default.system_prompt
+    assert "http_request" in raw.tool_names
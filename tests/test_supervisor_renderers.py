@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+from datetime import date, timedelta
+
+import pytest
+
+from supervisor import weather as weather_module
 from supervisor.composer import compose_reply
+from supervisor.prefetch import prefetch_weather
 from supervisor.renderers import format_destination_cards, format_flight_summary
 
 
@@ -118,3 +124,84 @@ def test_gina_questionnaire_omitted_when_choice_present() -> None:
     conversation_state = {"travel_personality_choice": "2"}
     text = compose_reply("Gina", conversation_state)
     assert "travel personality best fits you" not in text
+
+
+def _state_with_card(card: dict[str, object]) -> dict[str, object]:
+    start = date.today() + timedelta(days=2)
+    end = start + timedelta(days=5)
+    return {
+        "destination_cards": [card],
+        "flight_results": {
+            "flights": {
+                "best_flights": [
+                    {
+                        "price": "€210",
+                        "stops": 0,
+                        "segments": [
+                            {
+                                "airline_code": "LH",
+                                "flight_number": "1172",
+                                "departure_airport": "FRA",
+                                "arrival_airport": "LIS",
+                                "departure_time": f"{start.isoformat()}T09:10:00",
+                                "arrival_time": f"{start.isoformat()}T11:10:00",
+                            },
+                            {
+                                "airline_code": "LH",
+                                "flight_number": "1173",
+                                "departure_airport": "LIS",
+                                "arrival_airport": "FRA",
+                                "departure_time": f"{end.isoformat()}T12:00:00",
+                                "arrival_time": f"{end.isoformat()}T16:00:00",
+                            },
+                        ],
+                    }
+                ]
+            }
+        },
+    }
+
+
+def test_compose_reply_never_fetches_weather(monkeypatch) -> None:
+    def no_network(**_: object) -> dict[str, object]:
+        raise AssertionError("rendering must not call Open-Meteo")
+
+    monkeypatch.setattr(weather_module, "fetch_weather_snapshot", no_network)
+    card = {
+        "destination": "Lisbon",
+        "arrival_id": "LIS",
+        "why_now": "Atlantic breezes.",
+        "coordinates": {"latitude": 38.7, "longitude": -9.1},
+        "forecast": {"temperature_2m_max": [23.4], "temperature_2m_min": [15.2]},
+    }
+
+    text = compose_reply("Paula", _state_with_card(card))
+    bare = compose_reply("Paula", _state_with_card({"destination": "Lisbon", "why_now": "Sun."}))
+
+    assert "23°C high / 15°C low" in text
+    assert "Weather snapshot unavailable" in bare
+
+
+def test_prefetch_fills_missing_weather_before_rendering() -> None:
+    calls: list[dict[str, object]] = []
+
+    def fetch(**kwargs: object) -> dict[str, object]:
+        calls.append(kwargs)
+        return {"daily": {"temperature_2m_max": [21.0], "temperature_2m_min": [14.0]}}
+
+    card = {
+        "destination": "Lisbon",
+        "arrival_id": "LIS",
+        "why_now": "Atlantic breezes.",
+        "coordinates": {"latitude": 38.7, "longitude": -9.1},
+    }
+    state = _state_with_card(card)
+
+    prepared = prefetch_weather(state, fetch=fetch)
+    again = prefetch_weather(prepared, fetch=fetch)
+
+    assert calls[0]["latitude"] == pytest.approx(38.7)
+    assert len(calls) == 1
+    assert prepared["destination_cards"][0]["weather"]["headline"] == "21°C high / 14°C low"
+    assert "weather" not in state["destination_cards"][0]
+    assert again["destination_cards"] == prepared["destination_cards"]
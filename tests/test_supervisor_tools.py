@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from datetime import date, timedelta
+
 from destination_scout.service import DestinationScoutResponse, DestinationCard
 from flight_search.service import FlightSearchResponse
+from shared.registry import get_registry
 from supervisor import tools as supervisor_tools
 
 
@@ -30,14 +35,14 @@ class DummyDestinationService:
 
 def test_call_flight_search_returns_success(monkeypatch) -> None:
     dummy_service = DummyFlightService()
-    monkeypatch.setattr(supervisor_tools, "_flight_service", dummy_service)
+    get_registry().override("flight_service", dummy_service)
 
     payload = {
         "departure_id": "FRA",
         "arrival_id": "JFK",
-        "outbound_date": "2026-03-01",
+        "outbound_date": (date.today() + timedelta(days=30)).isoformat(),
     }
-    result = supervisor_tools.call_flight_search(payload)
+    result = asyncio.run(supervisor_tools.call_flight_search(payload))
 
     assert result["status"] == "success"
     assert dummy_service.last_request.departure_id == "FRA"
@@ -45,22 +50,22 @@ def test_call_flight_search_returns_success(monkeypatch) -> None:
 
 def test_call_destination_scout_returns_cards(monkeypatch) -> None:
     dummy_service = DummyDestinationService()
-    monkeypatch.setattr(supervisor_tools, "_destination_service", dummy_service)
+    get_registry().override("destination_service", dummy_service)
 
     payload = {
         "departure_id": "FRA",
         "time_window": {"token": "one_week_trip_in_march"},
     }
-    result = supervisor_tools.call_destination_scout(payload)
+    result = asyncio.run(supervisor_tools.call_destination_scout(payload))
 
     assert result["status"] == "success"
     assert dummy_service.last_request.time_window.token == "one_week_trip_in_march"
 
 
 def test_call_flight_search_handles_validation_error(monkeypatch) -> None:
-    monkeypatch.setattr(supervisor_tools, "_flight_service", DummyFlightService())
+    get_registry().override("flight_service", DummyFlightService())
 
-    result = supervisor_tools.call_flight_search({"departure_id": "FRA"})
+    result = asyncio.run(supervisor_tools.call_flight_search({"departure_id": "FRA"}))
 
     assert result["status"] == "error"
 
@@ -70,13 +75,15 @@ def test_call_weather_snapshot_returns_summary(monkeypatch) -> None:
         return {"daily": {"temperature_2m_max": [20], "temperature_2m_min": [10]}}
 
     monkeypatch.setattr(supervisor_tools, "fetch_weather_snapshot", fake_fetch)
-    result = supervisor_tools.call_weather_snapshot(
-        {
-            "latitude": 48.1,
-            "longitude": 11.6,
-            "start_date": "2025-11-15",
-            "end_date": "2025-11-18",
-        }
+    result = asyncio.run(
+        supervisor_tools.call_weather_snapshot(
+            {
+                "latitude": 48.1,
+                "longitude": 11.6,
+                "start_date": "2025-11-15",
+                "end_date": "2025-11-18",
+            }
+        )
     )
 
     assert result["status"] == "success"
@@ -85,7 +92,7 @@ def test_call_weather_snapshot_returns_summary(monkeypatch) -> None:
 
 def test_call_flight_search_rejects_past_dates(monkeypatch) -> None:
     dummy_service = DummyFlightService()
-    monkeypatch.setattr(supervisor_tools, "_flight_service", dummy_service)
+    get_registry().override("flight_service", dummy_service)
 
     payload = {
         "departure_id": "FRA",
@@ -93,6 +100,148 @@ def test_call_flight_search_rejects_past_dates(monkeypatch) -> None:
         "outbound_date": "2023-01-01",
     }
 
-    result = supervisor_tools.call_flight_search(payload)
+    result = asyncio.run(supervisor_tools.call_flight_search(payload))
     assert result["status"] == "error"
     assert "current_time" in result["message"]
+
+
+def test_query_flight_offers_reuses_fetched_results(monkeypatch) -> None:
+    dummy_service = DummyFlightService()
+    get_registry().override("flight_service", dummy_service)
+    monkeypatch.setattr(supervisor_tools, "_offer_stores", type(supervisor_tools._offer_stores)())
+
+    asyncio.run(
+        supervisor_tools.call_flight_search(
+            {"departure_id": "FRA", "arrival_id": "JFK", "outbound_date": "2099-03-01"}
+        )
+    )
+    dummy_service.last_request = None
+    result = supervisor_tools.query_flight_offers({"max_stops": 0})
+
+    assert result["status"] == "success"
+    assert result["data"]["fetched_upstream"] is False
+    assert dummy_service.last_request is None
+
+
+def test_query_flight_offers_searches_again_on_partial_route_mismatch(monkeypatch) -> None:
+    dummy_service = DummyFlightService()
+    get_registry().override("flight_service", dummy_service)
+    monkeypatch.setattr(supervisor_tools, "_offer_stores", type(supervisor_tools._offer_stores)())
+
+    asyncio.run(
+        supervisor_tools.call_flight_search(
+            {"departure_id": "FRA", "arrival_id": "JFK", "outbound_date": "2099-03-01"}
+        )
+    )
+    dummy_service.last_request = None
+    result = supervisor_tools.query_flight_offers({"arrival_id": "EWR", "max_price": 300})
+
+    assert result["status"] == "success"
+    assert result["data"]["fetched_upstream"] is True
+    assert dummy_service.last_request.departure_id == "FRA"
+    assert dummy_service.last_request.arrival_id == "EWR"
+    assert dummy_service.last_request.outbound_date == date(2099, 3, 1)
+
+
+def test_query_flight_offers_requires_route_without_prior_search(monkeypatch) -> None:
+    monkeypatch.setattr(supervisor_tools, "_offer_stores", type(supervisor_tools._offer_stores)())
+
+    result = supervisor_tools.query_flight_offers({"max_price": 300})
+
+    assert result["status"] == "error"
+
+
+def test_call_flight_search_reports_unavailable_upstream(monkeypatch) -> None:
+    from flight_search.service import FlightSearchError
+
+    class OpenCircuitService:
+        def search(self, _request):
+            raise FlightSearchError("searchapi is temporarily unavailable (circuit open)")
+
+    get_registry().override("flight_service", OpenCircuitService())
+
+    result = asyncio.run(
+        supervisor_tools.call_flight_search(
+            {"departure_id": "FRA", "arrival_id": "JFK", "outbound_date": "2099-03-01"}
+        )
+    )
+
+    assert result["status"] == "error"
+    assert "circuit open" in result["message"]
+
+
+def test_call_price_insights_reports_missing_history(monkeypatch) -> None:
+    from flight_search.price_history import PriceHistoryStore
+
+    get_registry().override("price_history", PriceHistoryStore())
+
+    result = supervisor_tools.call_price_insights(
+        {"departure_id": "FRA", "arrival_id": "LIS", "question": "cheapest_month"}
+    )
+
+    assert result["status"] == "no_data"
+
+
+def test_flight_and_weather_tools_run_concurrently(monkeypatch) -> None:
+    from shared import deadline
+
+    class SlowFlightService(DummyFlightService):
+        def search(self, request):
+            self.remaining = deadline.remaining()
+            time.sleep(0.2)
+            return super().search(request)
+
+    def slow_fetch(**_: object) -> dict[str, object]:
+        time.sleep(0.2)
+        return {"daily": {"temperature_2m_max": [20], "temperature_2m_min": [10]}}
+
+    service = SlowFlightService()
+    get_registry().override("flight_service", service)
+    monkeypatch.setattr(supervisor_tools, "fetch_weather_snapshot", slow_fetch)
+
+    async def one_turn():
+        return await asyncio.gather(
+            supervisor_tools.call_flight_search(
+                {"departure_id": "FRA", "arrival_id": "JFK", "outbound_date": "2099-03-01"}
+            ),
+            supervisor_tools.call_weather_snapshot(
+                {
+                    "latitude": 48.1,
+                    "longitude": 11.6,
+                    "start_date": "2025-11-15",
+                    "end_date": "2025-11-18",
+                }
+            ),
+        )
+
+    started = time.perf_counter()
+    flights, weather = asyncio.run(one_turn())
+    elapsed = time.perf_counter() - started
+
+    assert flights["status"] == weather["status"] == "success"
+    assert elapsed < 0.35
+    assert service.remaining is not None
+
+
+def test_identical_weather_call_is_reused_within_ttl(monkeypatch) -> None:
+    calls: list[dict[str, object]] = []
+
+    def fake_fetch(**kwargs: object) -> dict[str, object]:
+        calls.append(kwargs)
+        return {"daily": {"temperature_2m_max": [20], "temperature_2m_min": [10]}}
+
+    monkeypatch.setattr(supervisor_tools, "fetch_weather_snapshot", fake_fetch)
+    request = {
+        "latitude": 48.1,
+        "longitude": 11.6,
+        "start_date": "2025-11-15",
+        "end_date": "2025-11-18",
+    }
+
+    first = asyncio.run(supervisor_tools.call_weather_snapshot(request))
+    again = asyncio.run(supervisor_tools.call_weather_snapshot({**request, "latitude": "48.1"}))
+
+    assert "reused" not in first
+    assert again["reused"] is True
+    assert again["data"] == first["data"]
+    assert len(calls) == 1